@@ -0,0 +1,136 @@
+import boto3
+from botocore.exceptions import ClientError
+
+"""
+ingest_state_table.put_item(
+    Item={
+        'app_id': app_id,
+        'version': WATERMARK_VERSION,
+        'latest_at': latest_at,
+        'latest_review_id': latest_review_id,
+        'recent_ids': recent_ids,
+        'recent_signatures': recent_signatures,
+        'updated_at': datetime.now().isoformat()
+    }
+)
+
+backfill_state_table.put_item(
+    Item={
+        'app_id': app_id,
+        'status': 'running',                      # 'running' | 'done'
+        'continuation_token': continuation_token, # 스크레이퍼 토큰 (map)
+        'stored_oldest_at': stored_oldest_at,
+        'until': until,
+        'oldest_at': oldest_at,
+        'pages': pages,
+        'reviews_scanned': reviews_scanned,
+        'reviews_saved': reviews_saved,
+        'invocations': invocations,
+        'started_at': started_at,
+        'updated_at': datetime.now().isoformat()
+    }
+)
+
+# AppReviewDaily: 새 리뷰를 쓰는 트랜잭션에서 함께 ADD 로 갱신 (review_stats.save_reviews_with_stats, 이미 있던 리뷰는 다시 세지 않음)
+daily_stats_item = {
+    'app_id': app_id,
+    'day': 'YYYY-MM-DD',
+    'count': count,
+    'score_sum': score_sum,
+    'length_sum': length_sum,
+    'score_1': n, ..., 'score_5': n,
+    'length_sum_score_1': n, ..., 'length_sum_score_5': n,
+    'length_0_49': n, 'length_50_99': n, 'length_100_199': n, 'length_200_399': n, 'length_400_plus': n,
+    'updated_at': datetime.now().isoformat()
+}
+
+# AppSummaryJob: 비동기 요약 작업 (summary_jobs), expires_at 이 지나면 TTL 로 삭제
+summary_job_table.put_item(
+    Item={
+        'job_id': job_id,
+        'app_id': app_id,
+        'google_id': google_id,
+        'status': 'queued',                       # 'queued' | 'running' | 'done' | 'failed'
+        'stage': 'queued',                        # running 중에는 'refreshing_reviews' | 'summarizing'
+        'submitted_at': submitted_at,
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'result': result,                         # generate_and_save_summary 결과
+        'error': error,
+        'expires_at': expires_at                  # epoch 초
+    }
+)
+
+# AppSummaryLock: (app_id, end_date) 요약 생성 단일 실행 잠금 (summary_lock), 조건부 put 으로만 가져감
+summary_lock_table.put_item(
+    Item={
+        'lock_key': f"{app_id}#{end_date}",
+        'owner': owner,                           # 잠금을 가져간 요청의 임의 ID
+        'expires_at': expires_at                  # epoch 초, 지나면 다른 요청이 가져갈 수 있음
+    },
+    ConditionExpression='attribute_not_exists(lock_key) OR expires_at < :now'
+)
+"""
+# 테이블 이름 -> (파티션 키, 정렬 키)
+TABLES = {
+    "AppIngestState": ("app_id", None),
+    "AppBackfillState": ("app_id", None),
+    "AppReviewDaily": ("app_id", "day"),
+    "AppSummaryJob": ("job_id", None),
+    "AppSummaryLock": ("lock_key", None),
+}
+# 테이블 이름 -> TTL 속성
+TTL_ATTRIBUTES = {
+    "AppSummaryJob": "expires_at",
+    "AppSummaryLock": "expires_at",
+}
+REGION = "ap-northeast-2"          # 서울 리전
+
+dynamodb = boto3.client("dynamodb", region_name=REGION)
+
+# ────────────────────────────────────────────────────────────
+# 앱별 수집 상태 · 집계 테이블 생성 (이미 있으면 건너뜀)
+#   - AppIngestState: 증분 수집 워터마크. 항목이 없거나 손상되어도 람다가 저장된 리뷰로 다시 만들므로 기존 데이터 이전은 필요 없음
+#   - AppBackfillState: 과거 리뷰 백필 체크포인트. 항목이 없으면 백필을 처음부터 시작
+#   - AppReviewDaily: 앱별 일별 리뷰 집계. 기존 리뷰의 집계는 review_stats.rebuild_daily_stats 로 채움
+#   - AppSummaryJob: 비동기 요약 작업 상태. 끝난 작업은 TTL(expires_at)로 삭제
+#   - AppSummaryLock: 요약 생성 잠금. 풀리지 않은 잠금은 TTL(expires_at)로 삭제
+# ────────────────────────────────────────────────────────────
+for table, (hash_key, range_key) in TABLES.items():
+    keys = [(hash_key, "HASH")] + ([(range_key, "RANGE")] if range_key else [])
+    table_def = {
+        "TableName": table,
+        "KeySchema": [
+            {"AttributeName": name, "KeyType": key_type} for name, key_type in keys
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": name, "AttributeType": "S"} for name, _ in keys
+        ],
+        "BillingMode": "PAY_PER_REQUEST"
+    }
+
+    try:
+        dynamodb.create_table(**table_def)
+        print(f"[생성] {table} 테이블 생성 요청 전송(위임형 요금제)")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceInUseException":
+            print(f"[생성] {table} 테이블이 이미 존재 → 건너뜀")
+        else:
+            raise
+
+    waiter = dynamodb.get_waiter("table_exists")
+    waiter.wait(TableName=table)
+    print(f"[생성] {table} ACTIVE 상태 진입 확인")
+
+    if table in TTL_ATTRIBUTES:
+        try:
+            dynamodb.update_time_to_live(
+                TableName=table,
+                TimeToLiveSpecification={"Enabled": True, "AttributeName": TTL_ATTRIBUTES[table]}
+            )
+            print(f"[생성] {table} TTL({TTL_ATTRIBUTES[table]}) 활성화")
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ValidationException":
+                print(f"[생성] {table} TTL 이 이미 활성화됨 → 건너뜀")
+            else:
+                raise
@@ -0,0 +1,121 @@
+"""
+증분(delta) 요약 모듈
+
+새 날짜의 요약은 리뷰 몇 개만 추가되었어도 최근 리뷰 윈도우 전체를 다시 샘플링해 전체 프롬프트로 LLM 을 호출합니다.
+증분 요약은 직전 요약(get_latest_summary)의 보고서와, 그 end_date 이후에 작성된 리뷰만 샘플링한 텍스트를
+병합 프롬프트(DELTA_PROMPT)로 LLM 에 보내 보고서를 갱신하므로, 입력 길이와 응답 시간이 새 리뷰 수에 비례합니다.
+- 새 리뷰 샘플 길이 상한: 전체 요약 상한(SamplingConfig.max_length) × 새 리뷰 비율 (최소 DELTA_MIN_SAMPLE_LENGTH)
+- 다음 경우에는 전체 요약으로 다시 만듦 (plan_summary)
+  - 직전 요약이 없거나, 새 윈도우의 마지막 날짜보다 이후 날짜의 요약
+  - 직전 요약 이후 DELTA_MAX_GAP_DAYS 일보다 오래 지남
+  - 전체 요약 이후 증분 요약이 DELTA_MAX_DEPTH 번 이어짐 (병합을 거듭하며 생기는 누락/왜곡 방지)
+  - 새 리뷰가 윈도우의 DELTA_MAX_NEW_RATIO 보다 많음 (전체 요약과 비용 차이가 작음)
+요청의 summary_mode 가 'full' 이면 항상 전체 요약, 'auto' 이면 위 정책을 따르고,
+'map_reduce' 이면 샘플링 없이 더 긴 윈도우 전체를 계층적으로 요약합니다 (map_reduce_summary).
+기본값은 SUMMARY_MODE 환경 변수 (없으면 'full')입니다.
+"""
+import os
+import math
+import dataclasses
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+SUMMARY_MODES = ['full', 'auto', 'map_reduce']
+
+# 전체 요약 이후 이어서 만들 수 있는 증분 요약 수
+DELTA_MAX_DEPTH = 6
+
+# 직전 요약 end_date 와 새 end_date 의 최대 간격 (일)
+DELTA_MAX_GAP_DAYS = 14
+
+# 새 리뷰가 윈도우에서 차지하는 최대 비율
+DELTA_MAX_NEW_RATIO = 0.3
+
+# 새 리뷰 샘플 텍스트 길이 하한 (문자 수)
+DELTA_MIN_SAMPLE_LENGTH = 1000
+
+DELTA_PROMPT = """다음은 앱 리뷰 분석 보고서([기존 보고서])와, 그 보고서 작성 이후 새로 작성된 앱 리뷰([새 리뷰])입니다.
+새 리뷰의 내용을 반영하여 기존 보고서를 갱신한 마크다운 보고서를 작성해주세요.
+
+- 기존 보고서의 6개 섹션 구성(핵심 인사이트 요약, 맥락별 감성 분석, 주요 문제점의 근본 원인 분석,
+  묵시적 사용자 요구 파악, 경쟁 앱 참조 분석, 전략적 개선 방향)과 형식을 그대로 유지해주세요
+- 새 리뷰가 기존 인사이트를 뒷받침하면 유지하고, 반박하거나 새로운 문제/요구를 드러내면 해당 섹션을 수정하거나 추가해주세요
+- 새 리뷰와 관련 없는 기존 내용은 삭제하지 말고 유지해주세요
+- 새로 추가하거나 수정한 인사이트는 반드시 새 리뷰 내용을 인용하여 뒷받침해주세요
+- 관련 데이터가 없는 섹션은 "관련 데이터 없음"으로 표시해주세요"""
+
+
+def default_summary_mode():
+    """요청에 summary_mode 가 없을 때 사용할 모드 (SUMMARY_MODE 환경 변수)"""
+    mode = os.environ.get('SUMMARY_MODE', 'full')
+    return mode if mode in SUMMARY_MODES else 'full'
+
+
+@dataclass
+class SummaryPlan:
+    """
+    요약 생성 방식
+
+    Attributes:
+        mode: 'full', 'delta' 또는 'map_reduce'
+        reason: 방식을 정한 이유 (로그/저장용)
+        base: 증분 요약의 기반이 되는 직전 AppSummary 항목 (full 이면 None)
+        depth: 마지막 전체 요약 이후 증분 요약 수 (full 이면 0)
+    """
+    mode: str
+    reason: str
+    base: Optional[dict] = None
+    depth: int = 0
+
+
+def plan_summary(summary_mode, previous, review_days, last_date):
+    """
+    요약 방식을 정합니다.
+
+    Args:
+        summary_mode (str): 요청의 summary_mode ('full' | 'auto' | 'map_reduce')
+        previous (dict): 직전 AppSummary 항목 (없으면 None)
+        review_days (list): 요약 윈도우 리뷰들의 작성 날짜 (YYYY-MM-DD)
+        last_date (str): 새 요약의 end_date (YYYY-MM-DD)
+    Returns:
+        SummaryPlan
+    """
+    if summary_mode == 'map_reduce':
+        return SummaryPlan('map_reduce', 'requested')
+    if summary_mode != 'auto':
+        return SummaryPlan('full', 'requested')
+    if not previous or not previous.get('summary'):
+        return SummaryPlan('full', 'no_previous_summary')
+    if previous['end_date'] >= last_date:
+        return SummaryPlan('full', 'previous_not_older')
+    gap_days = (date.fromisoformat(last_date) - date.fromisoformat(previous['end_date'])).days
+    if gap_days > DELTA_MAX_GAP_DAYS:
+        return SummaryPlan('full', 'previous_too_old')
+    depth = int(previous.get('delta_depth', 0)) + 1
+    if depth > DELTA_MAX_DEPTH:
+        return SummaryPlan('full', 'rebuild_after_max_depth')
+    new_count = sum(1 for day in review_days if day > previous['end_date'])
+    if new_count == 0:
+        return SummaryPlan('full', 'no_new_reviews')
+    if new_count > len(review_days) * DELTA_MAX_NEW_RATIO:
+        return SummaryPlan('full', 'too_many_new_reviews')
+    return SummaryPlan('delta', 'incremental', previous, depth)
+
+
+def delta_sampling_config(config, new_count, window_count):
+    """새 리뷰 비율만큼 샘플 길이 상한을 줄인 SamplingConfig"""
+    ratio = new_count / max(window_count, 1)
+    max_length = max(DELTA_MIN_SAMPLE_LENGTH, math.ceil(config.max_length * ratio))
+    return dataclasses.replace(config, max_length=min(config.max_length, max_length))
+
+
+def delta_prompt(base, first_date, last_date):
+    """증분 요약 시스템 프롬프트"""
+    return DELTA_PROMPT + (f"\n기존 보고서는 {base['start_date']} ~ {base['end_date']} 리뷰를, "
+                           f"새 리뷰는 {first_date} ~ {last_date} 에 작성된 리뷰를 다룹니다.")
+
+
+def delta_input(base, selected_texts):
+    """증분 요약 사용자 입력: 기존 보고서 + 새 리뷰 샘플"""
+    return f"[기존 보고서]\n{base['summary']}\n\n[새 리뷰]\n{' '.join(selected_texts)}"
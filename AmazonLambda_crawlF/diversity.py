@@ -0,0 +1,174 @@
+"""
+리뷰 샘플링의 다양성 기반 선택 모듈
+
+LLM.sampling 의 탐욕(greedy) 선택 단계를 담당합니다.
+매 라운드마다 "후보 텍스트"와 "지금까지 선택된 텍스트 전체" 사이의 Jaccard 유사도가 필요한데,
+선택된 텍스트를 문자열로 누적해 매번 다시 토큰화하는 대신
+후보별 토큰 집합은 한 번만 만들고, 선택된 토큰의 합집합과 후보별 교집합 크기를 점진적으로 갱신합니다.
+"""
+import numpy as np
+
+from minhash import MinHashDiversity
+
+
+def jaccard_similarity(sentence1, sentence2):
+    """
+    두 문장의 단어 유사도를 측정하는 가장 가벼운 함수
+    Jaccard 유사도 기반 (교집합/합집합)
+
+    Args:
+        sentence1 (str): 첫 번째 문장
+        sentence2 (str): 두 번째 문장
+
+    Returns:
+        float: 0~1 사이의 유사도 점수 (높을수록 유사)
+    """
+    # 문장을 소문자로 변환하고 단어로 분리
+    words1 = set(sentence1.lower().split())
+    words2 = set(sentence2.lower().split())
+
+    # 교집합과 합집합 계산
+    intersection = words1.intersection(words2)
+    union = words1.union(words2)
+
+    # Jaccard 유사도 계산
+    similarity = len(intersection) / len(union) if union else 1.0
+
+    return similarity
+
+
+class TokenSetDiversity:
+    """
+    후보 텍스트들과 "선택된 텍스트 누적 집합" 사이의 Jaccard 유사도를 점진적으로 계산합니다.
+
+    선택된 텍스트들을 공백으로 이어 붙인 문자열의 토큰 집합은 각 텍스트 토큰 집합의 합집합과 같으므로,
+    jaccard_similarity(후보, 누적 텍스트) 와 완전히 같은 값을 반환합니다.
+    토큰은 정수 ID 로 바꾸어 후보별 토큰 목록과 토큰별 후보 목록(역색인)을 CSR 배열로 보관합니다.
+    """
+
+    def __init__(self, texts):
+        """
+        Args:
+            texts (list): 후보 텍스트 리스트 (위치 번호로 후보를 구분)
+        """
+        vocabulary = {}
+        token_ids = []
+        sizes = []
+        for text in texts:
+            tokens = set(text.lower().split())
+            token_ids.extend([vocabulary.setdefault(token, len(vocabulary)) for token in tokens])
+            sizes.append(len(tokens))
+
+        self.sizes = np.array(sizes, dtype=np.int64)
+        self.intersections = np.zeros(len(texts), dtype=np.int64)
+        self.selected_count = 0
+        self._selected = np.zeros(len(vocabulary), dtype=bool)
+
+        # 후보 위치 -> 토큰 ID 목록
+        self._token_ids = np.array(token_ids, dtype=np.int64)
+        self._token_offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(self.sizes, out=self._token_offsets[1:])
+
+        # 토큰 ID -> 해당 토큰을 가진 후보 위치 목록 (역색인)
+        positions = np.repeat(np.arange(len(texts), dtype=np.int64), self.sizes)
+        order = np.argsort(self._token_ids, kind='stable')
+        self._postings = positions[order]
+        self._posting_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._token_ids, minlength=len(vocabulary)), out=self._posting_offsets[1:])
+
+    def add(self, position):
+        """위치 position 의 후보를 선택된 집합에 추가하고 후보별 교집합 크기를 갱신합니다."""
+        token_ids = self._token_ids[self._token_offsets[position]:self._token_offsets[position + 1]]
+        new_tokens = token_ids[~self._selected[token_ids]]
+        if not new_tokens.size:
+            return
+        self._selected[new_tokens] = True
+        self.selected_count += int(new_tokens.size)
+
+        touched = np.concatenate([self._postings[self._posting_offsets[token]:self._posting_offsets[token + 1]]
+                                  for token in new_tokens.tolist()])
+        self.intersections += np.bincount(touched, minlength=len(self.intersections))
+
+    def similarities(self):
+        """모든 후보의 현재 Jaccard 유사도 배열을 반환합니다 (합집합이 비어 있으면 1.0)."""
+        unions = self.sizes + self.selected_count - self.intersections
+        return np.divide(self.intersections, unions, out=np.ones(len(unions)), where=unions > 0)
+
+
+def select_first(text_list, quality_scores, candidate_indices):
+    """첫 텍스트 선택: 품질 점수(70%)와 길이(30%)를 모두 고려해 후보 내 위치를 반환합니다."""
+    best_first = -1
+    best_first_score = -1
+    for position, index in enumerate(candidate_indices):
+        length_score = min(1, len(text_list[index]) / 500)  # 적당한 길이 선호
+        combined_score = quality_scores[index] * 0.7 + length_score * 0.3
+        if combined_score > best_first_score:
+            best_first_score = combined_score
+            best_first = position
+    return best_first
+
+
+def greedy_select(text_list, quality_scores, candidate_indices, max_length=5000,
+                  quality_weight=0.1, diversity_weight=0.9, diversity_backend='exact'):
+    """
+    품질과 다양성을 고려해 후보 중에서 텍스트를 순차적으로 선택합니다.
+
+    첫 텍스트는 품질(70%)과 길이(30%)로, 이후 텍스트는 품질과 다양성의 가중합으로 고르며
+    선택된 텍스트의 총 길이가 max_length 를 넘지 않도록 합니다.
+    후보별 교집합 크기를 점진적으로 유지하므로 라운드마다 후보 전체 점수를 numpy 로 한 번에 계산하며,
+    전체 비용은 O(후보 토큰 수 + 라운드 수 * 후보 수) 입니다.
+    라운드 수는 max_length / 후보 길이로 제한되므로 후보 수에 대해 선형으로 늘어납니다.
+
+    Args:
+        text_list (list): 전체 텍스트 리스트
+        quality_scores (list): text_list 와 같은 순서의 품질 점수
+        candidate_indices (list): 후보 텍스트 인덱스 (우선순위 순서, 동점이면 앞쪽 후보 선택)
+        max_length (int): 선택된 텍스트 총 길이 상한
+        quality_weight (float): 두 번째 텍스트부터 적용되는 품질 점수 가중치
+        diversity_weight (float): 두 번째 텍스트부터 적용되는 다양성 점수 가중치
+        diversity_backend (str): 'exact' (토큰 집합 Jaccard) 또는 'minhash' (MinHash 근사 Jaccard, 비교 실험용)
+    Returns:
+        tuple: (선택된 인덱스 리스트, 선택 시점의 다양성 점수 리스트)
+    """
+    if not candidate_indices:
+        return [], []
+
+    candidates = np.array(candidate_indices, dtype=np.int64)
+    qualities = np.array([quality_scores[index] for index in candidate_indices], dtype=np.float64)
+    lengths = np.array([len(text_list[index]) for index in candidate_indices], dtype=np.int64)
+    available = np.ones(len(candidates), dtype=bool)
+
+    best_first = select_first(text_list, quality_scores, candidate_indices)
+    diversity = DIVERSITY_BACKENDS[diversity_backend]([text_list[index] for index in candidate_indices])
+
+    selected_positions = [best_first]
+    diversity_scores = [0]
+    total_length = int(lengths[best_first])
+    available[best_first] = False
+    diversity.add(best_first)
+
+    while available.any() and total_length < max_length:
+        feasible = available & (total_length + lengths <= max_length)
+        if not feasible.any():
+            break
+
+        # 결합 점수 - 다양성은 1 - 누적 선택 텍스트와의 유사도
+        candidate_diversity = 1 - diversity.similarities()
+        combined = qualities * quality_weight + candidate_diversity * diversity_weight
+        combined[~feasible] = -np.inf
+        best = int(np.argmax(combined))
+
+        selected_positions.append(best)
+        diversity_scores.append(float(candidate_diversity[best]))
+        total_length += int(lengths[best])
+        available[best] = False
+        diversity.add(best)
+
+    return [int(candidates[position]) for position in selected_positions], diversity_scores
+
+
+# SamplingConfig.diversity_backend 값 -> 다양성 계산기 클래스
+DIVERSITY_BACKENDS = {
+    'exact': TokenSetDiversity,
+    'minhash': MinHashDiversity,
+}
@@ -0,0 +1,180 @@
+"""
+DynamoDB 일괄 쓰기(BatchWriteItem) 모듈
+
+저장 한 번(save)에 BatchWriter 하나를 열어 항목을 25개씩 모아 BatchWriteItem 으로 보냅니다.
+- 클라이언트는 모듈 수준에서 한 번만 만들고 모든 호출/스레드가 공유 (boto3 클라이언트는 스레드 안전)
+- 같은 요청 안에 키가 같은 항목이 있으면 DynamoDB 가 요청 전체를 거부하므로, 버퍼에서 나중 항목으로 덮어씀
+- 쓰기를 마친 항목은 키별로 written_items 에 남기므로, 호출자는 put 한 수가 아니라 실제로 저장된 행 수를 알 수 있음
+- 응답의 UnprocessedItems 는 지수 백오프 + full jitter 로 다시 보내고,
+  재시도 횟수를 넘기면 남은 항목 수와 함께 UnprocessedItemsError 를 발생시킴 (조용히 버리지 않음)
+- 저장마다 처리량 지표(BatchWriteMetrics)를 남기고, 모듈 전체 누적 지표(write_totals)도 함께 갱신
+"""
+import time
+import random
+import threading
+from dataclasses import dataclass, asdict
+
+import boto3
+from boto3.dynamodb.types import TypeSerializer
+
+# BatchWriteItem 한 번에 보낼 수 있는 최대 항목 수
+BATCH_WRITE_LIMIT = 25
+
+# UnprocessedItems 재전송: 최대 재시도 횟수와 백오프 기본/최대 대기 시간(초)
+UNPROCESSED_MAX_RETRIES = 8
+UNPROCESSED_BACKOFF_BASE = 0.05
+UNPROCESSED_BACKOFF_MAX = 5.0
+
+# 모든 저장이 공유하는 클라이언트
+dynamodb_client = boto3.client('dynamodb')
+
+_serializer = TypeSerializer()
+
+
+class UnprocessedItemsError(Exception):
+    """재시도 후에도 UnprocessedItems 로 남은 항목이 있을 때 발생"""
+
+    def __init__(self, table_name, items):
+        super().__init__(f"{len(items)} items were not written to {table_name} after retries")
+        self.table_name = table_name
+        self.items = items
+
+
+@dataclass
+class BatchWriteMetrics:
+    """일괄 쓰기 처리량 지표"""
+    items: int = 0                 # 쓰기 완료한 항목 수
+    requests: int = 0              # BatchWriteItem 호출 수 (재전송 포함)
+    unprocessed_retries: int = 0   # UnprocessedItems 재전송 호출 수
+    unprocessed_items: int = 0     # UnprocessedItems 로 돌아온 항목 수 (누적)
+    duplicate_keys: int = 0        # 같은 요청 안에서 덮어쓴 항목 수
+    failed_items: int = 0          # 재시도 후에도 쓰지 못한 항목 수
+    seconds: float = 0.0           # 쓰기에 걸린 시간
+
+    @property
+    def items_per_second(self):
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def add(self, other):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def since(self, earlier):
+        """earlier 시점 이후 늘어난 만큼의 지표 (누적 지표 두 개의 차이)"""
+        return BatchWriteMetrics(**{name: value - getattr(earlier, name) for name, value in asdict(self).items()})
+
+    def as_dict(self):
+        return {**asdict(self), 'seconds': round(self.seconds, 3), 'items_per_second': round(self.items_per_second, 1)}
+
+
+class _WriteTotals:
+    """모듈 전체 누적 지표 (여러 스레드의 저장이 함께 갱신)"""
+
+    def __init__(self):
+        self.metrics = BatchWriteMetrics()
+        self._lock = threading.Lock()
+
+    def add(self, metrics):
+        with self._lock:
+            self.metrics.add(metrics)
+
+    def snapshot(self):
+        with self._lock:
+            return BatchWriteMetrics(**asdict(self.metrics))
+
+
+write_totals = _WriteTotals()
+
+
+def unprocessed_backoff_delay(attempt, base_delay=UNPROCESSED_BACKOFF_BASE, max_delay=UNPROCESSED_BACKOFF_MAX):
+    """attempt 번째(0부터) 재전송 전 대기 시간 (full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class BatchWriter:
+    """
+    테이블 하나에 대한 일괄 쓰기 (with 문으로 사용, 끝날 때 남은 항목을 보냄)
+
+        with BatchWriter('AppReview', ('app_id', 'date_user_id')) as writer:
+            writer.put(item)
+        print(writer.metrics.as_dict(), len(writer.written_items))
+    """
+
+    def __init__(self, table_name, key_names, client=None, max_retries=UNPROCESSED_MAX_RETRIES,
+                 backoff_base=UNPROCESSED_BACKOFF_BASE, sleep=time.sleep):
+        self.table_name = table_name
+        self.key_names = tuple(key_names)
+        self.client = client or dynamodb_client
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.metrics = BatchWriteMetrics()
+        self._sleep = sleep
+        self._buffer = {}  # 키 -> (항목, PutRequest) (같은 키는 나중 항목이 덮어씀)
+        self._written = {}  # 키 -> 쓰기를 마친 항목 (같은 키를 다시 쓰면 나중 항목)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 본문에서 예외가 났으면 남은 항목을 보내지 않고 예외를 그대로 전달
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def put(self, item):
+        """항목을 버퍼에 넣고, BATCH_WRITE_LIMIT 개가 모이면 보냅니다."""
+        key = tuple(item[name] for name in self.key_names)
+        if key in self._buffer:
+            self.metrics.duplicate_keys += 1
+            write_totals.add(BatchWriteMetrics(duplicate_keys=1))
+        self._buffer[key] = (item, {'PutRequest': {'Item': {name: _serializer.serialize(value)
+                                                            for name, value in item.items()}}})
+        if len(self._buffer) >= BATCH_WRITE_LIMIT:
+            self._send_buffer()
+
+    @property
+    def written_items(self):
+        """쓰기를 마친 항목들 (키마다 하나 - 같은 키로 덮어쓴 항목은 테이블의 행처럼 하나로 셈)"""
+        return list(self._written.values())
+
+    def flush(self):
+        """버퍼에 남은 항목을 모두 보냅니다."""
+        while self._buffer:
+            self._send_buffer()
+
+    def _send_buffer(self):
+        keys = list(self._buffer)[:BATCH_WRITE_LIMIT]
+        entries = [self._buffer.pop(key) for key in keys]
+        self._write([request for _, request in entries])
+        for key, (item, _) in zip(keys, entries):
+            self._written.pop(key, None)  # 다시 쓴 키는 순서상 마지막으로
+            self._written[key] = item
+
+    def _write(self, requests):
+        """요청을 보내고 UnprocessedItems 가 없어질 때까지 백오프하며 다시 보냅니다."""
+        start = time.perf_counter()
+        metrics = BatchWriteMetrics()
+        try:
+            attempt = 0
+            while True:
+                response = self.client.batch_write_item(RequestItems={self.table_name: requests})
+                metrics.requests += 1
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+                metrics.items += len(requests) - len(unprocessed)
+                if not unprocessed:
+                    return
+                metrics.unprocessed_items += len(unprocessed)
+                if attempt >= self.max_retries:
+                    metrics.failed_items += len(unprocessed)
+                    raise UnprocessedItemsError(self.table_name, unprocessed)
+                delay = unprocessed_backoff_delay(attempt, self.backoff_base)
+                print(f"{len(unprocessed)} unprocessed items for {self.table_name} "
+                      f"(retry {attempt + 1}/{self.max_retries}), retrying in {delay:.2f}s")
+                self._sleep(delay)
+                metrics.unprocessed_retries += 1
+                requests = unprocessed
+                attempt += 1
+        finally:
+            metrics.seconds = time.perf_counter() - start
+            self.metrics.add(metrics)
+            write_totals.add(metrics)
@@ -0,0 +1,99 @@
+"""
+앱별 리뷰 증분 수집 상태(워터마크) 모듈
+
+스토어는 리뷰를 최신순으로 돌려주고 수집은 마지막으로 저장한 리뷰 시각보다 오래된 리뷰에서 멈추므로,
+새로 받은 리뷰와 겹칠 수 있는 기존 리뷰는 그 시각 직전의 리뷰뿐입니다.
+그래서 증분 수집 때마다 저장된 리뷰 전체로 중복 확인 집합을 다시 만드는 대신
+- 마지막으로 수집한 리뷰의 시각과 reviewId
+- 최근 수집한 리뷰 WATERMARK_RECENT_IDS 개의 reviewId 와 서명(사용자명 + 내용 앞부분의 해시)
+만 앱별로 보관해 중복 확인에 사용합니다.
+워터마크가 없거나 손상된 경우 호출하는 쪽에서 저장된 리뷰로부터 다시 만듭니다 (IngestWatermark.from_entries).
+"""
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# 저장 형식 버전 (형식이 바뀌면 올려서 이전 워터마크를 손상된 것으로 취급)
+WATERMARK_VERSION = 1
+
+# 보관할 최근 리뷰 ID/서명 수 (AppIngestState 항목 크기 제한용)
+WATERMARK_RECENT_IDS = 500
+
+# 서명에 사용하는 리뷰 내용 앞부분 길이
+SIGNATURE_CONTENT_LENGTH = 100
+
+
+def review_signature(username, content):
+    """reviewId 가 바뀐 같은 리뷰를 찾기 위한 서명: 사용자명 + 내용 앞부분의 짧은 해시"""
+    text = f"{username}:{(content or '')[:SIGNATURE_CONTENT_LENGTH]}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class IngestWatermark:
+    """
+    한 앱의 증분 수집 워터마크
+
+    entries 는 (리뷰 시각 ISO 문자열, reviewId, 서명) 튜플이며, 최근 목록은 최신순으로 보관합니다.
+    """
+    latest_at: str
+    latest_review_id: str = ''
+    recent_ids: List[str] = field(default_factory=list)
+    recent_signatures: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_entries(cls, entries) -> Optional['IngestWatermark']:
+        """리뷰 entries 로 워터마크 생성 (리뷰가 없으면 None)"""
+        entries = sorted(entries, key=lambda entry: datetime.fromisoformat(entry[0]), reverse=True)
+        if not entries:
+            return None
+        recent = entries[:WATERMARK_RECENT_IDS]
+        return cls(
+            latest_at=entries[0][0],
+            latest_review_id=entries[0][1],
+            recent_ids=[review_id for _, review_id, _ in recent if review_id],
+            recent_signatures=[signature for _, _, signature in recent],
+        )
+
+    @classmethod
+    def from_item(cls, item) -> Optional['IngestWatermark']:
+        """저장된 항목을 워터마크로 변환 (없거나, 버전이 다르거나, 형식이 잘못되었으면 None)"""
+        if not item:
+            return None
+        try:
+            if int(item.get('version', -1)) != WATERMARK_VERSION:
+                return None
+            watermark = cls(
+                latest_at=str(item['latest_at']),
+                latest_review_id=str(item.get('latest_review_id', '')),
+                recent_ids=[str(review_id) for review_id in item.get('recent_ids', [])],
+                recent_signatures=[str(signature) for signature in item.get('recent_signatures', [])],
+            )
+            datetime.fromisoformat(watermark.latest_at)
+            return watermark
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def to_item(self, app_id):
+        """AppIngestState 테이블에 저장할 항목"""
+        return {
+            'app_id': app_id,
+            'version': WATERMARK_VERSION,
+            'latest_at': self.latest_at,
+            'latest_review_id': self.latest_review_id,
+            'recent_ids': self.recent_ids,
+            'recent_signatures': self.recent_signatures,
+            'updated_at': datetime.now().isoformat(),
+        }
+
+    def advanced(self, entries):
+        """새로 저장한 리뷰 entries 를 반영한 워터마크 (최근 목록은 최신순으로 잘라 보관)"""
+        newer = IngestWatermark.from_entries(entries)
+        if newer is None:
+            return self
+        if datetime.fromisoformat(newer.latest_at) < datetime.fromisoformat(self.latest_at):
+            newer.latest_at, newer.latest_review_id = self.latest_at, self.latest_review_id
+        newer.recent_ids = (newer.recent_ids + self.recent_ids)[:WATERMARK_RECENT_IDS]
+        newer.recent_signatures = (newer.recent_signatures + self.recent_signatures)[:WATERMARK_RECENT_IDS]
+        return newer
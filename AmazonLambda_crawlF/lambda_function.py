@@ -29,11 +29,27 @@ app_summary_table 에 대한 로직을 수정해줘.
         }
 """
 import json
+import base64
+import time
+import queue
+import threading
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from google_play_scraper import Sort, reviews
 import pandas as pd
-from llm import LLM
+from llm import LLM, SamplingConfig
+from text_quality import QUALITY_SCORER_VERSION, batch_evaluate_text_quality, content_hash
+from minhash import MinHasher, MinHashLSH, char_shingles
+from ingest_watermark import IngestWatermark, review_signature
+from review_stats import get_app_stats, save_reviews_with_stats
+from summary_jobs import get_summary_job, submit_summary_job
+from summary_lock import SUMMARY_LOCK_WAIT_SECONDS, SummaryInProgressError, SummaryLock, request_wait_seconds
+from delta_summary import (SUMMARY_MODES, default_summary_mode, delta_input, delta_prompt, delta_sampling_config,
+                           plan_summary)
+from map_reduce_summary import MAP_REDUCE_LOCK_TTL_SECONDS, MAP_REDUCE_REVIEW_WINDOW, map_reduce_summary
+from response_encoding import encode_response, negotiate_encoding
+from serializer import dumps
+from itertools import islice
 from datetime import datetime, timedelta
 from decimal import Decimal
 from lambda_user_table import save_user, get_user_by_google_id
@@ -76,11 +92,57 @@ PROMPT = """다음 앱 리뷰 데이터를 분석하여 앱 개선을 위한 심
 
 각 인사이트는 반드시 실제 리뷰 내용을 인용하여 뒷받침하고, 특히 복잡한 감정이나 미묘한 사용자 피드백에 중점을 두어 분석해주세요."""
 
+# Near-duplicate (spam) review flagging: Jaccard similarity over character 3-gram shingles, with MinHash LSH
+# candidates confirmed by the exact similarity. benchmark_minhash.py against lightly edited spam copies
+# (precision is 1.000 and no distinct review is flagged at every threshold from 0.5 to 0.9):
+#   threshold 0.6 recall 0.933, 0.7 recall 0.917, 0.8 recall 0.743, 0.9 recall 0.353
+# 0.7 keeps almost all of the recall; below it LSH rarely proposes the pair, so recall barely rises while
+# short generic reviews get closer to being flagged. Flagged reviews are still stored with
+# near_duplicate=True and only left out of summaries
+NEAR_DUPLICATE_THRESHOLD = 0.7
+NEAR_DUPLICATE_MIN_LENGTH = 30  # Short reviews like "좋아요" legitimately repeat, so they are never suppressed
+NEAR_DUPLICATE_WINDOW = 1000  # Incremental crawls compare new reviews with this many newest stored reviews
+
+# Review attributes needed for summarization (stored quality scores included)
+SUMMARY_REVIEW_FIELDS = ['content', 'date', 'score', 'quality_score', 'quality_version', 'content_hash', 'near_duplicate']
+
+# Scraped pages waiting for the background review writer (bounds ingestion memory to a few pages)
+PIPELINE_MAX_PENDING_PAGES = 2
+
+# Review attributes needed for duplicate checking of newly fetched reviews
+DEDUP_REVIEW_FIELDS = ['reviewId', 'username', 'content', 'date']
+
+# Reviews outside this content length range are not used for summaries
+SUMMARY_MIN_CONTENT_LENGTH = 50
+SUMMARY_MAX_CONTENT_LENGTH = 400
+
+# Recent review window reads: items evaluated per query page and maximum pages per window,
+# which together bound the read capacity (and latency) of one summary request
+RECENT_WINDOW_PAGE_SIZE = 200
+RECENT_WINDOW_MAX_PAGES = 50
+
+# DynamoDB size() counts UTF-8 bytes, at most this many per character
+MAX_UTF8_BYTES_PER_CHAR = 4
+
+# Paginated app_review_read: default/maximum reviews per page and the attributes clients may request
+REVIEW_PAGE_SIZE = 100
+REVIEW_MAX_PAGE_SIZE = 1000
+REVIEW_RESPONSE_FIELDS = ['date', 'username', 'score', 'content', 'reviewId', 'quality_score', 'date_user_id']
+REVIEW_PAGE_PARAMS = ['page_size', 'next_token', 'fields', 'since', 'until', 'order']
+
 # DynamoDB resource initialization
 dynamodb = boto3.resource('dynamodb')
 app_info_table = dynamodb.Table('AppInfo')
 app_review_table = dynamodb.Table('AppReview')
 app_summary_table = dynamodb.Table('AppSummary')
+ingest_state_table = dynamodb.Table('AppIngestState')
+
+# The resource's low-level client (same value conversion as the Table methods, called with TableName).
+# Clients are thread-safe and Table resources are not, so the review ingest path, which also runs on
+# ReviewWriter and review_crawler worker threads, reads and writes through it
+table_client = dynamodb.meta.client
+
+near_duplicate_hasher = MinHasher()
 
 # Request body parsing function
 
@@ -98,10 +160,14 @@ def cover_api_and_invoke(event, context):
 
 
 def get_all_app_info():
-    """Retrieve all app information"""
+    """Retrieve all app information (every scan page, AppInfo can exceed the 1 MB scan limit)"""
     try:
         response = app_info_table.scan()
-        return response.get('Items', [])
+        items = response.get('Items', [])
+        while 'LastEvaluatedKey' in response:
+            response = app_info_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
+            items.extend(response.get('Items', []))
+        return items
     except Exception as e:
         print(f"Error retrieving app information: {str(e)}")
         raise e
@@ -162,7 +228,8 @@ def add_app_info(app_info_data):
 def get_latest_review_date(app_id):
     """Retrieve the most recent review date for a specific app"""
     try:
-        response = app_review_table.query(
+        response = table_client.query(
+            TableName=app_review_table.name,
             KeyConditionExpression=Key('app_id').eq(app_id),
             ScanIndexForward=False,  # Descending order
             Limit=1
@@ -177,57 +244,481 @@ def get_latest_review_date(app_id):
         return None
 
 
-def get_app_reviews(app_id):
-    """Retrieve all reviews for a specific app"""
-    try:
-        all_reviews = []
-        last_evaluated_key = None
+def build_review_query(app_id, fields=None, newest_first=False, page_size=None,
+                       filter_expression=None, start_date=None, end_date=None):
+    """
+    Build AppReview query arguments for an app's reviews.
+
+    fields: attribute names to project (None for all attributes)
+    newest_first: read in descending date_user_id order (the sort key starts with the date)
+    page_size: maximum items evaluated per query (None for DynamoDB's 1 MB page)
+    filter_expression: server-side filter (filtered items are not returned but still consume read capacity)
+    start_date, end_date: optional review date range (YYYY-MM-DD, inclusive) applied as a sort key condition
+    """
+    key_condition = Key('app_id').eq(app_id)
+    if start_date or end_date:
+        # '$' sorts right after '#', so the upper bound covers every username of end_date
+        key_condition = key_condition & Key('date_user_id').between(
+            f"{start_date or ''}#", f"{end_date or '9999-12-31'}$")
+    query_kwargs = {
+        'KeyConditionExpression': key_condition,
+        'ScanIndexForward': not newest_first,
+    }
+    if filter_expression is not None:
+        query_kwargs['FilterExpression'] = filter_expression
+    if fields:
+        # Placeholders avoid clashes with reserved words such as 'date'
+        query_kwargs['ProjectionExpression'] = ', '.join(f"#f{i}" for i in range(len(fields)))
+        query_kwargs['ExpressionAttributeNames'] = {f"#f{i}": field for i, field in enumerate(fields)}
+    if page_size:
+        query_kwargs['Limit'] = page_size
+    return query_kwargs
+
+
+def iter_app_review_pages(app_id, fields=None, newest_first=False, page_size=None,
+                          filter_expression=None, read_stats=None, start_date=None, end_date=None):
+    """
+    Lazily yield pages (lists of items) of an app's reviews, one DynamoDB query per page.
+
+    Arguments other than read_stats are described in build_review_query.
+    read_stats: optional dict accumulating pages, scanned/returned item counts and consumed capacity units
+    """
+    query_kwargs = build_review_query(app_id, fields, newest_first, page_size, filter_expression,
+                                      start_date, end_date)
+    if read_stats is not None:
+        query_kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+        for stat in ('pages', 'scanned_count', 'returned_count', 'capacity_units'):
+            read_stats.setdefault(stat, 0)
 
+    try:
         while True:
-            if last_evaluated_key:
-                response = app_review_table.query(
-                    KeyConditionExpression=Key('app_id').eq(app_id),
-                    ExclusiveStartKey=last_evaluated_key
-                )
-            else:
-                response = app_review_table.query(
-                    KeyConditionExpression=Key('app_id').eq(app_id)
-                )
+            response = table_client.query(TableName=app_review_table.name, **query_kwargs)
+            if read_stats is not None:
+                read_stats['pages'] += 1
+                read_stats['scanned_count'] += response.get('ScannedCount', 0)
+                read_stats['returned_count'] += response.get('Count', 0)
+                read_stats['capacity_units'] += float(
+                    response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+            yield response.get('Items', [])
 
-            all_reviews.extend(response.get('Items', []))
             last_evaluated_key = response.get('LastEvaluatedKey')
-
             if not last_evaluated_key:
                 break
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+    except Exception as e:
+        print(f"Error retrieving app review pages (app_id={app_id}): {str(e)}")
+        raise e
+
+
+def iter_app_reviews(app_id, fields=None, newest_first=False, page_size=None, start_date=None, end_date=None):
+    """Lazily yield an app's reviews one item at a time (see iter_app_review_pages)"""
+    for page in iter_app_review_pages(app_id, fields, newest_first, page_size,
+                                      start_date=start_date, end_date=end_date):
+        yield from page
 
-        return all_reviews
+
+def get_app_reviews(app_id, fields=None):
+    """Retrieve all reviews for a specific app"""
+    try:
+        return list(iter_app_reviews(app_id, fields))
     except Exception as e:
         print(f"Error retrieving app reviews (app_id={app_id}): {str(e)}")
         raise e
 
 
-def fetch_and_save_new_reviews(app_id, latest_review_date=None):
-    """Fetch new reviews from the store and save to DB without duplicates"""
+def encode_review_page_token(app_id, last_evaluated_key, query_params):
+    """Opaque next_token: the query's LastEvaluatedKey plus the parameters it is valid for"""
+    payload = {'app_id': app_id, 'key': last_evaluated_key['date_user_id'], 'params': query_params}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_review_page_token(token, app_id, query_params):
+    """Return the ExclusiveStartKey of a next_token (ValueError if it is malformed or from another query)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        if payload['app_id'] != app_id or payload['params'] != query_params:
+            raise ValueError
+        return {'app_id': app_id, 'date_user_id': str(payload['key'])}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("Invalid next_token for this app_review_read request.")
+
+
+def get_app_review_page(app_id, fields=None, since=None, until=None, page_size=REVIEW_PAGE_SIZE,
+                        next_token=None, newest_first=True):
+    """
+    Retrieve one page of an app's reviews and the next_token for the following page (None on the last page)
+
+    since, until: review date range (YYYY-MM-DD, inclusive)
+    next_token: token returned with the previous page of the same query
+    """
+    query_params = {'since': since, 'until': until, 'newest_first': newest_first}
+    query_kwargs = build_review_query(app_id, fields, newest_first, page_size, start_date=since, end_date=until)
+    if next_token:
+        query_kwargs['ExclusiveStartKey'] = decode_review_page_token(next_token, app_id, query_params)
+
+    try:
+        response = app_review_table.query(**query_kwargs)
+    except Exception as e:
+        print(f"Error retrieving app review page (app_id={app_id}): {str(e)}")
+        raise e
+
+    last_evaluated_key = response.get('LastEvaluatedKey')
+    token = encode_review_page_token(app_id, last_evaluated_key, query_params) if last_evaluated_key else None
+    return response.get('Items', []), token
+
+
+def parse_review_page_request(body_dict):
+    """Validate the paginated app_review_read parameters (ValueError on invalid input)"""
+    fields = body_dict.get('fields')
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    if fields is not None:
+        if not isinstance(fields, list) or not fields or any(field not in REVIEW_RESPONSE_FIELDS for field in fields):
+            raise ValueError(f"fields must be a non-empty list of: {', '.join(REVIEW_RESPONSE_FIELDS)}")
+
+    try:
+        page_size = int(body_dict.get('page_size', REVIEW_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("page_size must be an integer.")
+    if not 1 <= page_size <= REVIEW_MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {REVIEW_MAX_PAGE_SIZE}.")
+
+    dates = {}
+    for name in ('since', 'until'):
+        value = body_dict.get(name)
+        if value:
+            try:
+                # Full ISO timestamps are accepted; only the date part is used
+                dates[name] = datetime.fromisoformat(str(value)).date().isoformat()
+            except ValueError:
+                raise ValueError(f"{name} must be a date (YYYY-MM-DD).")
+        else:
+            dates[name] = None
+
+    order = body_dict.get('order', 'newest')
+    if order not in ('newest', 'oldest'):
+        raise ValueError("order must be 'newest' or 'oldest'.")
+
+    return {
+        'fields': fields,
+        'since': dates['since'],
+        'until': dates['until'],
+        'page_size': page_size,
+        'next_token': body_dict.get('next_token'),
+        'newest_first': order == 'newest',
+    }
+
+
+def get_recent_review_window(app_id, count, fields=SUMMARY_REVIEW_FIELDS,
+                             page_size=RECENT_WINDOW_PAGE_SIZE, max_pages=RECENT_WINDOW_MAX_PAGES):
+    """
+    Read the `count` newest summary candidate reviews of an app with bounded read capacity.
+
+    Reviews are queried newest-first on the date_user_id sort key. Out-of-range content lengths are
+    dropped server-side, so only candidates are transferred and held in memory. Reading stops once
+    `count` candidates are known and their last day is complete, so the result has the same
+    top-`count` reviews (by full 'date' timestamp) as loading and sorting the whole partition.
+    At most max_pages pages of page_size items are evaluated; a window cut short by this budget
+    holds the newest reviews that were read.
+
+    Returns:
+        tuple: (candidate reviews, newest first by day, read statistics dict)
+    """
+    # size() counts bytes, so the server-side upper bound is loose and exact lengths are re-checked below
+    length_filter = (
+        Attr('content').size().gt(SUMMARY_MIN_CONTENT_LENGTH) &
+        Attr('content').size().lt(SUMMARY_MAX_CONTENT_LENGTH * MAX_UTF8_BYTES_PER_CHAR) &
+        Attr('near_duplicate').not_exists()
+    )
+    read_stats = {}
+    window_reviews = []
+    current_day = None
+
+    try:
+        for page in iter_app_review_pages(app_id, fields, newest_first=True, page_size=page_size,
+                                          filter_expression=length_filter, read_stats=read_stats):
+            for review in page:
+                if not is_summary_candidate(review):
+                    continue
+
+                review_day = str(review.get('date', ''))[:10]
+                if review_day != current_day:
+                    if len(window_reviews) >= count:
+                        return window_reviews, read_stats
+                    current_day = review_day
+                window_reviews.append(review)
+
+            if read_stats['pages'] >= max_pages:
+                print(f"Recent review window read budget reached (app_id={app_id}, pages={max_pages})")
+                break
+
+        return window_reviews, read_stats
+    except Exception as e:
+        print(f"Error retrieving recent review window (app_id={app_id}): {str(e)}")
+        raise e
+
+
+class ReviewSnapshot:
+    """
+    Request-scoped view of an app's stored reviews, so one request reads the AppReview partition at most once.
+
+    - latest_review_date: a single-key query, answered from memory once the partition is loaded
+    - reviews: the partition, loaded lazily on first use (duplicate checking, app_review_read response)
+    - recent_contents: the newest reviews' contents for near-duplicate checks of incremental crawls
+    - merge: reviews saved during the request are added in memory instead of being read back
+    - recent_window: the summary window, from memory when loaded, otherwise with the bounded window query
+    """
+
+    def __init__(self, app_id, fields=None):
+        """
+        Args:
+            app_id (str): app whose reviews are read
+            fields (list): attributes to load (None for all attributes); the sort key is always included
+        """
+        self.app_id = app_id
+        self.fields = list(dict.fromkeys(['date_user_id'] + fields)) if fields else None
+        self._items = None
+        # Set when a merged key landed before an existing one; the next sorted read re-sorts once
+        self._unsorted = False
+        self._latest_review_date = None
+        self._latest_review_date_read = False
+
+    @property
+    def loaded(self):
+        return self._items is not None
+
+    def load(self):
+        """Read the partition if it has not been read yet"""
+        if self._items is None:
+            self._items = {item['date_user_id']: item for item in iter_app_reviews(self.app_id, self.fields)}
+        return self
+
+    def _sorted_items(self):
+        """The loaded reviews keyed by sort key, in sort key order"""
+        if self._unsorted:
+            self._items = dict(sorted(self._items.items()))
+            self._unsorted = False
+        return self._items
+
+    @property
+    def reviews(self):
+        """All stored reviews in sort key order (reads the partition on first access)"""
+        return list(self.load()._sorted_items().values())
+
+    @property
+    def latest_review_date(self):
+        """'date' of the newest review by sort key (None if there are no reviews)"""
+        if self._items is not None:
+            return next(reversed(self._sorted_items().values()), {}).get('date')
+        if not self._latest_review_date_read:
+            self._latest_review_date = get_latest_review_date(self.app_id)
+            self._latest_review_date_read = True
+        return self._latest_review_date
+
+    def merge(self, items):
+        """Add reviews saved to the table during this request (same keys overwrite, as put_item does)"""
+        if self._items is None:
+            # Not loaded yet: the saved reviews are read with the partition, only the cached date is stale
+            self._latest_review_date_read = False
+            return
+
+        for item in items:
+            if self.fields:
+                item = {field: item[field] for field in self.fields if field in item}
+            key = item['date_user_id']
+            # New reviews are usually the newest, so appending keeps the order without sorting per page
+            if not self._unsorted and key not in self._items and self._items and key < next(reversed(self._items)):
+                self._unsorted = True
+            self._items[key] = item
+
+    def recent_contents(self, count):
+        """Contents of the `count` newest reviews by sort key (a bounded newest-first read when not loaded)"""
+        if self._items is None:
+            newest = islice(iter_app_reviews(self.app_id, ['content'], newest_first=True, page_size=count), count)
+            return [review.get('content', '') for review in newest]
+        return [review.get('content', '') for review in list(self._sorted_items().values())[-count:]]
+
+    def recent_window(self, count):
+        """
+        The `count` newest summary candidate reviews and read statistics (see get_recent_review_window).
+
+        Returns:
+            tuple: (candidate reviews, newest first, read statistics dict)
+        """
+        if self._items is None:
+            return get_recent_review_window(self.app_id, count, self.fields or SUMMARY_REVIEW_FIELDS)
+
+        candidates = [review for review in self._items.values() if is_summary_candidate(review)]
+        candidates.sort(key=lambda review: str(review.get('date', '')), reverse=True)
+        return candidates[:count], {'pages': 0, 'from_snapshot': True}
+
+
+def stored_review_entries(items):
+    """(date, reviewId, signature) entries of stored AppReview items for the ingest watermark"""
+    return [(str(item['date']), item.get('reviewId', ''), review_signature(item.get('username'), item.get('content')))
+            for item in items if item.get('date')]
+
+
+def get_ingest_watermark(app_id, latest_review_date):
+    """
+    Retrieve the app's ingest watermark, or None when it has to be rebuilt from the stored reviews:
+    missing, corrupt, or newer than the newest stored review (latest_review_date)
+
+    A watermark older than the stored reviews (an interrupted crawl saved some pages) is still used:
+    the crawl restarts from it and reviews saved since are skipped as duplicates or rewritten in place.
+    """
+    try:
+        item = table_client.get_item(TableName=ingest_state_table.name, Key={'app_id': app_id}).get('Item')
+    except Exception as e:
+        print(f"Error retrieving ingest watermark (app_id={app_id}): {str(e)}")
+        return None
+
+    watermark = IngestWatermark.from_item(item)
+    if watermark is None:
+        if item or latest_review_date:
+            print(f"Ingest watermark missing or corrupt (app_id={app_id}). Rebuilding from stored reviews.")
+        return None
+
+    # A cleared or rolled back review table
+    if not latest_review_date or latest_review_date[:10] < watermark.latest_at[:10]:
+        print(f"Ingest watermark ({watermark.latest_at}) is newer than the newest stored review "
+              f"({latest_review_date}) (app_id={app_id}). Rebuilding from stored reviews.")
+        return None
+    return watermark
+
+
+def save_ingest_watermark(app_id, watermark):
+    """Save the app's ingest watermark (on failure the next crawl rebuilds it)"""
     try:
-        # Get existing review information (for duplicate checking)
-        existing_reviews = get_app_reviews(app_id)
+        table_client.put_item(TableName=ingest_state_table.name, Item=watermark.to_item(app_id))
+    except Exception as e:
+        print(f"Error saving ingest watermark (app_id={app_id}): {str(e)}")
+
+
+def build_near_duplicate_index(contents):
+    """Build a MinHash LSH index over review contents long enough for near-duplicate checks"""
+    index = MinHashLSH(num_perm=near_duplicate_hasher.num_perm)
+    contents = [content for content in contents if len(content or '') >= NEAR_DUPLICATE_MIN_LENGTH]
+    shingle_sets = [char_shingles(content) for content in contents]
+    signatures = near_duplicate_hasher.signatures(shingle_sets)
+    for key, (signature, shingles) in enumerate(zip(signatures, shingle_sets)):
+        # Shingles are kept so LSH candidates are confirmed with the exact Jaccard similarity
+        index.insert(key, signature, shingles)
+    return index
+
+
+def is_near_duplicate(index, content):
+    """
+    Check content against the index; content that is not a near-duplicate is added to the index.
+    Near-duplicates are still saved, flagged with near_duplicate=True (see NEAR_DUPLICATE_THRESHOLD)
+    """
+    if len(content or '') < NEAR_DUPLICATE_MIN_LENGTH:
+        return False
+
+    shingles = char_shingles(content)
+    signature = near_duplicate_hasher.signature(shingles)
+    if index.query(signature, NEAR_DUPLICATE_THRESHOLD, shingles):
+        return True
 
-        # Create a set of unique identifiers for existing reviews (reviewID, username+content)
-        existing_review_ids = set()
-        existing_review_signatures = set()
+    index.insert(len(index), signature, shingles)
+    return False
+
+
+class ReviewWriter:
+    """
+    Background writer that saves scraped review pages to DynamoDB while the next page is being scraped.
+
+    Pages go through a bounded queue, so at most max_pending_pages pages wait in memory and the scraper
+    blocks when writing falls behind. on_saved(items) is called on the writer thread after each page is saved.
+    A write error stops further writes and is raised by the next put() or by close().
+    """
+
+    def __init__(self, app_id, on_saved, max_pending_pages=PIPELINE_MAX_PENDING_PAGES):
+        self.app_id = app_id
+        self.saved_count = 0
+        self._on_saved = on_saved
+        self._queue = queue.Queue(maxsize=max_pending_pages)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, reviews_page):
+        """Queue a page of scraped reviews for saving (blocks while the queue is full)"""
+        if self._error:
+            raise self._error
+        self._queue.put(reviews_page)
+
+    def close(self):
+        """Wait until every queued page is saved; re-raises a write error"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+    def _run(self):
+        while True:
+            reviews_page = self._queue.get()
+            if reviews_page is None:
+                return
+            if self._error:
+                continue  # Keep draining so put() never blocks on a failed writer
+            try:
+                saved_items = save_reviews_to_dynamodb(self.app_id, reviews_page)
+                self.saved_count += len(saved_items)
+                self._on_saved(saved_items)
+            except Exception as e:
+                self._error = e
 
-        for review in existing_reviews:
-            # Use review ID if available (otherwise create alternative identifier)
-            if 'reviewId' in review:
-                existing_review_ids.add(review['reviewId'])
 
-            # Additional safety measure: identifier combining username + first 100 characters of content
-            username = review.get('username', 'anonymous')
-            content = review.get('content', '')[:100]  # Use only the beginning of content
-            review_signature = f"{username}:{content}"
-            existing_review_signatures.add(review_signature)
+def fetch_and_save_new_reviews(app_id, latest_review_date=None, snapshot=None, watermark=None,
+                               fetch_reviews=None):
+    """
+    Fetch new reviews from the store and save to DB without duplicates; returns the number of new reviews
 
-        print(f"Number of existing stored reviews: {len(existing_reviews)}")
+    Each scraped page's new reviews are saved by a ReviewWriter while the next page is scraped.
+
+    snapshot: the request's ReviewSnapshot; reviews saved here are merged into it
+    watermark: the app's IngestWatermark; with it only reviews near the watermark are used for
+        duplicate checking, without it the duplicate state is rebuilt from all stored reviews
+    fetch_reviews: function with google_play_scraper.reviews' signature (e.g. rate limited), defaults to it
+    """
+    try:
+        fetch_reviews = fetch_reviews or reviews
+        snapshot = snapshot or ReviewSnapshot(app_id, DEDUP_REVIEW_FIELDS)
+
+        if watermark:
+            # Incremental crawl: new reviews can only overlap the reviews just before the watermark
+            existing_review_ids = set(watermark.recent_ids)
+            existing_review_signatures = set(watermark.recent_signatures)
+            existing_contents = snapshot.recent_contents(NEAR_DUPLICATE_WINDOW)
+            has_existing_reviews = True
+            latest_review_date = watermark.latest_at
+            print(f"Ingest watermark: {watermark.latest_at} ({len(existing_review_ids)} recent review IDs)")
+        else:
+            # Get existing review information (for duplicate checking, only the attributes it needs)
+            existing_reviews = snapshot.reviews
+
+            # Create a set of unique identifiers for existing reviews (reviewID, username+content)
+            existing_review_ids = set()
+            existing_review_signatures = set()
+
+            for review in existing_reviews:
+                # Use review ID if available (otherwise create alternative identifier)
+                if 'reviewId' in review:
+                    existing_review_ids.add(review['reviewId'])
+
+                # Additional safety measure: identifier combining username + beginning of content
+                existing_review_signatures.add(
+                    review_signature(review.get('username', 'anonymous'), review.get('content', '')))
+
+            existing_contents = [review.get('content', '') for review in existing_reviews]
+            has_existing_reviews = bool(existing_reviews)
+            watermark = IngestWatermark.from_entries(stored_review_entries(existing_reviews))
+            print(f"Number of existing stored reviews: {len(existing_reviews)}")
+
+        # Near-duplicate index (flags spam text reposted with small edits or from other accounts)
+        near_duplicate_index = build_near_duplicate_index(existing_contents)
+        near_duplicate_count = 0
 
         # Calculate target dates
         today = datetime.now()
@@ -241,7 +732,7 @@ def fetch_and_save_new_reviews(app_id, latest_review_date=None):
         two_months_ago = (two_months_ago - timedelta(days=1)).replace(day=1)
         
         # Determine our target start date
-        if not existing_reviews:
+        if not has_existing_reviews:
             # If no reviews exist, start from 2 months ago 1st day
             target_date = two_months_ago
             print(f"No existing reviews found. Will fetch reviews starting from {target_date.strftime('%Y-%m-%d')}")
@@ -255,149 +746,210 @@ def fetch_and_save_new_reviews(app_id, latest_review_date=None):
                 target_date = two_months_ago
                 print(f"Have existing reviews but no latest date. Using {target_date.strftime('%Y-%m-%d')}")
 
-        # Fetch reviews from Google Play store
-        all_new_reviews = []
+        # Saved pages are merged into the snapshot and move the watermark past them
+        def on_saved(saved_items):
+            nonlocal watermark
+            snapshot.merge(saved_items)
+            entries = stored_review_entries(saved_items)
+            watermark = watermark.advanced(entries) if watermark else IngestWatermark.from_entries(entries)
+
+        # Fetch reviews from Google Play store (pages are written in the background)
+        writer = ReviewWriter(app_id, on_saved)
+        new_review_count = 0
         continuation_token = None
         reached_target_date = False
-        
-        # Keep fetching until we reach the target date or run out of reviews
-        while not reached_target_date:
-            result_list, continuation_token = reviews(
-                app_id,
-                lang='ko',
-                country='kr',
-                sort=Sort.NEWEST,
-                count=200,  # Max batch size
-                filter_score_with=None,  # Get all scores
-                continuation_token=continuation_token  # Use token for pagination
-            )
-
-            # Return empty list if no reviews in this batch
-            if not result_list:
-                print("No more reviews retrieved.")
-                break
 
-            print(f"Retrieved {len(result_list)} reviews in this batch")
+        try:
+            # Keep fetching until we reach the target date or run out of reviews
+            while not reached_target_date:
+                result_list, continuation_token = fetch_reviews(
+                    app_id,
+                    lang='ko',
+                    country='kr',
+                    sort=Sort.NEWEST,
+                    count=200,  # Max batch size
+                    filter_score_with=None,  # Get all scores
+                    continuation_token=continuation_token  # Use token for pagination
+                )
 
-            # Process each review in this batch
-            for review in result_list:
-                review_id = review.get('reviewId', '')
+                # Return empty list if no reviews in this batch
+                if not result_list:
+                    print("No more reviews retrieved.")
+                    break
 
-                # Create alternative identifier
-                username = review.get('userName', 'anonymous')
-                content = review.get('content', '')[:100]
-                review_signature = f"{username}:{content}"
+                print(f"Retrieved {len(result_list)} reviews in this batch")
+
+                # Process each review in this batch
+                page_new_reviews = []
+                for review in result_list:
+                    review_id = review.get('reviewId', '')
+
+                    # Create alternative identifier
+                    signature = review_signature(review.get('userName', 'anonymous'), review.get('content', ''))
+
+                    # Get review date
+                    review_date = review['at']
+
+                    # Stop if we reach a review older than our target date
+                    if review_date < target_date:
+                        print(f"Reached review from {review_date.isoformat()}, which is older than our target {target_date.isoformat()}. Stopping.")
+                        reached_target_date = True
+                        break
+
+                    # Skip if review is from today or the future (only include up to yesterday)
+                    if review_date.date() >= today.date():
+                        print(f"Skipping review from {review_date.isoformat()}, which is from today or later.")
+                        continue
+
+                    # Duplicate check
+                    is_duplicate = (
+                        (review_id and review_id in existing_review_ids) or
+                        (signature in existing_review_signatures)
+                    )
+
+                    if not is_duplicate and is_near_duplicate(near_duplicate_index, review.get('content')):
+                        review['near_duplicate'] = True
+                        near_duplicate_count += 1
+
+                    if not is_duplicate:
+                        page_new_reviews.append(review)
+                        # Add to sets to prevent duplicates in subsequent batches
+                        if review_id:
+                            existing_review_ids.add(review_id)
+                        existing_review_signatures.add(signature)
+
+                # Hand the page's new reviews to the writer and scrape the next page meanwhile
+                if page_new_reviews:
+                    writer.put(page_new_reviews)
+                    new_review_count += len(page_new_reviews)
+
+                # If no continuation token or we've reached target date, exit loop
+                if not continuation_token or reached_target_date:
+                    break
 
-                # Get review date
-                review_date = review['at']
-                
-                # Stop if we reach a review older than our target date
-                if review_date < target_date:
-                    print(f"Reached review from {review_date.isoformat()}, which is older than our target {target_date.isoformat()}. Stopping.")
-                    reached_target_date = True
+                # Safety check - if we're pulling too many pages, implement a limit
+                if new_review_count > 5000:  # Arbitrary limit - adjust as needed
+                    print("Reached maximum review limit. Stopping pagination.")
                     break
+        finally:
+            # Pages already scraped are written even if scraping fails
+            writer.close()
 
-                # Skip if review is from today or the future (only include up to yesterday)
-                if review_date.date() >= today.date():
-                    print(f"Skipping review from {review_date.isoformat()}, which is from today or later.")
-                    continue
+        print(f"Total number of new reviews saved: {writer.saved_count} (flagged as near-duplicates: {near_duplicate_count})")
 
-                # Duplicate check
-                is_duplicate = (
-                    (review_id and review_id in existing_review_ids) or
-                    (review_signature in existing_review_signatures)
-                )
+        # Saved only after a complete crawl, so an interrupted crawl is retried from the previous watermark
+        if watermark:
+            save_ingest_watermark(app_id, watermark)
 
-                if not is_duplicate:
-                    all_new_reviews.append(review)
-                    # Add to sets to prevent duplicates in subsequent batches
-                    if review_id:
-                        existing_review_ids.add(review_id)
-                    existing_review_signatures.add(review_signature)
+        return new_review_count
+    except Exception as e:
+        print(f"Error fetching new reviews (app_id={app_id}): {str(e)}")
+        raise e
 
-            # If no continuation token or we've reached target date, exit loop
-            if not continuation_token or reached_target_date:
-                break
-                
-            # Safety check - if we're pulling too many pages, implement a limit
-            if len(all_new_reviews) > 5000:  # Arbitrary limit - adjust as needed
-                print("Reached maximum review limit. Stopping pagination.")
-                break
 
-        print(f"Total number of new reviews to save: {len(all_new_reviews)}")
+def refresh_app_reviews(snapshot, fetch_reviews=None):
+    """
+    Fetch and save new reviews when the app has no stored reviews or they are older than today;
+    returns the number of new reviews
 
-        # Save new reviews to DynamoDB
-        if all_new_reviews:
-            save_reviews_to_dynamodb(app_id, all_new_reviews)
+    fetch_reviews: store review fetch function passed to fetch_and_save_new_reviews
+    """
+    latest_review_date = snapshot.latest_review_date
+    watermark = get_ingest_watermark(snapshot.app_id, latest_review_date)
 
-        return all_new_reviews
-    except Exception as e:
-        print(f"Error fetching new reviews (app_id={app_id}): {str(e)}")
-        raise e
+    if not latest_review_date:
+        # If no reviews exist, fetch from 2 months ago (1st day) to yesterday
+        print(f"No existing reviews for app_id={snapshot.app_id}. Fetching reviews from 2 months ago.")
+        return fetch_and_save_new_reviews(snapshot.app_id, snapshot=snapshot, fetch_reviews=fetch_reviews)
+
+    # If reviews exist, check if we need to update
+    today = datetime.now()
+
+    if datetime.fromisoformat(latest_review_date).date() < today.date():
+        print(f"Fetching new reviews: app_id={snapshot.app_id}, latest_review_date={latest_review_date}")
+        return fetch_and_save_new_reviews(snapshot.app_id, latest_review_date, snapshot, watermark, fetch_reviews)
+    return 0
 
 
 def save_reviews_to_dynamodb(app_id, reviews_data):
-    """Save review data to DynamoDB (including duplicate check)"""
+    """
+    Save review data to DynamoDB (including duplicate check) and return the saved items.
+
+    Reviews sharing a key (the same user on the same day) are stored as one row, so only the item
+    actually written for each key is returned. The daily rollups served by app_stats are updated in the same
+    transactions (see review_stats.save_reviews_with_stats): a review is counted once, when its key is first
+    inserted, however often it is saved again.
+    """
     try:
-        # Preparation to get list of already stored keys
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('AppReview')
-
-        # Track number of saved reviews
-        saved_count = 0
-
-        batch_size = 25  # DynamoDB batch operation limit
-        for i in range(0, len(reviews_data), batch_size):
-            batch = reviews_data[i:i+batch_size]
-
-            # Use batch writer
-            with table.batch_writer() as batch_writer:
-                for review in batch:
-                    date_obj = review['at']
-                    date_str = date_obj.strftime('%Y-%m-%d')
-                    username = review.get('userName', 'anonymous')
-
-                    # Create composite key
-                    date_user_id = f"{date_str}#{username}"
-
-                    # Convert float to Decimal
-                    score = Decimal(str(review['score']))
-
-                    # Save reviewId if available (Google Play's unique identifier)
-                    review_id = review.get(
-                        'reviewId', f"generated-{date_user_id}")
-
-                    # Duplicate check before saving (optional - performance consideration)
-                    try:
-                        # Duplicate check is optional. Uncomment if needed.
-                        # response = table.get_item(
-                        #     Key={'app_id': app_id, 'date_user_id': date_user_id}
-                        # )
-                        # if 'Item' in response:
-                        #     continue  # Skip if already exists
-
-                        # Save if determined not to be a duplicate
-                        batch_writer.put_item(
-                            Item={
-                                'app_id': app_id,
-                                'date_user_id': date_user_id,
-                                'date': date_obj.isoformat(),
-                                'username': username,
-                                'score': score,
-                                'content': review['content'],
-                                'reviewId': review_id,  # Save unique identifier
-                            }
-                        )
-                        saved_count += 1
-                    except Exception as item_error:
-                        print(f"Error saving individual review: {str(item_error)}")
-
-        print(f"Total {saved_count} reviews saved successfully")
-        return True
+        # Quality scores are computed once at ingest and reused by every summary request
+        quality_scores = batch_evaluate_text_quality([review['content'] for review in reviews_data])
+
+        items = []
+        for review, quality in zip(reviews_data, quality_scores):
+            try:
+                date_obj = review['at']
+                date_str = date_obj.strftime('%Y-%m-%d')
+                username = review.get('userName', 'anonymous')
+
+                # Create composite key
+                date_user_id = f"{date_str}#{username}"
+
+                # Convert float to Decimal
+                score = Decimal(str(review['score']))
+
+                # Save reviewId if available (Google Play's unique identifier)
+                review_id = review.get(
+                    'reviewId', f"generated-{date_user_id}")
+
+                # repr() keeps the exact float so cached scores match freshly computed ones
+                quality_score = Decimal(repr(quality))
+
+                item = {
+                    'app_id': app_id,
+                    'date_user_id': date_user_id,
+                    'date': date_obj.isoformat(),
+                    'username': username,
+                    'score': score,
+                    'content': review['content'],
+                    'reviewId': review_id,  # Save unique identifier
+                    'quality_score': quality_score,
+                    'quality_version': Decimal(QUALITY_SCORER_VERSION),  # Same type as items read back
+                    'content_hash': content_hash(review['content']),
+                }
+                if review.get('near_duplicate'):
+                    # Kept out of summaries only (is_summary_candidate)
+                    item['near_duplicate'] = True
+            except Exception as item_error:
+                print(f"Error saving individual review: {str(item_error)}")
+                continue
+            items.append(item)
+
+        saved_items, metrics = save_reviews_with_stats(app_review_table.name, app_id, items)
+        print(f"Total {len(saved_items)} reviews saved successfully (write metrics: {metrics})")
+        return saved_items
     except Exception as e:
         print(f"Error saving reviews: {str(e)}")
         raise e
 
+
+def get_stored_quality_scores(df):
+    """Return stored quality scores for each row of a review DataFrame (None if missing or stale)"""
+    if 'quality_score' not in df.columns:
+        return [None] * len(df)
+
+    stored_scores = []
+    for content, score, version, stored_hash in zip(df['content'], df['quality_score'],
+                                                    df.get('quality_version', [None] * len(df)),
+                                                    df.get('content_hash', [None] * len(df))):
+        # Scores from an older scorer version or for different content must be recomputed
+        is_valid = (
+            isinstance(score, Decimal) and
+            version == QUALITY_SCORER_VERSION and
+            stored_hash == content_hash(content)
+        )
+        stored_scores.append(float(score) if is_valid else None)
+    return stored_scores
+
 # Summary related functions
 
 
@@ -419,12 +971,107 @@ def get_latest_summary(app_id):
         return None
 
 
-def generate_and_save_summary(app_id, google_id, reviews=None):
-    """Generate and save review summary"""
+def is_summary_candidate(review):
+    """Check whether a review is used for summaries: content length in range and not flagged as a near-duplicate"""
+    content = review.get('content')
+    content_length = len(content) if isinstance(content, str) else 0
+    return SUMMARY_MIN_CONTENT_LENGTH < content_length < SUMMARY_MAX_CONTENT_LENGTH and \
+        not review.get('near_duplicate')
+
+
+def summary_matches_mode(summary_item, summary_mode):
+    """
+    Whether a stored summary answers a request of summary_mode.
+
+    Full and auto (delta) summaries are interchangeable sampled summaries; a map_reduce request needs a
+    map_reduce summary and the others need a sampled one. AppSummary keeps one item per (app_id, end_date),
+    so a request of the other kind regenerates and replaces it.
+    """
+    return (summary_item.get('summary_mode') == 'map_reduce') == (summary_mode == 'map_reduce')
+
+
+def get_cached_summary(app_id, summary_mode=None):
+    """
+    Cheap cache pre-check for summary requests, before scraping and reading the review window.
+
+    A complete crawl saves the ingest watermark and covers the store up to yesterday, so once the watermark
+    was updated today no review can be added before tomorrow and the summary window ends on the newest
+    stored review's date. The summary saved for that end_date is then the answer
+    (one get_item each on AppIngestState and AppSummary); review_count is the one the generating request saw.
+    Returns None when the full path is needed: no crawl today, no summary for that date
+    (e.g. the newest review is too short to be summarized), a summary of the other kind
+    (summary_matches_mode, default_summary_mode() when summary_mode is None), or an item saved without review_count.
+    """
+    try:
+        summary_mode = summary_mode or default_summary_mode()
+        item = ingest_state_table.get_item(Key={'app_id': app_id}).get('Item')
+        watermark = IngestWatermark.from_item(item)
+        if watermark is None or str(item.get('updated_at', ''))[:10] != datetime.now().strftime('%Y-%m-%d'):
+            return None
+
+        summary_item = app_summary_table.get_item(
+            Key={'app_id': app_id, 'end_date': watermark.latest_at[:10]}
+        ).get('Item')
+        if not summary_item or 'review_count' not in summary_item or \
+                not summary_matches_mode(summary_item, summary_mode):
+            return None
+        return cached_summary_result(summary_item, int(summary_item['review_count']))
+    except Exception as e:
+        print(f"Error checking cached summary (app_id={app_id}): {str(e)}")
+        return None
+
+
+def get_summary_for_mode(app_id, end_date, summary_mode, consistent_read=False):
+    """The stored (app_id, end_date) summary if it answers a summary_mode request, otherwise None"""
+    summary_item = get_summary_by_app_id_and_end_date(app_id, end_date, consistent_read)
+    return summary_item if summary_item and summary_matches_mode(summary_item, summary_mode) else None
+
+
+def parse_summary_mode(body_dict):
+    """summary_mode request parameter: 'full', 'auto' or 'map_reduce' (default_summary_mode() when omitted)"""
+    summary_mode = body_dict.get('summary_mode') or default_summary_mode()
+    if summary_mode not in SUMMARY_MODES:
+        raise ValueError(f"summary_mode must be one of: {', '.join(SUMMARY_MODES)}")
+    return summary_mode
+
+
+def cached_summary_result(summary_item, review_count):
+    """Response for a summary already stored in AppSummary"""
+    return {
+        "success": True,
+        "summary": summary_item['summary'],
+        "date_range": f"{summary_item['start_date']} ~ {summary_item['end_date']}",
+        "review_count": review_count,
+        "cached": True
+    }
+
+
+def generate_and_save_summary(app_id, google_id, reviews=None, sampling_config=None, snapshot=None,
+                              lock_wait_seconds=None, summary_mode=None):
+    """
+    Generate and save review summary
+
+    sampling_config: SamplingConfig (defaults when None)
+    snapshot: the request's ReviewSnapshot, whose reviews are used when already loaded
+    lock_wait_seconds: how long to wait for a concurrent request generating the same summary
+                       (SUMMARY_LOCK_WAIT_SECONDS when None, SummaryInProgressError when it has not finished by then)
+    summary_mode: 'full', 'auto' (incremental when the delta_summary policy allows it) or
+                  'map_reduce' (every review of a MAP_REDUCE_REVIEW_WINDOW window, see map_reduce_summary),
+                  default_summary_mode() when None
+    """
     try:
-        # Get review data from DB if not provided
+        sampling_config = sampling_config or SamplingConfig()
+        if lock_wait_seconds is None:
+            lock_wait_seconds = SUMMARY_LOCK_WAIT_SECONDS
+        summary_mode = summary_mode or default_summary_mode()
+        # Map-reduce summarizes every review of its window instead of a ~max_length sample, so it reads more of them
+        review_window = MAP_REDUCE_REVIEW_WINDOW if summary_mode == 'map_reduce' else sampling_config.review_window
+
+        # Get review data from DB if not provided (only as many recent reviews as the window needs)
         if not reviews:
-            reviews = get_app_reviews(app_id)
+            snapshot = snapshot or ReviewSnapshot(app_id, SUMMARY_REVIEW_FIELDS)
+            reviews, read_stats = snapshot.recent_window(review_window)
+            print(f"Recent review window read: {read_stats}")
 
         if not reviews:
             return {
@@ -439,12 +1086,14 @@ def generate_and_save_summary(app_id, google_id, reviews=None):
 
         # 리뷰 품질 관리를 위해 리뷰 길이를 보장하며 너무 긴 것은 제외함
         init_df['content_length'] = init_df['content'].apply(lambda x: len(x) if isinstance(x, str) else 0)
-        init_df = init_df[init_df['content_length'] > 50]
-        init_df = init_df[init_df['content_length'] < 400]
+        init_df = init_df[init_df['content_length'] > SUMMARY_MIN_CONTENT_LENGTH]
+        init_df = init_df[init_df['content_length'] < SUMMARY_MAX_CONTENT_LENGTH]
+        if 'near_duplicate' in init_df.columns:
+            init_df = init_df[~init_df['near_duplicate'].eq(True)]
 
-        # 리뷰가 너무 많을 경우를 대비해서 computation cost 줄이기 위해 최근 500개만 추림
+        # 리뷰가 너무 많을 경우를 대비해서 computation cost 줄이기 위해 최근 review_window(기본 500)개만 추림
         init_df = init_df.sort_values(by='date', ascending=False)
-        df = init_df.head(500)
+        df = init_df.head(review_window)
         del init_df
         df = df.reset_index(drop=True)
 
@@ -453,75 +1102,148 @@ def generate_and_save_summary(app_id, google_id, reviews=None):
         last_date = df['date'].max().strftime('%Y-%m-%d')
 
         
-        # Check if summary with same app_id and end_date already exists (caching)
-        existing_summary = get_summary_by_app_id_and_end_date(app_id, last_date)
+        # Check if a summary of this kind with same app_id and end_date already exists (caching)
+        existing_summary = get_summary_for_mode(app_id, last_date, summary_mode)
         if existing_summary:
-            return {
-                "success": True,
-                "summary": existing_summary['summary'],
-                "date_range": f"{existing_summary['start_date']} ~ {existing_summary['end_date']}",
-                "review_count": len(reviews),
-                "cached": True
-            }
+            return cached_summary_result(existing_summary, len(reviews))
 
-        # Generate LLM summary
-        llm = LLM()
+        # Single flight: only the request holding the (app_id, end_date) lock of its kind calls the LLM,
+        # concurrent requests wait for the summary it saves (see summary_lock)
+        if summary_mode == 'map_reduce':
+            lock = SummaryLock(app_id, last_date, ttl_seconds=MAP_REDUCE_LOCK_TTL_SECONDS, kind='map_reduce')
+        else:
+            lock = SummaryLock(app_id, last_date)
+        deadline = time.monotonic() + lock_wait_seconds
+        while not lock.acquire():
+            existing_summary = lock.wait(
+                lambda: get_summary_for_mode(app_id, last_date, summary_mode, consistent_read=True), deadline)
+            if existing_summary:
+                return cached_summary_result(existing_summary, len(reviews))
+        try:
+            # The previous lock holder may have saved the summary just before releasing the lock
+            existing_summary = get_summary_for_mode(app_id, last_date, summary_mode, consistent_read=True)
+            if existing_summary:
+                return cached_summary_result(existing_summary, len(reviews))
+            return create_summary(app_id, google_id, df, first_date, last_date, len(reviews), sampling_config,
+                                  summary_mode)
+        finally:
+            lock.release()
+    except Exception as e:
+        print(f"Error generating and saving summary (app_id={app_id}): {str(e)}")
+        raise e
+
+
+def create_summary(app_id, google_id, df, first_date, last_date, review_count, sampling_config,
+                   summary_mode='full'):
+    """
+    Call the LLM on a sample of the review window and save the summary to AppSummary
+
+    In 'auto' mode the latest summary may be updated incrementally instead: only reviews written after its
+    end_date are sampled and merged into it (see delta_summary for the policy).
+    In 'map_reduce' mode every review is summarized chunk by chunk and the partial summaries are reduced
+    into the report (see map_reduce_summary).
+    """
+    # Generate LLM summary
+    llm = LLM()
+    review_days = df['date'].dt.strftime('%Y-%m-%d')
+    previous_summary = get_latest_summary(app_id) if summary_mode == 'auto' else None
+    plan = plan_summary(summary_mode, previous_summary, review_days.tolist(), last_date)
+    print(f"Summary plan: {plan.mode} ({plan.reason})")
+
+    map_reduce_stats = None
+    if plan.mode == 'map_reduce':
+        # No sampling: the whole window, oldest first so that each chunk covers a contiguous period
         prompt = PROMPT + f"Below are reviews from {first_date} to {last_date}."
+        start_date = first_date
+        sample_df = df.sort_values(by='date')
+        window_reviews = list(zip(sample_df['date'].dt.strftime('%Y-%m-%d'), sample_df['content']))
+        summary, map_reduce_stats = map_reduce_summary(llm, window_reviews, prompt)
+        input_chars = map_reduce_stats.input_chars
+    elif plan.mode == 'delta':
+        # Only reviews newer than the base summary, with a proportionally smaller sample
+        sample_df = df[review_days > plan.base['end_date']]
+        sample_config = delta_sampling_config(sampling_config, len(sample_df), len(df))
+        prompt = delta_prompt(plan.base, sample_df['date'].min().strftime('%Y-%m-%d'), last_date)
+        start_date = plan.base['start_date']
+    else:
+        sample_df = df
+        sample_config = sampling_config
+        prompt = PROMPT + f"Below are reviews from {first_date} to {last_date}."
+        start_date = first_date
 
+    if plan.mode != 'map_reduce':
         # Extract review content
-        text_list = df['content'].tolist()
-        selected_text_list = llm.sampling(text_list)
+        text_list = sample_df['content'].tolist()
+        stored_quality_scores = get_stored_quality_scores(sample_df)
+        print(f"Stored quality scores reused: {sum(score is not None for score in stored_quality_scores)}/{len(text_list)}")
+        selected_text_list = llm.sampling(text_list, sample_config, stored_quality_scores)
         print(f"Sampling completed")
 
-        selected_texts = ' '.join(selected_text_list)
+        if plan.mode == 'delta':
+            selected_texts = delta_input(plan.base, selected_text_list)
+        else:
+            selected_texts = ' '.join(selected_text_list)
 
         # Generate summary
         summary = llm(prompt, selected_texts)
-        print(f"Summary generated")
-
-        # Save summary information to DynamoDB
-        # Important: Convert float to Decimal
-        scores_set = set()
-        for score in df['score'].unique():
-            # Use score as is if already Decimal, otherwise convert to Decimal
-            if isinstance(score, Decimal):
-                scores_set.add(score)
-            else:
-                scores_set.add(Decimal(str(score)))
-
-        date_range = f"{first_date}#{last_date}"
-
-        app_summary_table.put_item(
-            Item={
-                'app_id': app_id,
-                'end_date': last_date,
-                'google_id': google_id,
-                'start_date': first_date,
-                'date_range': date_range,
-                'scores': scores_set,  # Converted to Decimal set
-                'prompt': prompt,
-                'summary': summary,
-                'created_at': datetime.now().isoformat()
-            }
-        )
+        input_chars = len(prompt) + len(selected_texts)
+        print(f"Summary generated ({plan.mode}, input {input_chars} chars)")
+
+    # Save summary information to DynamoDB
+    # Important: Convert float to Decimal
+    scores_set = set()
+    for score in df['score'].unique():
+        # Use score as is if already Decimal, otherwise convert to Decimal
+        if isinstance(score, Decimal):
+            scores_set.add(score)
+        else:
+            scores_set.add(Decimal(str(score)))
+
+    date_range = f"{start_date}#{last_date}"
+
+    summary_item = {
+        'app_id': app_id,
+        'end_date': last_date,
+        'google_id': google_id,
+        'start_date': start_date,
+        'date_range': date_range,
+        'scores': scores_set,  # Converted to Decimal set
+        'prompt': prompt,
+        'summary': summary,
+        'review_count': review_count,  # Lets get_cached_summary answer without reading the reviews
+        'summary_mode': plan.mode,
+        'summary_reason': plan.reason,
+        'delta_depth': plan.depth,  # Incremental summaries since the last full one
+        'input_chars': input_chars,  # All LLM calls of the summary
+        'created_at': datetime.now().isoformat()
+    }
+    if plan.mode == 'delta':
+        summary_item['base_end_date'] = plan.base['end_date']
+        summary_item['delta_review_count'] = len(sample_df)
+    if map_reduce_stats is not None:
+        summary_item['llm_calls'] = map_reduce_stats.llm_calls
+        summary_item['map_chunks'] = map_reduce_stats.chunks
+        if map_reduce_stats.prompt_tokens is not None:
+            summary_item['prompt_tokens'] = map_reduce_stats.prompt_tokens
+            summary_item['completion_tokens'] = map_reduce_stats.completion_tokens
+    app_summary_table.put_item(Item=summary_item)
+
+    return {
+        "success": True,
+        "summary": summary,
+        "date_range": f"{start_date} ~ {last_date}",
+        "review_count": review_count,
+        "cached": False
+    }
 
-        return {
-            "success": True,
-            "summary": summary,
-            "date_range": f"{first_date} ~ {last_date}",
-            "review_count": len(reviews),
-            "cached": False
-        }
-    except Exception as e:
-        print(f"Error generating and saving summary (app_id={app_id}): {str(e)}")
-        raise e
 
 # Add function to get summary by app_id and end_date
-def get_summary_by_app_id_and_end_date(app_id, end_date):
+def get_summary_by_app_id_and_end_date(app_id, end_date, consistent_read=False):
     """Retrieve summary for a specific app_id and end_date"""
     try:
         response = app_summary_table.query(
-            KeyConditionExpression=Key('app_id').eq(app_id) & Key('end_date').eq(end_date)
+            KeyConditionExpression=Key('app_id').eq(app_id) & Key('end_date').eq(end_date),
+            ConsistentRead=consistent_read
         )
 
         items = response.get('Items', [])
@@ -592,9 +1314,41 @@ def get_summary_count_by_user(google_id, start_date=None, end_date=None):
 
 
 def lambda_handler(event, context):
+    """Handle the request, compressing the response body if the client accepts it (see response_encoding)"""
+    # Parsed once: the body is both the request and a fallback source of accept_encoding
     try:
-        # Parse request body
         body_dict = cover_api_and_invoke(event, context)
+        encoding = negotiate_encoding(event, body_dict)
+    except Exception as e:
+        return error_response(e, event)
+    return encode_response(handle_request(body_dict, event, context), encoding)
+
+
+def error_response(e, event):
+    """Response for an error raised while handling a request"""
+    if isinstance(e, SummaryInProgressError):
+        # Another request is generating the same summary; the client retries and gets the cached result
+        return {
+            "statusCode": 409,
+            "body": dumps({"error": str(e)})
+        }
+    if isinstance(e, ValueError):
+        return {
+            "statusCode": 400,
+            "body": dumps({"error": str(e)})
+        }
+    error_message = f"{str(e)}, event={str(event)}"
+    print(f"Error occurred: {error_message}")
+    return {
+        "statusCode": 500,
+        "body": dumps({"error": error_message})
+    }
+
+
+def handle_request(body_dict, event, context=None):
+    # Synchronous requests must answer within the API Gateway timeout, counted from here
+    started_at = time.monotonic()
+    try:
         print(f"Request body: {body_dict}")
 
         # Check request type
@@ -602,7 +1356,7 @@ def lambda_handler(event, context):
         if not request_type:
             return {
                 "statusCode": 400,
-                "body": json.dumps({"error": "Request type (request_type) is required."})
+                "body": dumps({"error": "Request type (request_type) is required."})
             }
 
         # 1. App information retrieval
@@ -615,7 +1369,7 @@ def lambda_handler(event, context):
                 if not app_info:
                     return {
                         "statusCode": 404,
-                        "body": json.dumps({"error": f"App ID '{app_id}' not found."})
+                        "body": dumps({"error": f"App ID '{app_id}' not found."})
                     }
                 response_data = {"app_info": app_info}
             else:
@@ -625,7 +1379,7 @@ def lambda_handler(event, context):
 
             return {
                 "statusCode": 200,
-                "body": json.dumps(response_data, default=str)
+                "body": dumps(response_data)
             }
 
         # 2. App information registration
@@ -635,12 +1389,12 @@ def lambda_handler(event, context):
             if result["success"]:
                 return {
                     "statusCode": 201,
-                    "body": json.dumps(result, default=str)
+                    "body": dumps(result)
                 }
             else:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps(result)
+                    "body": dumps(result)
                 }
 
 
@@ -651,7 +1405,7 @@ def lambda_handler(event, context):
             if not app_id:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "app_id parameter is required."})
+                    "body": dumps({"error": "app_id parameter is required."})
                 }
 
             # Check if app exists
@@ -659,44 +1413,49 @@ def lambda_handler(event, context):
             if not app_info:
                 return {
                     "statusCode": 404,
-                    "body": json.dumps({"error": f"App ID '{app_id}' not found."})
+                    "body": dumps({"error": f"App ID '{app_id}' not found."})
                 }
 
-            # Get all existing reviews first
-            existing_reviews = get_app_reviews(app_id)
-            
-            new_reviews_added = False
-            
-            # Check if we need to fetch new reviews
-            if not existing_reviews:
-                # If no reviews exist, fetch from 2 months ago (1st day) to yesterday
-                print(f"No existing reviews for app_id={app_id}. Fetching reviews from 2 months ago.")
-                new_reviews = fetch_and_save_new_reviews(app_id)
-                if new_reviews:
-                    new_reviews_added = True
-                    print(f"{len(new_reviews)} new reviews saved successfully")
-            else:
-                # If reviews exist, check if we need to update
-                latest_review_date = get_latest_review_date(app_id)
-                today = datetime.now()
-                
-                if not latest_review_date or datetime.fromisoformat(latest_review_date).date() < today.date():
-                    print(f"Fetching new reviews: app_id={app_id}, latest_review_date={latest_review_date}")
-                    new_reviews = fetch_and_save_new_reviews(app_id, latest_review_date)
-                    if new_reviews:
-                        new_reviews_added = True
-                        print(f"{len(new_reviews)} new reviews saved successfully")
+            # Paginated read: one page per request, continued with next_token
+            if any(param in body_dict for param in REVIEW_PAGE_PARAMS):
+                page_request = parse_review_page_request(body_dict)
+
+                # Only the first page refreshes, so later pages continue the same listing
+                new_reviews_added = False
+                if not page_request['next_token']:
+                    new_reviews_added = refresh_app_reviews(ReviewSnapshot(app_id, DEDUP_REVIEW_FIELDS)) > 0
+
+                page_reviews, next_token = get_app_review_page(app_id, **page_request)
+                return {
+                    "statusCode": 200,
+                    "body": dumps({
+                        "reviews": page_reviews,
+                        "count": len(page_reviews),
+                        "next_token": next_token,
+                        "new_reviews_added": new_reviews_added
+                    })
+                }
+
+            # One snapshot serves the freshness check, duplicate checking and the response
+            # (the response needs the whole partition, so it is loaded up front)
+            snapshot = ReviewSnapshot(app_id).load()
+
+            # Fetch new reviews if needed
+            new_review_count = refresh_app_reviews(snapshot)
+            new_reviews_added = new_review_count > 0
+            if new_reviews_added:
+                print(f"{new_review_count} new reviews saved successfully")
 
-            # Retrieve all reviews (including newly added ones)
-            all_reviews = get_app_reviews(app_id)
+            # All reviews (newly added ones are merged into the snapshot)
+            all_reviews = snapshot.reviews
 
             return {
                 "statusCode": 200,
-                "body": json.dumps({
+                "body": dumps({
                     "reviews": all_reviews,
                     "count": len(all_reviews),
                     "new_reviews_added": new_reviews_added
-                }, default=str)
+                })
             }
 
         # Update summary request handling
@@ -707,13 +1466,29 @@ def lambda_handler(event, context):
             if not app_id:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "app_id parameter is required."})
+                    "body": dumps({"error": "app_id parameter is required."})
                 }
                 
             if not google_id:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "google_id parameter is required."})
+                    "body": dumps({"error": "google_id parameter is required."})
+                }
+
+            summary_mode = parse_summary_mode(body_dict)
+            if summary_mode == 'map_reduce':
+                # Several rounds of LLM calls do not fit in the API Gateway timeout
+                return {
+                    "statusCode": 400,
+                    "body": dumps({"error": "summary_mode 'map_reduce' is only available through summary_submit."})
+                }
+
+            # Repeat requests on the same day are answered from AppSummary without scraping
+            cached_summary = get_cached_summary(app_id, summary_mode)
+            if cached_summary:
+                return {
+                    "statusCode": 200,
+                    "body": dumps(cached_summary)
                 }
 
             # Check if app exists
@@ -721,32 +1496,78 @@ def lambda_handler(event, context):
             if not app_info:
                 return {
                     "statusCode": 404,
-                    "body": json.dumps({"error": f"App ID '{app_id}' not found."})
+                    "body": dumps({"error": f"App ID '{app_id}' not found."})
                 }
 
-            # Check if we have any reviews
-            existing_reviews = get_app_reviews(app_id)
-            
-            if not existing_reviews:
-                # If no reviews exist, fetch from 2 months ago (1st day) to yesterday
-                print(f"No existing reviews for app_id={app_id}. Fetching reviews from 2 months ago.")
-                fetch_and_save_new_reviews(app_id)
-            else:
-                # Check and fetch new reviews if needed
-                latest_review_date = get_latest_review_date(app_id)
-                today = datetime.now()
-                
-                if not latest_review_date or datetime.fromisoformat(latest_review_date).date() < today.date():
-                    fetch_and_save_new_reviews(app_id, latest_review_date)
+            # One snapshot serves the freshness check, duplicate checking and the summary window
+            snapshot = ReviewSnapshot(app_id, DEDUP_REVIEW_FIELDS + SUMMARY_REVIEW_FIELDS)
+
+            # Check and fetch new reviews if needed
+            refresh_app_reviews(snapshot)
 
-            # Generate and save summary (now includes google_id)
-            summary_result = generate_and_save_summary(app_id, google_id)
+            # Generate and save summary (now includes google_id); waiting on a concurrent request only
+            # gets what is left of the API Gateway timeout after the crawl, so a busy summary is a 409, not a 504
+            summary_result = generate_and_save_summary(
+                app_id, google_id, snapshot=snapshot, summary_mode=summary_mode,
+                lock_wait_seconds=request_wait_seconds(context, started_at, SUMMARY_LOCK_WAIT_SECONDS))
 
             return {
                 "statusCode": 200,
-                "body": json.dumps(summary_result, default=str)
+                "body": dumps(summary_result)
             }
             
+        # Asynchronous summary: the job is queued and answered right away, the worker refreshes reviews
+        # and calls the LLM, and the client polls summary_status (see summary_jobs)
+        elif request_type == 'summary_submit':
+            app_id = body_dict.get('app_id')
+            google_id = body_dict.get('google_id')
+
+            if not app_id:
+                return {
+                    "statusCode": 400,
+                    "body": dumps({"error": "app_id parameter is required."})
+                }
+
+            if not google_id:
+                return {
+                    "statusCode": 400,
+                    "body": dumps({"error": "google_id parameter is required."})
+                }
+
+            # Check if app exists
+            app_info = get_app_info(app_id)
+            if not app_info:
+                return {
+                    "statusCode": 404,
+                    "body": dumps({"error": f"App ID '{app_id}' not found."})
+                }
+
+            return {
+                "statusCode": 202,
+                "body": dumps(submit_summary_job(app_id, google_id, parse_summary_mode(body_dict)))
+            }
+
+        elif request_type == 'summary_status':
+            job_id = body_dict.get('job_id')
+
+            if not job_id:
+                return {
+                    "statusCode": 400,
+                    "body": dumps({"error": "job_id parameter is required."})
+                }
+
+            job = get_summary_job(job_id)
+            if not job:
+                return {
+                    "statusCode": 404,
+                    "body": dumps({"error": f"Summary job '{job_id}' not found."})
+                }
+
+            return {
+                "statusCode": 200,
+                "body": dumps(job)
+            }
+
         # Add new request type for summary count
         elif request_type == 'summary_count':
             google_id = body_dict.get('google_id')
@@ -756,7 +1577,7 @@ def lambda_handler(event, context):
             if not google_id:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "google_id parameter is required."})
+                    "body": dumps({"error": "google_id parameter is required."})
                 }
 
             # Get summary count for the user
@@ -764,9 +1585,35 @@ def lambda_handler(event, context):
 
             return {
                 "statusCode": 200,
-                "body": json.dumps(summary_count, default=str)
+                "body": dumps(summary_count)
             }
             
+        # Aggregate review statistics for charts (per-day rollups instead of raw reviews)
+        elif request_type == 'app_stats':
+            app_id = body_dict.get('app_id')
+            start_date = body_dict.get('start_date')  # Optional (YYYY-MM-DD)
+            end_date = body_dict.get('end_date')      # Optional (YYYY-MM-DD)
+
+            if not app_id:
+                return {
+                    "statusCode": 400,
+                    "body": dumps({"error": "app_id parameter is required."})
+                }
+
+            # Check if app exists
+            app_info = get_app_info(app_id)
+            if not app_info:
+                return {
+                    "statusCode": 404,
+                    "body": dumps({"error": f"App ID '{app_id}' not found."})
+                }
+
+            # Served from AppReviewDaily only: reviews are ingested (and counted) by the crawling requests
+            return {
+                "statusCode": 200,
+                "body": dumps(get_app_stats(app_id, start_date, end_date))
+            }
+
         # 5. User information storage and login
         elif request_type == 'user_login':
             google_id = body_dict.get('google_id')
@@ -775,7 +1622,7 @@ def lambda_handler(event, context):
             if not google_id or not email:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "google_id and email parameters are required."})
+                    "body": dumps({"error": "google_id and email parameters are required."})
                 }
             
             # Save user information (or update)
@@ -783,12 +1630,12 @@ def lambda_handler(event, context):
                 user_info = save_user(google_id, email)
                 return {
                     "statusCode": 200,
-                    "body": json.dumps({"user": user_info}, default=str)
+                    "body": dumps({"user": user_info})
                 }
             except Exception as e:
                 return {
                     "statusCode": 500,
-                    "body": json.dumps({"error": f"Error occurred while saving user: {str(e)}"})
+                    "body": dumps({"error": f"Error occurred while saving user: {str(e)}"})
                 }
                 
         # 6. User information retrieval
@@ -798,7 +1645,7 @@ def lambda_handler(event, context):
             if not google_id:
                 return {
                     "statusCode": 400,
-                    "body": json.dumps({"error": "google_id parameter is required."})
+                    "body": dumps({"error": "google_id parameter is required."})
                 }
             
             # Retrieve user information
@@ -807,37 +1654,27 @@ def lambda_handler(event, context):
                 if not user_info:
                     return {
                         "statusCode": 404,
-                        "body": json.dumps({"error": f"User with Google ID '{google_id}' not found."})
+                        "body": dumps({"error": f"User with Google ID '{google_id}' not found."})
                     }
                 
                 return {
                     "statusCode": 200,
-                    "body": json.dumps({"user": user_info}, default=str)
+                    "body": dumps({"user": user_info})
                 }
             except Exception as e:
                 return {
                     "statusCode": 500,
-                    "body": json.dumps({"error": f"Error occurred while retrieving user: {str(e)}"})
+                    "body": dumps({"error": f"Error occurred while retrieving user: {str(e)}"})
                 }
 
         else:
             return {
                 "statusCode": 400,
-                "body": json.dumps({"error": f"Unsupported request type: {request_type}"})
+                "body": dumps({"error": f"Unsupported request type: {request_type}"})
             }
 
-    except ValueError as ve:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": str(ve)})
-        }
     except Exception as e:
-        error_message = f"{str(e)}, event={str(event)}"
-        print(f"Error occurred: {error_message}")
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": error_message})
-        }
+        return error_response(e, event)
 
 
 # Local test code
@@ -871,6 +1708,15 @@ if __name__ == "__main__":
         }
     }
 
+    # Review statistics test
+    event_stats = {
+        "body": {
+            "request_type": "app_stats",
+            "app_id": "com.nianticlabs.pokemongo",
+            "start_date": "2025-04-01"
+        }
+    }
+
     # Review summary test
     event4 = { 
         "body": { 
@@ -880,6 +1726,15 @@ if __name__ == "__main__":
         } 
     }
     
+    # Asynchronous summary test (poll summary_status with the returned job_id)
+    event_summary_submit = {
+        "body": {
+            "request_type": "summary_submit",
+            "app_id": "com.nianticlabs.pokemongo",
+            "google_id": "google123456789"
+        }
+    }
+    
     # User login/registration test
     event5 = { "body": { "request_type": "user_login", "google_id": "google123456789", "email": "user@example.com" } }
     
@@ -909,7 +1764,7 @@ if __name__ == "__main__":
 
 
     # Run all test events sequentially and save input/output to file
-    #test_events = [event0, event1, event2, event3, event4, event5, event6, event7, event8, event9]
+    #test_events = [event0, event1, event2, event3, event4, event5, event6, event7, event8, event9, event_stats, event_summary_submit]
     test_events = [event0]
     
     with open('input_output.txt', 'w') as f:
@@ -0,0 +1,259 @@
+"""
+계층적 map-reduce 요약 모듈
+
+전체 요약은 최근 review_window(기본 500)개 리뷰에서 LLM.sampling 으로 약 5,000자(SamplingConfig.max_length)만
+골라 LLM 에 보내므로, 리뷰가 수천 개인 앱은 윈도우 대부분과 그 이전 리뷰가 요약에 반영되지 않습니다.
+map-reduce 요약은 최근 MAP_REDUCE_REVIEW_WINDOW 개 리뷰를 모두 사용합니다.
+- map: 리뷰를 오래된 순으로 MAP_CHUNK_CHARS 자 이하의 청크(연속된 기간)로 나누고, 청크마다 MAP_PROMPT 로
+  부분 요약을 만듦
+- reduce: 부분 요약을 합친 길이가 REDUCE_MAX_CHARS 를 넘으면 REDUCE_MAX_CHARS 이하 묶음마다 REDUCE_PROMPT 로
+  다시 합치기를 반복하고(계층), 마지막에 최종 프롬프트(lambda_function.PROMPT)로 보고서 작성
+- 같은 단계의 LLM 호출은 ThreadPoolExecutor 로 동시에 하되, 동시에 진행 중인 호출은 max_in_flight 개 이하
+  (기본 MAP_REDUCE_MAX_IN_FLIGHT 환경 변수, 없거나 잘못된 값이면 8 - API 속도 제한 안에서 응답 시간 단축)
+- 호출 수, 입력/출력 문자 수, 토큰 사용량(LLM.usage)을 MapReduceStats 로 반환
+요청의 summary_mode 가 'map_reduce' 일 때 사용합니다 (delta_summary.SUMMARY_MODES).
+LLM 호출이 여러 단계로 이어져 API Gateway 제한 시간(29초)을 넘기 쉬우므로 summary_submit(비동기 작업)으로만 요청할 수 있습니다
+(동기 summary 요청은 400).
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+# map-reduce 요약에 사용하는 최근 리뷰 수
+MAP_REDUCE_REVIEW_WINDOW = 5000
+
+# map 단계 청크 하나의 리뷰 텍스트 길이 상한 (문자 수)
+MAP_CHUNK_CHARS = 12000
+
+# reduce 단계 LLM 입력(부분 요약들) 길이 상한 (문자 수)
+REDUCE_MAX_CHARS = 24000
+
+# 동시에 진행 중인 LLM 호출 수 기본값 (MAP_REDUCE_MAX_IN_FLIGHT 환경 변수가 없거나 잘못된 값일 때)
+MAP_REDUCE_MAX_IN_FLIGHT = 8
+
+# map-reduce 요약 생성 잠금 유효 시간 (초, Lambda 최대 실행 시간 - 호출이 많아 SUMMARY_LOCK_TTL_SECONDS 보다 오래 걸림)
+MAP_REDUCE_LOCK_TTL_SECONDS = 900
+
+MAP_PROMPT = """다음은 한 앱의 특정 기간 동안 작성된 사용자 리뷰들입니다.
+이 리뷰들은 전체 리뷰의 일부이며, 여러 기간의 부분 요약을 합쳐 최종 앱 리뷰 분석 보고서를 작성할 예정입니다.
+최종 보고서 작성에 필요한 내용을 빠짐없이 간결한 마크다운 목록으로 정리해주세요.
+
+- 자주 언급되는 칭찬과 불만 (대략적인 언급 빈도 포함)
+- 기능별 감성과, 같은 기능에 대한 상반된 평가의 맥락
+- 문제점과 그 원인으로 추정되는 요소
+- 직접 또는 간접적으로 드러난 사용자 요구
+- 경쟁 앱 언급과 비교 내용
+- 각 항목을 뒷받침하는 대표 리뷰 인용 (짧게)
+
+리뷰에 없는 내용은 추측하지 말고, 보고서 형식이 아닌 메모 형식으로 작성해주세요."""
+
+REDUCE_PROMPT = """다음은 한 앱의 사용자 리뷰를 기간별로 나누어 정리한 부분 요약들입니다.
+부분 요약들을 하나의 부분 요약으로 합쳐주세요.
+
+- 같은 내용은 하나로 합치고 언급 빈도를 더해주세요
+- 기간에 따라 달라진 평가나 새로 나타난 문제는 기간과 함께 남겨주세요
+- 대표 리뷰 인용은 항목마다 가장 구체적인 것만 남겨주세요
+- 입력과 같은 간결한 마크다운 목록 형식으로 작성해주세요"""
+
+
+@dataclass
+class MapReduceStats:
+    """
+    map-reduce 요약 실행 통계
+
+    Attributes:
+        review_count: 요약에 사용한 리뷰 수
+        chunks: map 단계 청크 수
+        levels: reduce 단계 수 (최종 보고서 포함)
+        llm_calls: LLM 호출 수
+        input_chars: LLM 입력(프롬프트 + 텍스트) 문자 수 합계
+        output_chars: LLM 출력 문자 수 합계
+        prompt_tokens / completion_tokens: LLM.usage 기준 토큰 수 (usage 를 기록하지 않는 LLM 이면 None)
+        max_in_flight: 동시에 진행 중이던 LLM 호출 수의 최댓값
+        seconds: 전체 소요 시간
+        stage_seconds: 단계별 소요 시간 (map, reduce1, ..., final)
+    """
+    review_count: int = 0
+    chunks: int = 0
+    levels: int = 0
+    llm_calls: int = 0
+    input_chars: int = 0
+    output_chars: int = 0
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    max_in_flight: int = 0
+    seconds: float = 0.0
+    stage_seconds: dict = field(default_factory=dict)
+
+
+def shard_reviews(reviews, chunk_chars=MAP_CHUNK_CHARS):
+    """
+    리뷰를 순서대로 chunk_chars 자 이하의 청크로 나눕니다 (리뷰 하나가 더 길면 그 리뷰만으로 한 청크).
+
+    Args:
+        reviews (list): (작성 날짜 YYYY-MM-DD, 리뷰 텍스트) 튜플의 리스트 (오래된 순)
+    Returns:
+        list: 청크(같은 형식의 리스트)들의 리스트
+    """
+    chunks = []
+    chunk = []
+    chunk_length = 0
+    for review in reviews:
+        # 리뷰 사이 구분 공백 포함
+        length = len(review[1]) + 1
+        if chunk and chunk_length + length > chunk_chars:
+            chunks.append(chunk)
+            chunk = []
+            chunk_length = 0
+        chunk.append(review)
+        chunk_length += length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def default_max_in_flight():
+    """요청마다 읽는 동시 LLM 호출 수 상한 (MAP_REDUCE_MAX_IN_FLIGHT 환경 변수, 잘못된 값이면 기본값)"""
+    value = os.environ.get('MAP_REDUCE_MAX_IN_FLIGHT')
+    try:
+        max_in_flight = int(value) if value else MAP_REDUCE_MAX_IN_FLIGHT
+    except ValueError:
+        print(f"Invalid MAP_REDUCE_MAX_IN_FLIGHT {value!r}, using {MAP_REDUCE_MAX_IN_FLIGHT}")
+        return MAP_REDUCE_MAX_IN_FLIGHT
+    return max_in_flight if max_in_flight >= 1 else MAP_REDUCE_MAX_IN_FLIGHT
+
+
+def group_summaries(summaries, max_chars=REDUCE_MAX_CHARS):
+    """
+    부분 요약들을 순서대로 reduce 입력(summaries_input) 길이가 max_chars 자 이하인 묶음으로 나눕니다.
+    옆 요약과 합치면 max_chars 를 넘는 요약은 그 요약만으로 한 묶음이 되고, reduce 단계에서 다시 요약하지 않고 그대로 넘깁니다.
+    """
+    groups = []
+    group = []
+    group_length = 0
+    for summary in summaries:
+        # summaries_input 이 붙이는 머리글과 묶음 안 구분 줄 포함
+        length = len(f"[부분 요약 {len(group) + 1}]\n") + len(summary) + (2 if group else 0)
+        if group and group_length + length > max_chars:
+            groups.append(group)
+            group = []
+            group_length = 0
+            length = len("[부분 요약 1]\n") + len(summary)
+        group.append(summary)
+        group_length += length
+    if group:
+        groups.append(group)
+    return groups
+
+
+class _LLMRunner:
+    """동시에 진행 중인 호출 수를 제한하고 호출 통계를 모으는 LLM 호출기"""
+
+    def __init__(self, llm, max_in_flight, stats):
+        self.llm = llm
+        self.max_in_flight = max_in_flight
+        self.stats = stats
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _call(self, prompt, text):
+        with self._lock:
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+        try:
+            output = self.llm(prompt, text)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self.stats.llm_calls += 1
+            self.stats.input_chars += len(prompt) + len(text)
+            self.stats.output_chars += len(output)
+        return output
+
+    def run(self, calls):
+        """(prompt, text) 목록을 max_in_flight 개씩 동시에 호출하고 결과를 같은 순서로 반환 (하나라도 실패하면 예외)"""
+        if len(calls) == 1:
+            return [self._call(*calls[0])]
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(calls))) as executor:
+            return list(executor.map(lambda call: self._call(*call), calls))
+
+
+def chunk_input(chunk):
+    """map 단계 입력: 청크 기간 안내 + 리뷰 텍스트"""
+    days = [day for day, _ in chunk if day]
+    period = f"{min(days)} ~ {max(days)} " if days else ""
+    return f"[{period}리뷰 {len(chunk)}개]\n" + ' '.join(text for _, text in chunk)
+
+
+def summaries_input(summaries):
+    """reduce 단계 입력: 번호를 붙인 부분 요약들"""
+    return '\n\n'.join(f"[부분 요약 {index}]\n{summary}" for index, summary in enumerate(summaries, 1))
+
+
+def map_reduce_summary(llm, reviews, final_prompt, chunk_chars=MAP_CHUNK_CHARS, reduce_chars=REDUCE_MAX_CHARS,
+                       max_in_flight=None):
+    """
+    리뷰 전체를 map-reduce 로 요약합니다.
+
+    Args:
+        llm (LLM): llm(prompt, text) 로 호출할 LLM (여러 스레드에서 동시에 호출됨)
+        reviews (list): (작성 날짜 YYYY-MM-DD, 리뷰 텍스트) 튜플의 리스트 (오래된 순)
+        final_prompt (str): 최종 보고서 프롬프트
+        max_in_flight (int): 동시에 진행 중인 LLM 호출 수 상한 (None 이면 default_max_in_flight())
+    Returns:
+        tuple: (보고서, MapReduceStats)
+    """
+    if max_in_flight is None:
+        max_in_flight = default_max_in_flight()
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+    if not reviews:
+        raise ValueError("No reviews to summarize.")
+
+    stats = MapReduceStats(review_count=len(reviews))
+    runner = _LLMRunner(llm, max_in_flight, stats)
+    usage = getattr(llm, 'usage', None)
+    usage_before = dict(usage) if usage is not None else None
+    start = time.perf_counter()
+
+    chunks = shard_reviews(reviews, chunk_chars)
+    stats.chunks = len(chunks)
+    if len(chunks) == 1:
+        # 청크 하나면 map 없이 바로 최종 보고서
+        final_input = chunk_input(chunks[0])
+    else:
+        stage_start = time.perf_counter()
+        summaries = runner.run([(MAP_PROMPT, chunk_input(chunk)) for chunk in chunks])
+        stats.stage_seconds['map'] = time.perf_counter() - stage_start
+        print(f"Map-reduce summary: {len(chunks)} chunks mapped ({stats.stage_seconds['map']:.2f}s)")
+
+        # 부분 요약이 최종 입력 한도에 들어올 때까지 묶음별로 합침
+        while len(summaries) > 1 and len(summaries_input(summaries)) > reduce_chars:
+            groups = group_summaries(summaries, reduce_chars)
+            if len(groups) == len(summaries):
+                break
+            stage_start = time.perf_counter()
+            # 하나짜리 묶음은 합칠 것이 없으므로 LLM 을 호출하지 않고 그대로 다음 단계로
+            merged = iter(runner.run([(REDUCE_PROMPT, summaries_input(group)) for group in groups if len(group) > 1]))
+            summaries = [next(merged) if len(group) > 1 else group[0] for group in groups]
+            stats.levels += 1
+            stats.stage_seconds[f"reduce{stats.levels}"] = time.perf_counter() - stage_start
+            print(f"Map-reduce summary: reduced to {len(summaries)} partial summaries")
+        final_input = summaries_input(summaries)
+
+    stage_start = time.perf_counter()
+    summary = runner.run([(final_prompt, final_input)])[0]
+    stats.levels += 1
+    stats.stage_seconds['final'] = time.perf_counter() - stage_start
+    stats.seconds = time.perf_counter() - start
+
+    if usage_before is not None:
+        stats.prompt_tokens = usage['prompt_tokens'] - usage_before['prompt_tokens']
+        stats.completion_tokens = usage['completion_tokens'] - usage_before['completion_tokens']
+    print(f"Map-reduce summary: {stats.llm_calls} LLM calls, input {stats.input_chars} chars, "
+          f"tokens {stats.prompt_tokens}/{stats.completion_tokens}, {stats.seconds:.2f}s")
+    return summary, stats
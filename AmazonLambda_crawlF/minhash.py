@@ -0,0 +1,184 @@
+"""
+MinHash 서명과 LSH(Locality Sensitive Hashing) 버킷 색인 모듈
+
+두 집합의 Jaccard 유사도는 MinHash 서명에서 값이 같은 위치의 비율로 근사할 수 있습니다.
+- MinHasher: 토큰 집합 -> 고정 길이 서명 (여러 텍스트를 numpy 로 한 번에 계산)
+- MinHashLSH: 서명을 밴드로 나누어 버킷에 넣고, 유사한 서명 후보만 빠르게 찾는 색인
+- MinHashDiversity: diversity.TokenSetDiversity 와 같은 인터페이스의 근사 다양성 계산기 (비교 실험용)
+
+리뷰 수집 시 유사 중복(스팸) 리뷰 표시(요약에서 제외)에 사용합니다.
+샘플링의 다양성 계산은 exact 백엔드가 더 빠르고 정확하므로 MinHashDiversity 는 기본값으로 쓰지 않습니다
+(benchmark_minhash.py: 후보 10000개에서 exact 0.16초, minhash 0.43초, 선택 결과 겹침 39%).
+"""
+import zlib
+
+import numpy as np
+
+# 범용 해시 (a * x + b) mod p 에 사용하는 메르센 소수 - 곱셈 결과가 int64 범위를 넘지 않음
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# 빈 집합의 서명 값 (어떤 해시 값보다도 큼)
+_EMPTY_VALUE = _MERSENNE_PRIME
+
+# 서명 일괄 계산 시 한 번에 처리할 토큰 수 (num_perm x 토큰 수 크기의 임시 배열 메모리 제한용)
+_SIGNATURE_CHUNK_TOKENS = 32768
+
+
+def word_tokens(text):
+    """다양성 계산용 토큰: 소문자 변환 후 공백 기준 단어 집합 (jaccard_similarity 와 동일)"""
+    return set((text or '').lower().split())
+
+
+def char_shingles(text, k=3):
+    """유사 중복 판별용 토큰: 공백을 정규화한 소문자 텍스트의 문자 k-gram 집합"""
+    normalized = ' '.join((text or '').lower().split())
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+class MinHasher:
+    """토큰 집합의 MinHash 서명을 계산합니다 (같은 num_perm/seed 이면 프로세스가 달라도 같은 서명)."""
+
+    def __init__(self, num_perm=128, seed=1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.int64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.int64)
+
+    def signature(self, tokens):
+        """토큰 집합 1개의 서명 (길이 num_perm 의 int64 배열)"""
+        return self.signatures([tokens])[0]
+
+    def signatures(self, token_sets):
+        """
+        여러 토큰 집합의 서명을 한 번에 계산합니다.
+
+        Args:
+            token_sets (list): 토큰 집합(또는 중복 없는 토큰 리스트)들의 리스트
+        Returns:
+            numpy.ndarray: (len(token_sets), num_perm) 크기의 서명 배열
+        """
+        result = np.full((len(token_sets), self.num_perm), _EMPTY_VALUE, dtype=np.int64)
+        start = 0
+        while start < len(token_sets):
+            # 토큰 수가 _SIGNATURE_CHUNK_TOKENS 를 넘지 않도록 문서 묶음 구성 (최소 1개)
+            end = start
+            token_count = 0
+            while end < len(token_sets) and (end == start or token_count + len(token_sets[end]) <= _SIGNATURE_CHUNK_TOKENS):
+                token_count += len(token_sets[end])
+                end += 1
+            self._fill_signatures(token_sets[start:end], result[start:end])
+            start = end
+        return result
+
+    def _fill_signatures(self, token_sets, out):
+        sizes = np.array([len(tokens) for tokens in token_sets], dtype=np.int64)
+        non_empty = np.flatnonzero(sizes)
+        if not non_empty.size:
+            return
+
+        hashes = np.array([zlib.crc32(token.encode('utf-8', 'surrogatepass')) % _MERSENNE_PRIME
+                           for tokens in token_sets for token in tokens], dtype=np.int64)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+
+        offsets = np.zeros(len(token_sets), dtype=np.int64)
+        np.cumsum(sizes[:-1], out=offsets[1:])
+        out[non_empty] = np.minimum.reduceat(permuted, offsets[non_empty], axis=1).T
+
+
+def jaccard(tokens1, tokens2):
+    """두 토큰 집합의 정확한 Jaccard 유사도 (둘 다 비어 있으면 1.0)"""
+    union = len(tokens1 | tokens2)
+    return len(tokens1 & tokens2) / union if union else 1.0
+
+
+def estimate_jaccard(signature1, signature2):
+    """두 서명으로 Jaccard 유사도 추정 (같은 값을 가진 위치의 비율)"""
+    return float(np.mean(signature1 == signature2))
+
+
+class MinHashLSH:
+    """
+    MinHash 서명의 LSH 버킷 색인
+
+    서명을 bands 개의 밴드로 나누고, 한 밴드라도 완전히 같은 서명끼리만 후보로 봅니다.
+    Jaccard 유사도 s 인 두 집합이 후보가 될 확률은 1 - (1 - s^r)^b (r = num_perm / bands) 이며,
+    기본값(128, 16)에서는 s 가 약 0.7 보다 크면 거의 항상 후보가 됩니다.
+    서명 추정치의 표준편차는 sqrt(s(1-s)/num_perm) (s=0.9, 128 에서 약 0.027)라 임계값 근처에서는 오판하므로,
+    insert/query 에 토큰 집합을 함께 주면 후보를 정확한 Jaccard 유사도로 다시 확인합니다.
+    """
+
+    def __init__(self, num_perm=128, bands=16):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._tokens = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key, signature, tokens=None):
+        """key 로 서명을 색인에 추가합니다 (tokens: 질의 후보를 정확히 확인할 토큰 집합, 없으면 서명 추정치 사용)."""
+        self._signatures[key] = signature
+        if tokens is not None:
+            self._tokens[key] = tokens
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def candidates(self, signature):
+        """한 밴드 이상 버킷이 겹치는 key 집합"""
+        found = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
+
+    def query(self, signature, threshold, tokens=None):
+        """
+        Jaccard 유사도가 threshold 이상인 key 목록을 유사도 내림차순으로 반환합니다.
+        tokens 가 있으면 토큰 집합과 함께 추가된 후보는 정확한 유사도로, 나머지는 서명 추정치로 판단합니다.
+
+        Returns:
+            list: (key, 유사도) 튜플 리스트
+        """
+        matches = []
+        for key in self.candidates(signature):
+            if tokens is not None and key in self._tokens:
+                similarity = jaccard(tokens, self._tokens[key])
+            else:
+                similarity = estimate_jaccard(signature, self._signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+
+class MinHashDiversity:
+    """
+    diversity.TokenSetDiversity 와 같은 인터페이스로 Jaccard 유사도를 MinHash 로 근사합니다.
+
+    합집합의 MinHash 서명은 각 서명의 위치별 최솟값이므로 선택된 텍스트의 서명 하나만 유지하면 되고,
+    라운드 비용이 후보 토큰 수와 무관하게 O(후보 수 * num_perm) 로 고정됩니다.
+    다만 exact 백엔드도 교집합 크기를 점진적으로 갱신하므로 실제로는 더 빠르고, 근사 오차로 선택 결과가 많이 달라
+    exact 보다 빠르고 겹침이 충분해질 때까지는 비교 실험용으로만 둡니다.
+    """
+
+    def __init__(self, texts, num_perm=64, seed=1):
+        hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self._signatures = hasher.signatures([word_tokens(text) for text in texts])
+        self._selected = np.full(num_perm, _EMPTY_VALUE, dtype=np.int64)
+
+    def add(self, position):
+        """위치 position 의 후보를 선택된 집합에 추가합니다."""
+        np.minimum(self._selected, self._signatures[position], out=self._selected)
+
+    def similarities(self):
+        """모든 후보와 선택된 집합 사이의 추정 Jaccard 유사도 배열 (둘 다 비어 있으면 1.0)"""
+        return (self._signatures == self._selected).mean(axis=1)
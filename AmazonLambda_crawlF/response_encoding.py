@@ -0,0 +1,126 @@
+"""
+람다 응답 압축 모듈
+
+응답 본문은 serializer.dumps 가 만든 UTF-8 JSON(한국어를 이스케이프하지 않음)이고, 리뷰 목록은 키 이름과 날짜가 반복되어
+gzip 으로 원래 크기의 1/3 정도로 줄어듭니다 (benchmark_response_compression.py 기준 gzip-5: 리뷰 100개 68KB -> 18KB,
+리뷰 1000개 706KB -> 174KB, 요약 27KB -> 6.6KB, 리뷰 1개 610B 는 base64 를 더하면 거의 줄지 않음).
+클라이언트가 요청 헤더 Accept-Encoding 이나 요청 본문의 accept_encoding 필드로 지원하는 인코딩을 알려주면,
+본문이 COMPRESSION_MIN_BYTES 이상일 때 압축한 뒤 base64 로 인코딩해 isBase64Encoded 와 Content-Encoding 을 붙여 반환합니다.
+- API Gateway HTTP API 는 isBase64Encoded 응답을 그대로 디코딩해 전달합니다
+  (REST API 는 binaryMediaTypes 에 application/json 또는 */* 를 등록해야 함)
+- br 은 brotli 패키지가 설치된 경우에만 사용하고, 없으면 gzip 으로 응답
+- 임계값과 압축 수준은 benchmark_response_compression.py 결과로 정함
+"""
+import gzip
+import base64
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 만 사용
+    brotli = None
+
+# 이보다 작은 본문은 압축하지 않음 (바이트, 압축/base64 비용에 비해 줄어드는 크기가 작음)
+COMPRESSION_MIN_BYTES = 1024
+
+# gzip 압축 수준 (1~9)
+GZIP_LEVEL = 5
+
+# brotli 압축 수준 (0~11)
+BROTLI_QUALITY = 5
+
+
+def supported_encodings():
+    """서버가 지원하는 인코딩 (선호 순)"""
+    return (['br'] if brotli else []) + ['gzip']
+
+
+def parse_accept_encoding(value):
+    """'gzip, br;q=0.8, *;q=0' 같은 값을 {인코딩: q} 로 변환 (문자열이 아니면 빈 dict)"""
+    preferences = {}
+    if not isinstance(value, str):
+        return preferences
+    for part in value.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        preferences[name] = quality
+    return preferences
+
+
+def negotiate_encoding(event, body_dict=None):
+    """
+    응답에 사용할 인코딩 (압축하지 않으면 None)
+
+    요청 헤더 Accept-Encoding 을 먼저 보고, 없으면 요청 본문의 accept_encoding 필드를 봅니다.
+    문자열이 아닌 값, dict 가 아닌 헤더/본문은 무시합니다 (압축하지 않음).
+    """
+    headers = event.get('headers') if isinstance(event, dict) else None
+    headers = {str(name).lower(): value for name, value in headers.items()} if isinstance(headers, dict) else {}
+    value = headers.get('accept-encoding')
+    if not isinstance(value, str) or not value:
+        value = body_dict.get('accept_encoding') if isinstance(body_dict, dict) else None
+    preferences = parse_accept_encoding(value)
+    candidates = [(preferences.get(name, preferences.get('*', 0.0)), -rank, name)
+                  for rank, name in enumerate(supported_encodings())]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else None
+
+
+def compress(data, encoding):
+    """본문 바이트 압축"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def encode_response(response, encoding, min_bytes=COMPRESSION_MIN_BYTES):
+    """
+    람다 응답의 본문을 encoding 으로 압축합니다.
+    encoding 이 None 이거나, 본문이 작거나, 압축해도 줄지 않으면 응답을 그대로 반환합니다.
+    """
+    body = response.get('body')
+    if not encoding or not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+    data = body.encode('utf-8')
+    if len(data) < min_bytes:
+        return response
+
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers.update({
+        'Content-Type': headers.get('Content-Type', 'application/json'),
+        'Content-Encoding': encoding,
+        'Vary': 'Accept-Encoding',
+    })
+    return {
+        **response,
+        'headers': headers,
+        'body': base64.b64encode(compressed).decode('ascii'),
+        'isBase64Encoded': True,
+    }
+
+
+def decode_response_body(response):
+    """encode_response 로 압축한 응답의 본문 문자열 (테스트/클라이언트 확인용)"""
+    if not response.get('isBase64Encoded'):
+        return response['body']
+    data = base64.b64decode(response['body'])
+    encoding = (response.get('headers') or {}).get('Content-Encoding')
+    if encoding == 'br':
+        data = brotli.decompress(data)
+    elif encoding == 'gzip':
+        data = gzip.decompress(data)
+    return data.decode('utf-8')
@@ -0,0 +1,248 @@
+"""
+과거 리뷰 백필(backfill) 모듈
+
+일반 수집(lambda_function.fetch_and_save_new_reviews)은 2개월 전 1일까지, 한 번에 5000개 정도까지만 받으므로
+리뷰가 많은 앱은 과거 리뷰를 끝까지 받을 수 없고, 수집 도중 람다 시간이 끝나면 받은 페이지 위치도 잃습니다.
+백필은 스토어를 최신순으로 끝까지 따라가며 페이지마다 리뷰를 저장한 뒤,
+스크레이퍼 continuation_token 과 진행 상황을 AppBackfillState 테이블에 체크포인트로 남깁니다.
+람다 남은 시간이 부족해지면 멈추고, 다음 호출이 체크포인트에서 이어받으므로 짧은 호출 여러 번으로 전체 이력을 받을 수 있습니다.
+- 백필 시작 시 저장되어 있던 가장 오래된 리뷰 시각(stored_oldest_at) 이후 리뷰는 일반 수집이 이미 저장했으므로 건너뜀
+- 체크포인트는 읽어 온 pages 값이 그대로일 때만 저장하므로, 같은 앱의 백필이 동시에 실행되면 한쪽만 진행
+- 리뷰는 (app_id, 날짜#사용자명) 키로 덮어쓰므로, 체크포인트 저장 전에 중단되어 같은 페이지를 다시 받아도 중복이 생기지 않음
+
+람다 핸들러는 backfill_handler 이며, 응답의 status 가 'running' 이면 같은 이벤트로 다시 호출합니다 (EventBridge 스케줄 등).
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from google_play_scraper import Sort, reviews
+# 토큰을 저장했다가 다시 만들기 위해 사용 (google_play_scraper 가 공개하지 않는 클래스)
+from google_play_scraper.features.reviews import _ContinuationToken
+
+from lambda_function import (NEAR_DUPLICATE_WINDOW, app_review_table, build_near_duplicate_index,
+                             is_near_duplicate, save_reviews_to_dynamodb)
+from serializer import dumps
+
+# 호출 한 번에 처리할 최대 페이지 수 (페이지당 200개)
+BACKFILL_MAX_PAGES = 50
+
+# 람다 남은 시간이 이보다 적으면 다음 페이지를 받지 않고 체크포인트만 남기고 종료 (초)
+BACKFILL_SAFETY_SECONDS = 60
+
+BACKFILL_PAGE_SIZE = 200
+
+backfill_state_table = boto3.resource('dynamodb').Table('AppBackfillState')
+
+
+class BackfillConflictError(Exception):
+    """다른 호출이 같은 앱의 체크포인트를 먼저 갱신했을 때 발생"""
+
+
+def encode_continuation_token(token):
+    """continuation_token 을 DynamoDB 에 저장할 수 있는 값으로 변환 (로컬 스텁의 숫자/문자열 토큰은 그대로)"""
+    if isinstance(token, _ContinuationToken):
+        return {name: getattr(token, name) for name in _ContinuationToken.__slots__}
+    return token
+
+
+def decode_continuation_token(value):
+    """저장된 값을 continuation_token 으로 되돌림"""
+    if isinstance(value, dict):
+        return _ContinuationToken(**{name: int(v) if isinstance(v, Decimal) else v for name, v in value.items()})
+    if isinstance(value, Decimal):
+        return int(value)
+    return value
+
+
+def is_last_page(token):
+    """더 받을 페이지가 없는 토큰인지 (google_play_scraper 는 마지막에 token=None 인 객체를 돌려줌)"""
+    return token is None or (isinstance(token, _ContinuationToken) and token.token is None)
+
+
+def get_oldest_review_at(app_id):
+    """저장된 리뷰 중 가장 오래된 리뷰 시각 (없으면 None)"""
+    # 정렬 키는 '날짜#사용자명' 이라 가장 오래된 날짜만 알 수 있으므로, 그 날짜의 리뷰 중 가장 이른 시각을 찾음
+    response = app_review_table.query(
+        KeyConditionExpression=Key('app_id').eq(app_id),
+        ProjectionExpression='date_user_id',
+        ScanIndexForward=True,
+        Limit=1
+    )
+    items = response.get('Items', [])
+    if not items:
+        return None
+    oldest_day = items[0]['date_user_id'].split('#', 1)[0]
+    day_items = app_review_table.query(
+        KeyConditionExpression=Key('app_id').eq(app_id) & Key('date_user_id').begins_with(f"{oldest_day}#"),
+        ProjectionExpression='#d',
+        ExpressionAttributeNames={'#d': 'date'}
+    ).get('Items', [])
+    return min(datetime.fromisoformat(item['date']) for item in day_items).isoformat()
+
+
+def get_backfill_state(app_id):
+    """앱의 백필 체크포인트 (없으면 None)"""
+    response = backfill_state_table.get_item(Key={'app_id': app_id}, ConsistentRead=True)
+    return response.get('Item')
+
+
+def new_backfill_state(app_id, until=None):
+    """처음 시작하는 백필의 체크포인트"""
+    now = datetime.now().isoformat()
+    return {
+        'app_id': app_id,
+        'status': 'running',
+        'continuation_token': None,
+        'stored_oldest_at': get_oldest_review_at(app_id),
+        'until': until,
+        'oldest_at': None,
+        'pages': 0,
+        'reviews_scanned': 0,
+        'reviews_saved': 0,
+        'invocations': 0,
+        'started_at': now,
+        'updated_at': now,
+    }
+
+
+def save_backfill_state(state, expected_pages):
+    """체크포인트 저장 (저장된 pages 가 expected_pages 일 때만, 아니면 BackfillConflictError)"""
+    state['updated_at'] = datetime.now().isoformat()
+    try:
+        if expected_pages is None:
+            backfill_state_table.put_item(Item=state, ConditionExpression='attribute_not_exists(app_id)')
+        else:
+            backfill_state_table.put_item(
+                Item=state,
+                ConditionExpression='pages = :pages',
+                ExpressionAttributeValues={':pages': expected_pages}
+            )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            raise BackfillConflictError(f"Backfill checkpoint for app_id={state['app_id']} was updated by another run")
+        raise
+
+
+def run_backfill(app_id, max_pages=BACKFILL_MAX_PAGES, time_left=None, until=None, restart=False,
+                 fetch_reviews=reviews):
+    """
+    체크포인트에서 이어서 최대 max_pages 페이지를 받아 저장하고, 갱신된 체크포인트를 반환합니다.
+
+    Args:
+        app_id (str): 앱 ID
+        max_pages (int): 이번 호출에서 받을 최대 페이지 수
+        time_left (callable): 남은 실행 시간(초)을 돌려주는 함수 (None 이면 시간 제한 없음)
+        until (str): 이 날짜(YYYY-MM-DD)보다 오래된 리뷰에 도달하면 완료 (None 이면 스토어 끝까지)
+        restart (bool): 완료되었거나 진행 중인 백필을 버리고 처음부터 다시 시작
+        fetch_reviews (callable): 스토어 호출 함수 (테스트 시 로컬 스텁으로 교체)
+    Returns:
+        dict: 체크포인트 (status 가 'running' 이면 다음 호출에서 이어서 진행)
+    """
+    state = get_backfill_state(app_id)
+    if state is None or restart:
+        previous = state
+        state = new_backfill_state(app_id, until)
+        save_backfill_state(state, previous['pages'] if previous else None)
+    if state['status'] == 'done':
+        print(f"Backfill already done for app_id={app_id}: {state['reviews_saved']} reviews saved")
+        return state
+
+    state['invocations'] += 1
+    until_date = datetime.fromisoformat(state['until']) if state.get('until') else None
+    stored_oldest_at = datetime.fromisoformat(state['stored_oldest_at']) if state.get('stored_oldest_at') else None
+    today = datetime.now().date()
+    near_duplicate_index = build_near_duplicate_index([])
+    print(f"Backfill app_id={app_id}: resuming after page {state['pages']} "
+          f"(saved {state['reviews_saved']}, stored reviews from {state.get('stored_oldest_at')})")
+
+    for _ in range(max_pages):
+        if time_left is not None and time_left() < BACKFILL_SAFETY_SECONDS:
+            print("Not enough time left for another page. Stopping at the checkpoint.")
+            break
+
+        result_list, next_token = fetch_reviews(
+            app_id,
+            lang='ko',
+            country='kr',
+            sort=Sort.NEWEST,
+            count=BACKFILL_PAGE_SIZE,
+            filter_score_with=None,
+            continuation_token=decode_continuation_token(state['continuation_token'])
+        )
+
+        page_reviews = []
+        reached_until = False
+        for review in result_list:
+            review_date = review['at']
+            if until_date and review_date < until_date:
+                reached_until = True
+                break
+            # 오늘 리뷰는 일반 수집이 다음 날 받고, 저장되어 있던 범위는 이미 저장됨
+            if review_date.date() >= today or (stored_oldest_at and review_date >= stored_oldest_at):
+                continue
+            if is_near_duplicate(near_duplicate_index, review.get('content')):
+                # 저장은 하되 요약에서는 제외
+                review['near_duplicate'] = True
+            page_reviews.append(review)
+
+        saved_items = save_reviews_to_dynamodb(app_id, page_reviews) if page_reviews else []
+
+        expected_pages = state['pages']
+        state['continuation_token'] = encode_continuation_token(next_token)
+        state['pages'] += 1
+        state['reviews_scanned'] += len(result_list)
+        state['reviews_saved'] += len(saved_items)
+        if result_list:
+            state['oldest_at'] = result_list[-1]['at'].isoformat()
+        if not result_list or reached_until or is_last_page(next_token):
+            state['status'] = 'done'
+        save_backfill_state(state, expected_pages)
+
+        if state['status'] == 'done':
+            print(f"Backfill done for app_id={app_id}: {state['reviews_saved']} reviews saved "
+                  f"over {state['pages']} pages (oldest {state['oldest_at']})")
+            break
+        if len(near_duplicate_index) > NEAR_DUPLICATE_WINDOW:
+            near_duplicate_index = build_near_duplicate_index([])
+
+    return state
+
+
+def backfill_handler(event, context):
+    """백필 람다 핸들러 (event: app_id 필수, max_pages / until / restart 선택)"""
+    try:
+        event = event or {}
+        app_id = event.get('app_id')
+        if not app_id:
+            return {
+                "statusCode": 400,
+                "body": dumps({"error": "app_id parameter is required."})
+            }
+
+        time_left = (lambda: context.get_remaining_time_in_millis() / 1000) if context else None
+        state = run_backfill(
+            app_id,
+            max_pages=int(event.get('max_pages', BACKFILL_MAX_PAGES)),
+            time_left=time_left,
+            until=event.get('until'),
+            restart=bool(event.get('restart', False)),
+        )
+        return {
+            "statusCode": 200,
+            "body": dumps(state)
+        }
+    except BackfillConflictError as e:
+        print(f"Backfill conflict: {str(e)}")
+        return {
+            "statusCode": 409,
+            "body": dumps({"error": str(e)})
+        }
+    except Exception as e:
+        print(f"Error occurred: {str(e)}, event={event}")
+        return {
+            "statusCode": 500,
+            "body": dumps({"error": str(e)})
+        }
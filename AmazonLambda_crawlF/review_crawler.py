@@ -0,0 +1,194 @@
+"""
+전체 앱 리뷰 일괄 수집(batch crawl) 모듈
+
+사용자 요청 시점에 앱 하나씩 수집하는 대신, AppInfo 에 등록된 모든 앱의 리뷰를 주기적으로 한 번에 갱신합니다.
+- 제한된 수의 워커 스레드로 여러 앱을 동시에 수집 (앱 하나의 처리는 lambda_function.refresh_app_reviews 와 동일)
+- 스토어(play.google.com) 호출은 모든 워커가 공유하는 토큰 버킷으로 초당 호출 수를 제한
+- 실패한 스토어 호출은 지수 백오프 + full jitter 로 재시도하고, 끝내 실패한 앱은 보고서에 기록 후 나머지 앱은 계속 수집
+- boto3 Table 리소스는 스레드 안전하지 않으므로, 수집 경로의 DynamoDB 읽기/쓰기는 lambda_function.table_client 와
+  dynamodb_writer.dynamodb_client (스레드 안전한 저수준 클라이언트)로만 함
+- 처리량(apps/sec, reviews/sec)과 재시도/대기 시간, DynamoDB 쓰기 지표 보고
+
+람다 핸들러는 crawler_handler 이며 EventBridge 스케줄 등으로 호출합니다.
+"""
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from google_play_scraper import reviews
+
+from dynamodb_writer import write_totals
+from lambda_function import DEDUP_REVIEW_FIELDS, ReviewSnapshot, get_all_app_info, refresh_app_reviews
+from serializer import dumps
+
+# 동시에 수집할 앱 수
+CRAWL_MAX_WORKERS = 4
+
+# 스토어 호출 속도 제한: 초당 호출 수와 순간 최대 호출 수(버킷 크기)
+CRAWL_REQUESTS_PER_SECOND = 2.0
+CRAWL_BURST = 4
+
+# 스토어 호출 재시도: 최대 시도 횟수와 백오프 기본/최대 대기 시간(초)
+CRAWL_MAX_ATTEMPTS = 4
+CRAWL_BACKOFF_BASE = 1.0
+CRAWL_BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷 속도 제한기
+
+    초당 rate 개씩 토큰이 채워지고(최대 capacity 개), 호출마다 토큰 1개를 사용합니다.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰을 얻을 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+def backoff_delay(attempt, base_delay=CRAWL_BACKOFF_BASE, max_delay=CRAWL_BACKOFF_MAX):
+    """attempt 번째(0부터) 재시도 전 대기 시간: 0 ~ min(max_delay, base_delay * 2^attempt) 균등 분포 (full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CrawlStats:
+    """워커 스레드들이 함께 갱신하는 수집 통계"""
+
+    def __init__(self):
+        self.counters = {'store_calls': 0, 'retries': 0, 'throttle_seconds': 0.0, 'backoff_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+
+def rate_limited_fetch(fetch_reviews, bucket, stats, max_attempts=CRAWL_MAX_ATTEMPTS,
+                       backoff_base=CRAWL_BACKOFF_BASE, sleep=time.sleep):
+    """
+    스토어 호출 함수에 속도 제한과 재시도를 적용한 함수를 반환합니다 (google_play_scraper.reviews 와 같은 시그니처).
+    재시도할 때도 토큰을 다시 얻으므로 재시도 역시 속도 제한을 따릅니다.
+    """
+    def fetch(app_id, **kwargs):
+        for attempt in range(max_attempts):
+            stats.add('throttle_seconds', bucket.acquire())
+            stats.add('store_calls')
+            try:
+                return fetch_reviews(app_id, **kwargs)
+            except Exception as e:
+                if attempt == max_attempts - 1:
+                    raise
+                delay = backoff_delay(attempt, backoff_base)
+                print(f"Store request failed (app_id={app_id}, attempt {attempt + 1}/{max_attempts}): {str(e)}. "
+                      f"Retrying in {delay:.2f}s")
+                stats.add('retries')
+                stats.add('backoff_seconds', delay)
+                sleep(delay)
+    return fetch
+
+
+def refresh_app(app_id, fetch_reviews):
+    """앱 하나의 리뷰 갱신 (요청 처리와 같은 흐름, 새로 저장한 리뷰 수 반환)"""
+    snapshot = ReviewSnapshot(app_id, DEDUP_REVIEW_FIELDS)
+    return refresh_app_reviews(snapshot, fetch_reviews)
+
+
+def crawl_all_apps(app_ids=None, max_workers=CRAWL_MAX_WORKERS, requests_per_second=CRAWL_REQUESTS_PER_SECOND,
+                   burst=CRAWL_BURST, max_attempts=CRAWL_MAX_ATTEMPTS, backoff_base=CRAWL_BACKOFF_BASE,
+                   fetch_reviews=reviews):
+    """
+    여러 앱의 리뷰를 동시에 갱신합니다.
+
+    Args:
+        app_ids (list): 수집할 앱 ID 목록 (None 이면 AppInfo 에 등록된 모든 앱)
+        max_workers (int): 동시에 수집할 앱 수
+        requests_per_second (float): 모든 워커를 합친 스토어 호출 속도 상한
+        burst (int): 순간적으로 허용하는 최대 연속 호출 수
+        max_attempts (int): 스토어 호출 1회당 최대 시도 횟수
+        backoff_base (float): 재시도 백오프 기본 대기 시간(초)
+        fetch_reviews (callable): 스토어 호출 함수 (테스트 시 로컬 스텁으로 교체)
+    Returns:
+        dict: 수집 보고서 (앱/리뷰 수, 실패한 앱, 처리량, 재시도/대기 통계, DynamoDB 쓰기 지표)
+    """
+    if app_ids is None:
+        app_ids = [app_info['app_id'] for app_info in get_all_app_info()]
+
+    stats = CrawlStats()
+    fetch = rate_limited_fetch(fetch_reviews, TokenBucket(requests_per_second, burst), stats,
+                               max_attempts, backoff_base)
+
+    reviews_saved = 0
+    failed_apps = []
+    writes_before = write_totals.snapshot()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(refresh_app, app_id, fetch): app_id for app_id in app_ids}
+        for future in as_completed(futures):
+            app_id = futures[future]
+            try:
+                saved = future.result()
+                reviews_saved += saved
+                print(f"Crawled app_id={app_id}: {saved} new reviews")
+            except Exception as e:
+                print(f"Error crawling app (app_id={app_id}): {str(e)}")
+                failed_apps.append({'app_id': app_id, 'error': str(e)})
+    elapsed = time.perf_counter() - start
+    writes = write_totals.snapshot().since(writes_before)
+
+    report = {
+        'apps': len(app_ids),
+        'succeeded': len(app_ids) - len(failed_apps),
+        'failed_apps': failed_apps,
+        'reviews_saved': reviews_saved,
+        'elapsed_seconds': round(elapsed, 3),
+        'apps_per_second': round(len(app_ids) / elapsed, 3) if elapsed else 0.0,
+        'reviews_per_second': round(reviews_saved / elapsed, 3) if elapsed else 0.0,
+        **{name: round(value, 3) for name, value in stats.counters.items()},
+        'dynamodb_writes': writes.as_dict(),
+    }
+    print(f"Batch crawl report: {report}")
+    return report
+
+
+def crawler_handler(event, context):
+    """일괄 수집 람다 핸들러 (event 에 max_workers / requests_per_second / app_ids 를 넣어 기본값 변경 가능)"""
+    try:
+        event = event or {}
+        report = crawl_all_apps(
+            app_ids=event.get('app_ids'),
+            max_workers=int(event.get('max_workers', CRAWL_MAX_WORKERS)),
+            requests_per_second=float(event.get('requests_per_second', CRAWL_REQUESTS_PER_SECOND)),
+        )
+        return {
+            "statusCode": 200,
+            "body": dumps(report)
+        }
+    except Exception as e:
+        print(f"Error occurred: {str(e)}, event={event}")
+        return {
+            "statusCode": 500,
+            "body": dumps({"error": str(e)})
+        }
@@ -0,0 +1,291 @@
+"""
+앱 리뷰 전체 이력 스트리밍 내보내기(export) 모듈
+
+AppReview 파티션을 페이지 단위로 조회하면서 바로 파일에 쓰므로, 리뷰 수와 관계없이 메모리는 한 페이지 분량만 사용합니다.
+- 형식: NDJSON (한 줄에 리뷰 하나) 또는 Parquet (pyarrow 필요, 페이지 묶음마다 닫힌 파일 하나)
+- since / until 날짜 조건 (정렬 키 조건이라 범위 밖 리뷰는 읽지 않음)
+- 페이지를 파일에 쓴 뒤 다음 위치(cursor)를 체크포인트 파일에 남기므로, 중단되면 cursor 로 이어서 내보냄
+  (NDJSON 은 같은 파일 뒤에 이어 쓰고, Parquet 은 파일에 덧붙일 수 없으므로 OUTPUT.partN.parquet 새 파일로 씀)
+  Parquet 은 파일을 닫을 때 메타데이터(footer)를 쓰므로 열린 파일은 중단되면 읽을 수 없음
+  -> 묶음마다 파일을 닫고, 체크포인트는 아직 파일에 쓰지 않은 행이 없을 때만 저장 (전체 파일 목록은 export_files)
+  페이지를 쓴 직후 체크포인트 저장 전에 중단되면 그 페이지(Parquet 은 그 묶음)가 한 번 더 쓰일 수 있음
+- 응답 처리 속도를 위해 저수준 클라이언트 응답을 Decimal 없이 바로 파이썬 값으로 변환
+
+사용법:
+    python review_export.py APP_ID OUTPUT [--format ndjson|parquet] [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+                            [--fields date,score,content] [--cursor CURSOR] [--checkpoint PATH]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from dynamodb_writer import dynamodb_client
+from lambda_function import REVIEW_RESPONSE_FIELDS, app_review_table, decode_review_page_token, encode_review_page_token
+from serializer import dumps
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # 선택 의존성: Parquet 내보내기에만 필요
+    pyarrow = None
+
+# 조회 한 번에 읽을 최대 리뷰 수 (None 이면 DynamoDB 1 MB 페이지)
+EXPORT_PAGE_SIZE = None
+
+# Parquet 파일(row group 하나) 하나에 모을 최소 리뷰 수
+PARQUET_ROW_GROUP_ROWS = 10000
+
+EXPORT_FORMATS = ['ndjson', 'parquet']
+
+_deserializer = TypeDeserializer()
+
+
+def plain_value(value):
+    """DynamoDB 속성 값({'S': ...} 등)을 파이썬 값으로 변환 (숫자는 Decimal 대신 int/float)"""
+    (kind, data), = value.items()
+    if kind == 'S':
+        return data
+    if kind == 'N':
+        return int(data) if data.lstrip('-').isdigit() else float(data)
+    if kind == 'NULL':
+        return None
+    if kind == 'BOOL':
+        return data
+    if kind == 'M':
+        return {name: plain_value(item) for name, item in data.items()}
+    if kind == 'L':
+        return [plain_value(item) for item in data]
+    if kind == 'SS':
+        return sorted(data)
+    if kind == 'NS':
+        return sorted(plain_value({'N': item}) for item in data)
+    return _deserializer.deserialize(value)
+
+
+def iter_export_pages(app_id, fields=None, since=None, until=None, cursor=None, page_size=EXPORT_PAGE_SIZE,
+                      client=None):
+    """(리뷰 목록, 다음 cursor) 를 페이지마다 생성합니다 (오래된 순, 마지막 페이지의 cursor 는 None)."""
+    client = client or dynamodb_client
+    query_params = {'since': since, 'until': until, 'newest_first': False}
+    names = {'#app_id': 'app_id'}
+    values = {':app_id': {'S': app_id}}
+    key_condition = '#app_id = :app_id'
+    if since or until:
+        # '$' 는 '#' 바로 다음 문자라서 until 날짜의 모든 사용자명을 포함
+        names['#sk'] = 'date_user_id'
+        values.update({':since': {'S': f"{since or ''}#"}, ':until': {'S': f"{until or '9999-12-31'}$"}})
+        key_condition += ' AND #sk BETWEEN :since AND :until'
+    query_kwargs = {
+        'TableName': app_review_table.name,
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+    }
+    if fields:
+        names.update({f"#f{i}": field for i, field in enumerate(fields)})
+        query_kwargs['ProjectionExpression'] = ', '.join(f"#f{i}" for i in range(len(fields)))
+    if page_size:
+        query_kwargs['Limit'] = page_size
+    if cursor:
+        start_key = decode_review_page_token(cursor, app_id, query_params)
+        query_kwargs['ExclusiveStartKey'] = {name: {'S': value} for name, value in start_key.items()}
+
+    while True:
+        response = client.query(**query_kwargs)
+        items = [{name: plain_value(value) for name, value in item.items()} for item in response.get('Items', [])]
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        next_cursor = None
+        if last_evaluated_key:
+            next_cursor = encode_review_page_token(
+                app_id, {name: value['S'] for name, value in last_evaluated_key.items()}, query_params)
+        yield items, next_cursor
+        if not last_evaluated_key:
+            return
+        query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+
+def part_path(output, number):
+    """이어서 내보낸 Parquet 파일 경로 (output.parquet -> output.part1.parquet)"""
+    base, extension = os.path.splitext(output)
+    return f"{base}.part{number}{extension or '.parquet'}"
+
+
+def part_files(output):
+    """output 의 part 파일 경로들 (번호순)"""
+    base, extension = os.path.splitext(output)
+    pattern = re.compile(re.escape(os.path.basename(base)) + r'\.part(\d+)' + re.escape(extension or '.parquet') + '$')
+    parts = sorted((int(match.group(1)), os.path.join(os.path.dirname(output), name))
+                   for name in os.listdir(os.path.dirname(output) or '.') for match in [pattern.match(name)] if match)
+    return [path for _, path in parts]
+
+
+def export_files(output):
+    """Parquet 내보내기 결과 파일 목록 (output 과 part 파일들, 쓴 순서)"""
+    return ([output] if os.path.exists(output) else []) + part_files(output)
+
+
+class NdjsonSink:
+    """NDJSON 파일 쓰기 (이어서 내보낼 때는 파일 뒤에 추가)"""
+
+    # 쓴 행은 바로 파일에 기록되므로 체크포인트는 페이지마다 저장
+    pending_rows = 0
+
+    def __init__(self, path, fields, resume):
+        self.paths = [path]
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def write(self, items):
+        if items:
+            self._file.write('\n'.join(map(dumps, items)) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Parquet 파일 쓰기 (PARQUET_ROW_GROUP_ROWS 개씩 모아 row group 하나짜리 파일을 쓰고 바로 닫음)
+
+    첫 파일은 path, 다음 파일부터와 이어서 내보낼 때는 비어 있는 다음 번호의 part 파일 (part_path).
+    처음부터 내보낼 때는 이전 내보내기의 part 파일을 지웁니다.
+    """
+
+    TYPES = {'score': 'int64', 'quality_score': 'float64', 'quality_version': 'int64'}
+
+    def __init__(self, path, fields, resume):
+        if pyarrow is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow).")
+        columns = fields or REVIEW_RESPONSE_FIELDS
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, self.TYPES.get(name, 'string'))()) for name in columns])
+        self.path = path
+        self.paths = []
+        self._resume = resume
+        if not resume:
+            for stale_path in part_files(path):
+                os.remove(stale_path)
+        self._part = 1 if resume else 0
+        self._rows = []
+
+    @property
+    def pending_rows(self):
+        """아직 파일에 쓰지 않은 행 수 (0 일 때만 체크포인트 저장)"""
+        return len(self._rows)
+
+    def write(self, items):
+        self._rows.extend(items)
+        if len(self._rows) >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+
+    def _next_path(self):
+        while True:
+            path = part_path(self.path, self._part) if self._part else self.path
+            self._part += 1
+            if not self._resume or not os.path.exists(path):
+                return path
+
+    def _write_file(self, rows):
+        columns = {name: [row.get(name) for row in rows] for name in self.schema.names}
+        path = self._next_path()
+        pyarrow.parquet.write_table(pyarrow.Table.from_pydict(columns, schema=self.schema), path)
+        self.paths.append(path)
+
+    def _flush(self):
+        if self._rows:
+            self._write_file(self._rows)
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        if not self.paths and not self._resume:
+            # 리뷰가 없어도 스키마만 있는 파일을 남김
+            self._write_file([])
+
+
+def save_checkpoint(path, cursor):
+    """마지막으로 파일에 쓴 페이지 다음 위치 저장 (끝까지 내보냈으면 빈 파일)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(cursor or '')
+
+
+def export_reviews(app_id, output, export_format='ndjson', fields=None, since=None, until=None, cursor=None,
+                   checkpoint=None, page_size=EXPORT_PAGE_SIZE, max_pages=None, client=None):
+    """
+    앱 리뷰를 파일로 내보내고 결과 통계를 반환합니다.
+
+    Args:
+        app_id (str): 앱 ID
+        output (str): 출력 파일 경로
+        export_format (str): 'ndjson' 또는 'parquet'
+        fields (list): 내보낼 속성 (None 이면 모든 속성, Parquet 은 REVIEW_RESPONSE_FIELDS)
+        since, until (str): 리뷰 날짜 범위 (YYYY-MM-DD, 양 끝 포함)
+        cursor (str): 이전 내보내기가 남긴 cursor (이 위치부터 이어서)
+        checkpoint (str): 다음 cursor 를 저장할 파일 경로 (쓴 행이 모두 파일에 기록될 때마다, 끝나면 마지막 위치)
+        max_pages (int): 이번 실행에서 읽을 최대 페이지 수 (None 이면 끝까지)
+    Returns:
+        dict: rows, pages, seconds, rows_per_second, cursor (끝까지 내보냈으면 None), files (이번 실행에서 쓴 파일)
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"export_format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if fields and any(field not in REVIEW_RESPONSE_FIELDS for field in fields):
+        raise ValueError(f"fields must be a subset of: {', '.join(REVIEW_RESPONSE_FIELDS)}")
+
+    sink = (NdjsonSink if export_format == 'ndjson' else ParquetSink)(output, fields, resume=bool(cursor))
+    rows = pages = 0
+    next_cursor = cursor
+    start = time.perf_counter()
+    try:
+        for items, page_cursor in iter_export_pages(app_id, fields, since, until, cursor, page_size, client):
+            sink.write(items)
+            next_cursor = page_cursor
+            rows += len(items)
+            pages += 1
+            if checkpoint and not sink.pending_rows:
+                save_checkpoint(checkpoint, next_cursor)
+            if max_pages and pages >= max_pages:
+                break
+    finally:
+        sink.close()
+        # 닫으면서 남은 행을 모두 썼으므로 마지막으로 쓴 페이지 다음 위치를 저장 (닫기에 실패하면 이전 체크포인트 유지)
+        if checkpoint and pages:
+            save_checkpoint(checkpoint, next_cursor)
+    seconds = time.perf_counter() - start
+
+    result = {
+        'app_id': app_id,
+        'output': output,
+        'rows': rows,
+        'pages': pages,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+        'cursor': next_cursor,
+        'files': sink.paths,
+    }
+    print(f"Exported reviews: {result}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream an app's reviews from AppReview to NDJSON or Parquet")
+    parser.add_argument('app_id')
+    parser.add_argument('output')
+    parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='ndjson')
+    parser.add_argument('--since', help='oldest review date (YYYY-MM-DD)')
+    parser.add_argument('--until', help='newest review date (YYYY-MM-DD)')
+    parser.add_argument('--fields', help='comma separated review attributes')
+    parser.add_argument('--cursor', help='resume from the cursor saved by a previous export')
+    parser.add_argument('--checkpoint', help='file that receives the cursor after every page')
+    args = parser.parse_args(argv)
+
+    fields = [field.strip() for field in args.fields.split(',')] if args.fields else None
+    result = export_reviews(args.app_id, args.output, args.export_format, fields, args.since, args.until,
+                            args.cursor, args.checkpoint)
+    return 0 if result['cursor'] is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+앱별 일별 리뷰 집계(AppReviewDaily) 모듈
+
+앱 화면의 차트(평점 분포, 리뷰 수 추이, 기간별 평점, 리뷰 길이-평점 관계)는 집계 값만 필요하지만,
+지금은 app_review_read 로 모든 리뷰를 받아야 합니다.
+AppReviewDaily 는 (app_id, day) 항목 하나에 그날 리뷰의 집계를 보관합니다.
+- count, score_sum, length_sum
+- score_1 ~ score_5: 평점별 리뷰 수
+- length_sum_score_1 ~ length_sum_score_5: 평점별 리뷰 길이 합 (평점별 평균 길이)
+- 길이 구간별 리뷰 수 (LENGTH_BUCKETS)
+리뷰 저장(lambda_function.save_reviews_to_dynamodb)은 save_reviews_with_stats 로 하며, 저장 비용은 저장한 리뷰 수에만 비례합니다.
+- 새 리뷰: 같은 날 리뷰 REVIEWS_PER_TRANSACTION 개씩 TransactWriteItems 하나로, 키가 없을 때만 쓰는 조건부 put
+  (attribute_not_exists)과 그 리뷰들의 집계를 그날 항목에 더하는 UpdateItem ADD 를 함께 실행
+  (리뷰가 저장되면 반드시 한 번 세고, 실패하면 리뷰도 집계도 남지 않음)
+- 이미 있던 키: 조건부 put 이 실패하며 돌려준 저장된 항목과 비교해, 평점이나 길이가 달라졌으면 차이만 더하는
+  트랜잭션으로 덮어쓰고(같은 날 같은 사용자의 새 리뷰), 같으면 BatchWriter 로 덮어씀(수집 재시도, 백필 이어하기)
+그래서 같은 리뷰를 몇 번 다시 저장해도 두 번 세지 않습니다. 트랜잭션 쓰기는 일반 쓰기의 2배 쓰기 용량을 사용합니다.
+rebuild_daily_stats 는 기존 데이터를 채우거나 집계가 어긋났을 때 AppReview 에서 다시 계산하는 오프라인 복구 도구입니다.
+"""
+import time
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from dynamodb_writer import (UNPROCESSED_BACKOFF_BASE, UNPROCESSED_MAX_RETRIES, BatchWriteMetrics, BatchWriter,
+                             dynamodb_client, unprocessed_backoff_delay, write_totals)
+
+DAILY_STATS_TABLE = 'AppReviewDaily'
+
+# TransactWriteItems 한 번에 쓰는 리뷰 수 (요청당 최대 100 항목 중 하나는 그날 집계 갱신)
+REVIEWS_PER_TRANSACTION = 99
+
+# AppReview 기본 키
+REVIEW_KEY_NAMES = ('app_id', 'date_user_id')
+
+# 리뷰 길이(글자 수) 구간: (구간 시작, 속성 이름), 마지막 구간은 끝이 없음
+LENGTH_BUCKETS = [
+    (0, 'length_0_49'),
+    (50, 'length_50_99'),
+    (100, 'length_100_199'),
+    (200, 'length_200_399'),
+    (400, 'length_400_plus'),
+]
+
+SCORES = range(1, 6)
+
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+
+def length_bucket(length):
+    """리뷰 길이가 속한 구간의 속성 이름"""
+    name = LENGTH_BUCKETS[0][1]
+    for start, bucket_name in LENGTH_BUCKETS:
+        if length >= start:
+            name = bucket_name
+    return name
+
+
+def review_day(date_user_id):
+    """정렬 키(YYYY-MM-DD#사용자)의 날짜"""
+    return date_user_id.split('#', 1)[0]
+
+
+def review_counts(item):
+    """리뷰 항목 하나가 그날 집계에 더하는 값 (속성 이름 -> 값)"""
+    score = int(item['score'])
+    length = len(item.get('content') or '')
+    return {'count': 1, 'score_sum': score, 'length_sum': length, f'score_{score}': 1,
+            f'length_sum_score_{score}': length, length_bucket(length): 1}
+
+
+def aggregate_reviews(items):
+    """AppReview 항목들을 날짜별 집계 값(속성 이름 -> 더할 값)으로 모읍니다 (같은 키의 항목은 마지막 것만)."""
+    unique_items = {item['date_user_id']: item for item in items}
+    daily = defaultdict(lambda: defaultdict(int))
+    for date_user_id, item in unique_items.items():
+        counts = daily[review_day(date_user_id)]
+        for name, value in review_counts(item).items():
+            counts[name] += value
+    return daily
+
+
+def counts_delta(item, old_item):
+    """같은 키의 저장된 리뷰 old_item 을 item 으로 덮어쓸 때 그날 집계에 더할 값 (0 인 값은 빼고, 없으면 빈 dict)"""
+    delta = defaultdict(int)
+    for name, value in review_counts(item).items():
+        delta[name] += value
+    for name, value in review_counts(old_item).items():
+        delta[name] -= value
+    return {name: value for name, value in delta.items() if value}
+
+
+def daily_stats_update(app_id, day, counts, now):
+    """그날 집계 항목에 counts 를 더하는 TransactWriteItems 의 Update 항목"""
+    names = {f"#a{i}": name for i, name in enumerate(counts)}
+    values = {f":v{i}": {'N': str(value)} for i, value in enumerate(counts.values())}
+    values[':now'] = {'S': now}
+    return {'Update': {
+        'TableName': DAILY_STATS_TABLE,
+        'Key': {'app_id': {'S': app_id}, 'day': {'S': day}},
+        'UpdateExpression': f"ADD {', '.join(f'#a{i} :v{i}' for i in range(len(counts)))} SET updated_at = :now",
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+    }}
+
+
+def review_put(table_name, item, condition, values=None):
+    """조건부 리뷰 put (조건이 틀리면 저장된 항목을 CancellationReasons 로 돌려받음)"""
+    put = {'TableName': table_name,
+           'Item': {name: _serializer.serialize(value) for name, value in item.items()},
+           'ConditionExpression': condition,
+           'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'}
+    if values:
+        put['ExpressionAttributeNames'] = {'#score': 'score', '#content': 'content'}
+        put['ExpressionAttributeValues'] = values
+    return {'Put': put}
+
+
+def transact(client, transact_items, metrics, max_retries, backoff_base, sleep):
+    """
+    트랜잭션을 실행합니다. 같은 집계 항목을 갱신하는 다른 트랜잭션과 충돌하면 백오프하며 다시 실행합니다.
+
+    Returns:
+        list: 성공하면 None, 리뷰 put 조건이 틀려 취소되면 CancellationReasons (항목 순서)
+    """
+    attempt = 0
+    while True:
+        metrics['transactions'] += 1
+        try:
+            client.transact_write_items(TransactItems=transact_items)
+            return None
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            reasons = e.response.get('CancellationReasons', [])
+            if any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons):
+                return reasons
+            if attempt >= max_retries:
+                raise
+            delay = unprocessed_backoff_delay(attempt, backoff_base)
+            print(f"Review transaction cancelled ({[reason.get('Code') for reason in reasons]}), "
+                  f"retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+            sleep(delay)
+            metrics['conflict_retries'] += 1
+            attempt += 1
+
+
+def insert_reviews(client, table_name, app_id, day, items, now, metrics, max_retries, backoff_base, sleep):
+    """
+    같은 날 리뷰들 중 키가 없는 것만 쓰고, 쓴 리뷰들의 집계를 같은 트랜잭션에서 그날 항목에 더합니다.
+
+    Returns:
+        list: 이미 있던 키의 (새 항목, 저장된 항목) 튜플 리스트
+    """
+    existing = []
+    while items:
+        transact_items = [review_put(table_name, item, 'attribute_not_exists(date_user_id)') for item in items]
+        transact_items.append(daily_stats_update(app_id, day, dict(aggregate_reviews(items)[day]), now))
+        reasons = transact(client, transact_items, metrics, max_retries, backoff_base, sleep)
+        if reasons is None:
+            metrics['inserted'] += len(items)
+            return existing
+        # 이미 있던 키를 빼고 나머지만 다시 씀
+        remaining = []
+        for item, reason in zip(items, reasons):
+            if reason.get('Code') == 'ConditionalCheckFailed':
+                existing.append((item, {name: _deserializer.deserialize(value)
+                                        for name, value in reason.get('Item', {}).items()}))
+            else:
+                remaining.append(item)
+        items = remaining
+    return existing
+
+
+def overwrite_review(client, table_name, app_id, item, old_item, now, metrics, max_retries, backoff_base, sleep):
+    """
+    저장된 리뷰 old_item 을 item 으로 덮어쓰며 집계 차이를 더합니다.
+    그 사이 다른 요청이 같은 키를 바꿨으면 돌려받은 항목으로 차이를 다시 계산합니다.
+
+    Returns:
+        bool: 트랜잭션으로 덮어썼으면 True, 집계 차이가 없어 덮어쓰지 않았으면 False (호출자가 BatchWriter 로 씀)
+    """
+    for _ in range(max_retries + 1):
+        if not old_item:
+            # 그 사이 삭제된 키는 새 리뷰로 씀 (그 사이 다시 생겼으면 그 항목과 비교)
+            existing = insert_reviews(client, table_name, app_id, review_day(item['date_user_id']), [item], now,
+                                      metrics, max_retries, backoff_base, sleep)
+            if not existing:
+                return True
+            old_item = existing[0][1]
+        delta = counts_delta(item, old_item)
+        if not delta:
+            return False
+        put = review_put(table_name, item, '#score = :score AND #content = :content',
+                         {':score': _serializer.serialize(old_item['score']),
+                          ':content': _serializer.serialize(old_item.get('content') or '')})
+        reasons = transact(client, [put, daily_stats_update(app_id, review_day(item['date_user_id']), delta, now)],
+                           metrics, max_retries, backoff_base, sleep)
+        if reasons is None:
+            metrics['updated'] += 1
+            return True
+        old_item = {name: _deserializer.deserialize(value) for name, value in reasons[0].get('Item', {}).items()}
+    raise RuntimeError(f"Review {item['date_user_id']} kept changing while it was being overwritten")
+
+
+def save_reviews_with_stats(table_name, app_id, items, client=None, max_retries=UNPROCESSED_MAX_RETRIES,
+                            backoff_base=UNPROCESSED_BACKOFF_BASE, sleep=time.sleep):
+    """
+    리뷰 항목들을 저장하고, 새로 추가된 키의 리뷰만(덮어쓴 키는 달라진 만큼만) 일별 집계에 더합니다.
+
+    Args:
+        table_name (str): 리뷰 테이블 (AppReview)
+        items (list): 저장할 리뷰 항목 (같은 키는 나중 항목만 저장)
+        client: 트랜잭션과 BatchWriter 에 사용할 클라이언트 (None 이면 공유 클라이언트)
+    Returns:
+        tuple: (저장한 항목 리스트 - 키마다 하나, 지표 dict)
+    """
+    start = time.perf_counter()
+    transact_client = client or dynamodb_client
+    unique_items = {}
+    for item in items:
+        unique_items.pop(item['date_user_id'], None)  # 다시 나온 키는 순서상 마지막으로
+        unique_items[item['date_user_id']] = item
+    metrics = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'transactions': 0, 'conflict_retries': 0}
+    retry_options = (max_retries, backoff_base, sleep)
+    now = datetime.now().isoformat()
+
+    by_day = defaultdict(list)
+    for date_user_id, item in unique_items.items():
+        by_day[review_day(date_user_id)].append(item)
+    existing = []
+    for day, day_items in by_day.items():
+        for offset in range(0, len(day_items), REVIEWS_PER_TRANSACTION):
+            existing += insert_reviews(transact_client, table_name, app_id, day,
+                                       day_items[offset:offset + REVIEWS_PER_TRANSACTION], now, metrics, *retry_options)
+
+    with BatchWriter(table_name, REVIEW_KEY_NAMES, client=client, max_retries=max_retries,
+                     backoff_base=backoff_base, sleep=sleep) as writer:
+        for item, old_item in existing:
+            if not overwrite_review(transact_client, table_name, app_id, item, old_item, now, metrics,
+                                    *retry_options):
+                writer.put(item)
+    metrics['unchanged'] = len(writer.written_items)
+    metrics['batch_write_requests'] = writer.metrics.requests
+    seconds = time.perf_counter() - start
+    metrics['seconds'] = round(seconds, 3)
+    # 트랜잭션으로 쓴 리뷰도 모듈 전체 쓰기 지표(수집 리포트의 dynamodb_writes)에 더함
+    write_totals.add(BatchWriteMetrics(items=metrics['inserted'] + metrics['updated'],
+                                       seconds=seconds - writer.metrics.seconds))
+    return list(unique_items.values()), metrics
+
+
+def rebuild_daily_stats(app_id, start_date=None, end_date=None):
+    """
+    AppReview 에서 start_date ~ end_date (YYYY-MM-DD, 양 끝 포함) 일별 집계를 다시 계산해 덮어씁니다.
+    기존 리뷰의 집계를 처음 채우거나 어긋난 집계를 바로잡는 오프라인 도구로, 그 기간에 리뷰를 저장하는 수집이 없을 때 실행합니다
+    (다시 계산하는 동안 더해진 집계는 덮어써짐).
+    리뷰가 하나도 없는 날짜의 기존 집계 항목은 그대로 둡니다.
+    """
+    # 순환 임포트를 피하기 위해 함수 안에서 임포트
+    from lambda_function import iter_app_reviews
+
+    items = iter_app_reviews(app_id, ['date_user_id', 'score', 'content'], start_date=start_date, end_date=end_date)
+    daily = aggregate_reviews(items)
+    now = datetime.now().isoformat()
+    with BatchWriter(DAILY_STATS_TABLE, ('app_id', 'day')) as writer:
+        for day, counts in daily.items():
+            writer.put({'app_id': app_id, 'day': day, 'updated_at': now,
+                        **{name: Decimal(value) for name, value in counts.items()}})
+    print(f"Rebuilt daily review stats (app_id={app_id}): {len(daily)} days")
+    return len(daily)
+
+
+def get_daily_stats(app_id, start_date=None, end_date=None, client=None):
+    """start_date ~ end_date (YYYY-MM-DD, 양 끝 포함) 일별 집계 항목을 날짜순으로 조회합니다."""
+    client = client or dynamodb_client
+    query_kwargs = {
+        'TableName': DAILY_STATS_TABLE,
+        'KeyConditionExpression': 'app_id = :app_id AND #day BETWEEN :start AND :end',
+        'ExpressionAttributeNames': {'#day': 'day'},
+        'ExpressionAttributeValues': {':app_id': {'S': app_id},
+                                      ':start': {'S': start_date or '0000-00-00'},
+                                      ':end': {'S': end_date or '9999-12-31'}},
+    }
+    items = []
+    while True:
+        response = client.query(**query_kwargs)
+        items.extend({name: _deserializer.deserialize(value) for name, value in item.items()}
+                     for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def summarize_stats(counts):
+    """집계 값(항목 하나 또는 합계)을 응답 형식으로 변환"""
+    count = int(counts.get('count', 0))
+    score_counts = {str(score): int(counts.get(f'score_{score}', 0)) for score in SCORES}
+    return {
+        'count': count,
+        'average_score': round(float(counts.get('score_sum', 0)) / count, 3) if count else None,
+        'average_length': round(float(counts.get('length_sum', 0)) / count, 1) if count else None,
+        'score_histogram': score_counts,
+        'average_length_by_score': {
+            str(score): (round(float(counts.get(f'length_sum_score_{score}', 0)) / score_counts[str(score)], 1)
+                         if score_counts[str(score)] else None)
+            for score in SCORES
+        },
+        'length_buckets': {name: int(counts.get(name, 0)) for _, name in LENGTH_BUCKETS},
+    }
+
+
+def get_app_stats(app_id, start_date=None, end_date=None):
+    """app_stats 응답: 일별 집계와 기간 전체 합계"""
+    days = get_daily_stats(app_id, start_date, end_date)
+    totals = defaultdict(int)
+    for item in days:
+        for name, value in item.items():
+            if name not in ('app_id', 'day', 'updated_at'):
+                totals[name] += int(value)
+    return {
+        'app_id': app_id,
+        'start_date': days[0]['day'] if days else start_date,
+        'end_date': days[-1]['day'] if days else end_date,
+        'days': [{'day': item['day'], **summarize_stats(item)} for item in days],
+        'totals': summarize_stats(totals),
+    }
@@ -0,0 +1,48 @@
+"""
+응답 JSON 직렬화 모듈
+
+json.dumps(..., default=str) 는 DynamoDB 가 돌려주는 Decimal 마다 파이썬 콜백을 호출하고 숫자를 문자열("5")로 바꿉니다.
+dumps 는 Decimal 을 정수/실수로 바꿔 숫자로 직렬화하고, orjson 이 설치되어 있으면 orjson 으로 직렬화합니다.
+- Decimal: 정수 값이면 int, 아니면 float
+- set (DynamoDB 숫자/문자열 집합): 정렬한 list
+- 그 밖의 타입(datetime 등)은 기존과 같이 str()
+- 한국어를 \\uXXXX 로 이스케이프하지 않고 UTF-8 그대로 출력 (두 백엔드의 출력이 같음)
+백엔드별 속도는 benchmark_serializer.py 로 측정합니다.
+"""
+import json
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+
+def decimal_to_number(value):
+    """Decimal 을 int(정수 값) 또는 float 로 변환"""
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _default(value):
+    """JSON 기본 타입이 아닌 값 변환 (직렬화 백엔드가 모르는 타입마다 호출)"""
+    if isinstance(value, Decimal):
+        return decimal_to_number(value)
+    if isinstance(value, (set, frozenset)):
+        try:
+            return sorted(value)
+        except TypeError:
+            return list(value)
+    return str(value)
+
+
+if orjson:
+    # datetime 은 orjson 의 ISO 형식 대신 기존 응답과 같은 str() 로 직렬화
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(value):
+        """응답 본문용 JSON 문자열"""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode('utf-8')
+else:
+    def dumps(value):
+        """응답 본문용 JSON 문자열"""
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':'))
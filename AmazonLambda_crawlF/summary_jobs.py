@@ -0,0 +1,268 @@
+"""
+비동기 요약 작업(summary job) 모듈
+
+summary 요청은 스토어 수집 → 샘플링 → LLM 호출(o4-mini)을 요청 안에서 모두 처리하므로 수십 초가 걸리고,
+API Gateway 제한 시간(29초)을 넘기기도 합니다. 작업 방식에서는
+- summary_submit: AppSummaryJob 테이블에 작업을 'queued' 로 저장하고 워커에 넘긴 뒤 job_id 를 바로 반환
+- 워커(run_summary_job): 수집 → 요약 생성(generate_and_save_summary) 후 결과를 작업 항목에 저장
+- summary_status: 작업 상태(status / stage)와 끝난 작업의 결과를 반환 (클라이언트가 poll_after_seconds 간격으로 조회)
+을 처리합니다.
+
+작업 상태: 'queued' → 'running' (stage: 'refreshing_reviews' → 'summarizing') → 'done' | 'failed'
+- 워커 전달: SUMMARY_WORKER_FUNCTION 환경 변수가 있으면 그 람다(핸들러 summary_jobs.summary_worker_handler)를
+  비동기(Event)로 호출하고, 없으면 로컬 실행용으로 같은 프로세스의 스레드 풀(SUMMARY_LOCAL_WORKERS 개)에서 실행
+  (람다는 응답 후 멈추므로 람다 안(AWS_LAMBDA_FUNCTION_NAME 이 있음)에서 SUMMARY_WORKER_FUNCTION 이 없으면
+  스레드 풀로 넘기지 않고 작업을 'failed' 로 끝낸 뒤 오류를 냄)
+- 비동기 호출은 같은 이벤트가 두 번 전달될 수 있으므로, 워커는 'queued' 인 작업만 'running' 으로 바꾼 뒤 실행
+- 워커가 제한 시간으로 종료되어 'running' 에 남은 작업은 SUMMARY_JOB_TIMEOUT_SECONDS 뒤부터 'failed' 로 보고
+- 워커 호출이 전달되지 않아 'queued' 에 남은 작업은 제출(submitted_at) 후 SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS 뒤부터
+  'failed' 로 보고하고, 그 뒤에 도착한 워커는 작업을 실행하지 않음
+- 작업 항목은 expires_at(TTL, epoch 초) 이후 자동 삭제
+"""
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import boto3
+from botocore.exceptions import ClientError
+
+from serializer import dumps
+
+SUMMARY_JOB_TABLE = 'AppSummaryJob'
+
+# 작업 항목 보관 기간 (초, TTL)
+SUMMARY_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+# 'running' 상태가 이보다 오래되면 워커가 중단된 것으로 보고 'failed' 로 보고 (초, 워커 람다 최대 실행 시간)
+SUMMARY_JOB_TIMEOUT_SECONDS = 900
+
+# 'queued' 상태가 제출 후 이보다 오래되면 워커 호출이 전달되지 않은 것으로 보고 'failed' 로 보고
+# (초, 비동기 호출은 보통 수 초 안에 시작되며 로컬 스레드 풀의 대기도 이보다 짧음)
+SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS = 600
+
+# 같은 요약을 다른 요청이 만들고 있을 때 워커가 기다리는 최대 시간 (초, summary_lock)
+SUMMARY_JOB_LOCK_WAIT_SECONDS = 600
+
+# 끝나지 않은 작업의 상태 조회 간격 권장값 (초)
+SUMMARY_JOB_POLL_SECONDS = 2
+
+# SUMMARY_WORKER_FUNCTION 이 없을 때 같은 프로세스에서 동시에 실행할 작업 수
+SUMMARY_LOCAL_WORKERS = 2
+
+SUMMARY_WORKER_FUNCTION = os.environ.get('SUMMARY_WORKER_FUNCTION')
+
+summary_job_table = boto3.resource('dynamodb').Table(SUMMARY_JOB_TABLE)
+
+_lambda_client = None
+_local_executor = None
+
+
+def new_summary_job(app_id, google_id, summary_mode='full'):
+    """처음 저장하는 작업 항목"""
+    now = datetime.now()
+    return {
+        'job_id': uuid.uuid4().hex,
+        'app_id': app_id,
+        'google_id': google_id,
+        'summary_mode': summary_mode,
+        'status': 'queued',
+        'stage': 'queued',
+        'submitted_at': now.isoformat(),
+        'expires_at': int(now.timestamp()) + SUMMARY_JOB_TTL_SECONDS,
+    }
+
+
+def submit_summary_job(app_id, google_id, summary_mode='full'):
+    """작업을 저장하고 워커에 넘긴 뒤 상태 응답을 반환합니다 (summary_mode: generate_and_save_summary 참고)."""
+    job = new_summary_job(app_id, google_id, summary_mode)
+    summary_job_table.put_item(Item=job)
+    try:
+        dispatch_summary_job(job['job_id'])
+    except Exception as e:
+        print(f"Error dispatching summary job (job_id={job['job_id']}): {str(e)}")
+        finish_summary_job(job['job_id'], 'failed', error=f"Failed to start the summary worker: {str(e)}")
+        raise e
+    print(f"Summary job submitted: job_id={job['job_id']}, app_id={app_id}")
+    return job_status(job)
+
+
+def dispatch_summary_job(job_id):
+    """워커 람다를 비동기로 호출하거나, 설정이 없으면 로컬 스레드 풀에서 실행 (람다 안에서는 오류)"""
+    global _lambda_client, _local_executor
+    if not SUMMARY_WORKER_FUNCTION and os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        # 람다는 응답을 보낸 뒤 멈추므로 스레드 풀에 넘긴 작업은 실행되지 않고 'queued' 에 남음
+        raise RuntimeError("SUMMARY_WORKER_FUNCTION is not set; summary jobs cannot run inside this Lambda.")
+    if SUMMARY_WORKER_FUNCTION:
+        _lambda_client = _lambda_client or boto3.client('lambda')
+        _lambda_client.invoke(
+            FunctionName=SUMMARY_WORKER_FUNCTION,
+            InvocationType='Event',
+            Payload=dumps({'job_id': job_id}).encode('utf-8')
+        )
+    else:
+        _local_executor = _local_executor or ThreadPoolExecutor(max_workers=SUMMARY_LOCAL_WORKERS)
+        _local_executor.submit(run_summary_job, job_id)
+
+
+def get_summary_job_item(job_id):
+    """저장된 작업 항목 (없으면 None)"""
+    return summary_job_table.get_item(Key={'job_id': job_id}, ConsistentRead=True).get('Item')
+
+
+def claim_summary_job(job_id):
+    """
+    'queued' 작업을 'running' 으로 바꾸고 항목을 반환
+    (이미 다른 워커가 가져갔거나, 대기 시간이 지나 'failed' 로 보고된 작업이면 None)
+    """
+    now = datetime.now()
+    try:
+        response = summary_job_table.update_item(
+            Key={'job_id': job_id},
+            UpdateExpression='SET #status = :running, stage = :stage, started_at = :now',
+            ConditionExpression='#status = :queued AND submitted_at >= :queue_deadline',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':running': 'running', ':queued': 'queued', ':stage': 'refreshing_reviews', ':now': now.isoformat(),
+                ':queue_deadline': (now - timedelta(seconds=SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS)).isoformat()},
+            ReturnValues='ALL_NEW'
+        )
+        return response['Attributes']
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+
+
+def set_summary_job_stage(job_id, stage):
+    """실행 중인 작업의 진행 단계 갱신"""
+    summary_job_table.update_item(
+        Key={'job_id': job_id},
+        UpdateExpression='SET stage = :stage',
+        ExpressionAttributeValues={':stage': stage}
+    )
+
+
+def finish_summary_job(job_id, status, result=None, error=None):
+    """작업을 'done' 또는 'failed' 로 끝냄"""
+    names = {'#status': 'status'}
+    values = {':status': status, ':stage': status, ':now': datetime.now().isoformat()}
+    update = 'SET #status = :status, stage = :stage, finished_at = :now'
+    if result is not None:
+        names['#result'] = 'result'
+        values[':result'] = result
+        update += ', #result = :result'
+    if error is not None:
+        names['#error'] = 'error'
+        values[':error'] = error
+        update += ', #error = :error'
+    summary_job_table.update_item(
+        Key={'job_id': job_id},
+        UpdateExpression=update,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+def run_summary_job(job_id):
+    """
+    작업 하나를 실행합니다 (수집 → 요약 생성 → 결과 저장).
+
+    Returns:
+        str: 끝난 상태 ('done' | 'failed'), 다른 워커가 이미 가져간 작업이면 None
+    """
+    # lambda_function 이 이 모듈을 임포트하므로 실행 시점에 임포트
+    import lambda_function as lf
+
+    job = claim_summary_job(job_id)
+    if job is None:
+        print(f"Summary job already claimed or expired in the queue: job_id={job_id}")
+        return None
+
+    app_id, google_id = job['app_id'], job['google_id']
+    try:
+        # 오늘 수집이 끝났고 같은 end_date 의 같은 종류 요약이 있으면 수집/요약 없이 끝냄
+        result = lf.get_cached_summary(app_id, job.get('summary_mode'))
+        if result:
+            finish_summary_job(job_id, 'done', result=result)
+            return 'done'
+
+        # 수집 여부 확인, 중복 확인, 요약 윈도우를 스냅샷 하나로 처리 (summary 요청과 같음)
+        snapshot = lf.ReviewSnapshot(app_id, lf.DEDUP_REVIEW_FIELDS + lf.SUMMARY_REVIEW_FIELDS)
+        lf.refresh_app_reviews(snapshot)
+
+        set_summary_job_stage(job_id, 'summarizing')
+        result = lf.generate_and_save_summary(app_id, google_id, snapshot=snapshot,
+                                              lock_wait_seconds=SUMMARY_JOB_LOCK_WAIT_SECONDS,
+                                              summary_mode=job.get('summary_mode'))
+        finish_summary_job(job_id, 'done', result=result)
+        return 'done'
+    except Exception as e:
+        print(f"Error running summary job (job_id={job_id}, app_id={app_id}): {str(e)}")
+        finish_summary_job(job_id, 'failed', error=str(e))
+        return 'failed'
+
+
+def seconds_between(start, end):
+    if not start or not end:
+        return None
+    return round((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds(), 3)
+
+
+def job_status(job):
+    """작업 항목을 summary_status 응답으로 변환"""
+    status, stage, error = job['status'], job.get('stage', job['status']), job.get('error')
+    now = datetime.now().isoformat()
+    if status == 'running' and seconds_between(job.get('started_at'), now) > SUMMARY_JOB_TIMEOUT_SECONDS:
+        status = stage = 'failed'
+        error = "Summary worker did not finish in time."
+    elif status == 'queued' and seconds_between(job['submitted_at'], now) > SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS:
+        status = stage = 'failed'
+        error = "Summary worker did not start in time."
+
+    response = {
+        'job_id': job['job_id'],
+        'app_id': job['app_id'],
+        'status': status,
+        'stage': stage,
+        'submitted_at': job['submitted_at'],
+        'started_at': job.get('started_at'),
+        'finished_at': job.get('finished_at'),
+        'queue_seconds': seconds_between(job['submitted_at'], job.get('started_at')),
+        'run_seconds': seconds_between(job.get('started_at'), job.get('finished_at')),
+    }
+    if status == 'done':
+        response['result'] = job.get('result')
+    elif status == 'failed':
+        response['error'] = error
+    else:
+        response['poll_after_seconds'] = SUMMARY_JOB_POLL_SECONDS
+    return response
+
+
+def get_summary_job(job_id):
+    """summary_status 응답 (작업이 없으면 None)"""
+    job = get_summary_job_item(job_id)
+    return job_status(job) if job else None
+
+
+def summary_worker_handler(event, context):
+    """요약 워커 람다 핸들러 (event: submit_summary_job 이 보낸 {'job_id': ...})"""
+    try:
+        job_id = (event or {}).get('job_id')
+        if not job_id:
+            return {
+                "statusCode": 400,
+                "body": dumps({"error": "job_id parameter is required."})
+            }
+        status = run_summary_job(job_id)
+        return {
+            "statusCode": 200,
+            "body": dumps({"job_id": job_id, "status": status})
+        }
+    except Exception as e:
+        print(f"Error occurred: {str(e)}, event={event}")
+        return {
+            "statusCode": 500,
+            "body": dumps({"error": str(e)})
+        }
@@ -0,0 +1,124 @@
+"""
+요약 생성 단일 실행(single-flight) 잠금 모듈
+
+여러 사용자가 같은 앱의 요약을 동시에 요청하면, 모든 요청이 AppSummary 에 결과가 저장되기 전에
+캐시 확인(get_summary_by_app_id_and_end_date)을 통과해 각자 LLM 을 호출합니다.
+(app_id, end_date) 마다 AppSummaryLock 테이블의 잠금 항목을 조건부 put 으로 하나의 요청(리더)만 가져가고,
+나머지 요청(팔로워)은 LLM 을 호출하지 않고 리더가 저장한 요약을 기다립니다.
+- 잠금 항목은 expires_at(epoch 초)까지 유효하며, 리더가 중단되어 풀지 못한 잠금은 만료 후 다른 요청이 가져감
+  (DynamoDB TTL 삭제는 늦을 수 있으므로 조건식에서 직접 만료를 확인)
+- 리더는 요약을 저장한 뒤 잠금을 풀고, 팔로워는 잠금이 풀리면 강한 일관성 읽기로 요약을 다시 확인
+  (요약이 없으면 리더가 실패한 것이므로 잠금을 가져가 직접 생성)
+- 팔로워가 기다리는 시간은 wait_seconds 로 제한하고, 넘으면 SummaryInProgressError
+  (동기 요청은 request_wait_seconds 로 크롤링에 쓴 시간을 빼고 API Gateway 제한 시간 안에 409 를 돌려줄 수 있을 만큼만 기다림)
+- map-reduce 요약은 샘플링 요약(full / auto)과 다른 요약이므로 잠금 키에 종류(kind)를 붙여 따로 잠금
+"""
+import time
+import uuid
+
+import boto3
+from botocore.exceptions import ClientError
+
+SUMMARY_LOCK_TABLE = 'AppSummaryLock'
+
+# 잠금 유효 시간 (초, LLM 호출이 끝나기에 충분한 시간)
+SUMMARY_LOCK_TTL_SECONDS = 300
+
+# 팔로워가 리더의 요약을 기다리는 최대 시간 (초, API Gateway 제한 시간 29초 안)
+SUMMARY_LOCK_WAIT_SECONDS = 25
+
+# 팔로워의 요약/잠금 확인 간격 (초)
+SUMMARY_LOCK_POLL_SECONDS = 0.5
+
+# API Gateway 통합 제한 시간 (초, 넘으면 클라이언트는 504 를 받음)
+API_GATEWAY_TIMEOUT_SECONDS = 29
+
+# 기다림이 끝난 뒤 응답(요약 또는 409)을 돌려주는 데 남겨 두는 시간 (초, 마지막 확인 간격 + 요약 조회 + 응답 인코딩)
+SUMMARY_LOCK_RESPONSE_MARGIN_SECONDS = 2
+
+summary_lock_table = boto3.resource('dynamodb').Table(SUMMARY_LOCK_TABLE)
+
+
+def request_wait_seconds(context, started_at, wait_seconds=SUMMARY_LOCK_WAIT_SECONDS):
+    """
+    동기 요청의 팔로워가 기다릴 수 있는 시간 (초)
+
+    Args:
+        context: Lambda context (get_remaining_time_in_millis, 없으면 None)
+        started_at (float): 요청을 처리하기 시작한 time.monotonic() 시각
+        wait_seconds (float): 기다림 상한
+    Returns:
+        float: API Gateway 제한 시간과 Lambda 남은 실행 시간 중 먼저 끝나는 쪽까지 남은 시간에서
+               SUMMARY_LOCK_RESPONSE_MARGIN_SECONDS 를 뺀 값 (0 ~ wait_seconds)
+    """
+    remaining = API_GATEWAY_TIMEOUT_SECONDS - (time.monotonic() - started_at)
+    if context is not None:
+        remaining = min(remaining, context.get_remaining_time_in_millis() / 1000)
+    return max(0.0, min(wait_seconds, remaining - SUMMARY_LOCK_RESPONSE_MARGIN_SECONDS))
+
+
+class SummaryInProgressError(Exception):
+    """다른 요청이 만드는 요약을 기다리다 시간이 다 되었을 때 발생"""
+
+
+class SummaryLock:
+    """(app_id, end_date) 요약 생성 잠금 (kind 가 있으면 (app_id, end_date, kind))"""
+
+    def __init__(self, app_id, end_date, ttl_seconds=SUMMARY_LOCK_TTL_SECONDS, kind=None):
+        self.key = f"{app_id}#{end_date}" + (f"#{kind}" if kind else "")
+        self.owner = uuid.uuid4().hex
+        self.ttl_seconds = ttl_seconds
+
+    def acquire(self):
+        """잠금을 가져오면 True (다른 요청의 유효한 잠금이 있으면 False)"""
+        now = int(time.time())
+        try:
+            summary_lock_table.put_item(
+                Item={'lock_key': self.key, 'owner': self.owner, 'expires_at': now + self.ttl_seconds},
+                ConditionExpression='attribute_not_exists(lock_key) OR expires_at < :now',
+                ExpressionAttributeValues={':now': now}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    def release(self):
+        """가져온 잠금 해제 (만료 후 다른 요청이 가져간 잠금은 그대로 둠)"""
+        try:
+            summary_lock_table.delete_item(
+                Key={'lock_key': self.key},
+                ConditionExpression='#owner = :owner',
+                ExpressionAttributeNames={'#owner': 'owner'},
+                ExpressionAttributeValues={':owner': self.owner}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error releasing summary lock (key={self.key}): {str(e)}")
+
+    def is_held(self):
+        """유효한(만료되지 않은) 잠금이 있는지"""
+        item = summary_lock_table.get_item(Key={'lock_key': self.key}, ConsistentRead=True).get('Item')
+        return item is not None and item['expires_at'] >= int(time.time())
+
+    def wait(self, lookup, deadline, poll_seconds=SUMMARY_LOCK_POLL_SECONDS, sleep=time.sleep):
+        """
+        리더가 요약을 저장하거나 잠금이 사라질 때까지 기다립니다.
+
+        Args:
+            lookup (callable): 저장된 요약을 강한 일관성 읽기로 찾는 함수 (없으면 None)
+            deadline (float): 기다림을 끝낼 time.monotonic() 시각
+        Returns:
+            dict: 리더가 저장한 요약, 요약 없이 잠금이 사라졌으면 None (잠금을 다시 가져가서 생성)
+        """
+        while True:
+            summary = lookup()
+            if summary:
+                return summary
+            if not self.is_held():
+                # 리더가 요약 저장 후 잠금을 푼 직후일 수 있으므로 한 번 더 확인
+                return lookup()
+            if time.monotonic() >= deadline:
+                raise SummaryInProgressError(f"Summary for {self.key} is still being generated. Try again shortly.")
+            sleep(poll_seconds)
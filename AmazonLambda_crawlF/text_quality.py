@@ -0,0 +1,432 @@
+"""
+리뷰 텍스트 품질 평가 모듈
+
+LLM.sampling 에서 사용하는 품질 점수를 계산합니다.
+- evaluate_text_quality: 텍스트 1개를 평가하는 기준(reference) 구현
+- batch_evaluate_text_quality: 여러 텍스트를 numpy 배열 연산으로 한 번에 평가하는 배치 구현
+
+두 함수는 항상 완전히 동일한 점수를 반환해야 합니다.
+점수 계산식을 수정할 때는 두 함수를 함께 수정하고 compare_quality_batch.py 로 일치 여부를 확인하세요.
+"""
+import os
+import math
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 품질 점수 계산식 버전 - 계산식이 바뀌면 올려서 DB 에 저장된 점수를 무효화
+QUALITY_SCORER_VERSION = 1
+
+# 배치 평가 시 한 번에 numpy 배열로 펼칠 텍스트 수 (메모리 사용량 제한용)
+BATCH_CHUNK_SIZE = 2048
+
+# 이보다 적은 텍스트는 프로세스 풀 시작 비용이 더 크므로 직렬로 평가
+# (1코어 환경에서 측정한 풀 시작/직렬화 비용으로 추정한 값 - 2워커 약 900개, 4워커 약 500개에서 병렬이 빨라짐.
+#  실제 손익분기점은 대상 머신에서 benchmark_parallel_scoring.py 로 측정해 조정)
+PARALLEL_MIN_TEXTS = 2000
+
+# 워커당 청크 수 - 텍스트 길이 편차로 인한 워커 간 부하 불균형 완화용
+PARALLEL_CHUNKS_PER_WORKER = 4
+
+# 바이그램 키 구성을 위한 비트 폭 (유니코드 코드포인트는 21비트 이내)
+_CODE_BITS = 21
+
+
+def evaluate_text_quality(text):
+    """
+    텍스트 1개의 품질 점수를 계산합니다.
+
+    Args:
+        text (str): 평가할 텍스트
+    Returns:
+        float: 0.05 ~ 1 사이의 품질 점수 (높을수록 좋은 품질)
+    """
+    # 기본 검사: 빈 텍스트나 너무 짧은 텍스트
+    if not text or len(text) < 10:
+        return 0.1
+
+    # 텍스트 길이 미리 계산 (반복 계산 방지)
+    text_length = len(text)
+
+    # 1. 단어 빈도 분석 최적화 - Collections 모듈 사용
+    words = text.split()
+    word_count = len(words)
+
+    if word_count < 3:
+        return 0.2  # 단어가 너무 적으면 낮은 점수
+
+    # 정규화된 단어 - 리스트 컴프리헨션 최적화
+    normalized_words = [w.lower().strip('.,!?;:') for w in words if w]
+    word_freq = Counter(w for w in normalized_words if w)
+
+    # 2. 문자 바이그램 분석 최적화
+    # Counter 객체 사용으로 딕셔너리 조회 연산 감소
+    char_bigrams = Counter()
+    total_bigrams = max(1, text_length - 1)  # 미리 계산
+
+    # 슬라이싱 최소화
+    for i in range(text_length - 1):
+        char_bigrams[text[i:i+2]] += 1
+
+    # 3-4. 빈도 분석 최적화
+    most_frequent_word_count = max(word_freq.values()) if word_freq else 0
+    most_frequent_word_ratio = most_frequent_word_count / word_count if word_count > 0 else 0
+
+    most_frequent_bigram_count = char_bigrams.most_common(1)[0][1] if char_bigrams else 0
+    most_frequent_bigram_ratio = most_frequent_bigram_count / total_bigrams
+
+    # 바이그램 엔트로피 계산 최적화 - 한 번의 루프로 처리
+    bigram_entropy = 0
+    for freq in char_bigrams.values():
+        prob = freq / total_bigrams
+        bigram_entropy -= prob * math.log2(prob)
+
+    # 정규화된 바이그램 엔트로피
+    max_bigram_entropy = math.log2(total_bigrams) if total_bigrams > 1 else 1
+    normalized_bigram_entropy = bigram_entropy / max_bigram_entropy if max_bigram_entropy > 0 else 0.5
+
+    # 5. 반복 패턴 감지 최적화
+    repeated_chars = 0
+    current_char = ''
+    current_run = 0
+
+    # 문자 반복 검사를 위한 단일 루프
+    for char in text:
+        if char == current_char:
+            current_run += 1
+            if current_run > 2:  # 3글자 이상 연속되면 카운트
+                repeated_chars += 1
+        else:
+            current_char = char
+            current_run = 1
+
+    repeated_char_ratio = repeated_chars / text_length if text_length > 0 else 0
+
+    # 6. 단어 다양성 (TTR)
+    unique_word_count = len(word_freq)
+    ttr = unique_word_count / word_count if word_count > 0 else 0
+
+    # 7. 연속된 단어 반복 패턴 감지 최적화
+    word_pattern_repetition = 0
+
+    # 단어 쌍 패턴 감지 최적화 - 임계값 3 이상만 세기
+    if len(normalized_words) >= 2:
+        # 단어 쌍 미리 생성하여 Counter로 한 번에 처리
+        word_pairs = [f"{normalized_words[i]}-{normalized_words[i+1]}"
+                      for i in range(len(normalized_words) - 1)]
+        pair_counts = Counter(word_pairs)
+
+        # 3회 이상 반복되는 쌍만 확인
+        word_pattern_repetition = sum(0.2 for count in pair_counts.values() if count >= 3)
+
+    # 8. 문장 구조 검사 최적화 - 정규식 대신 문자열 메서드 사용
+    # 마침표, 느낌표, 물음표 세기
+    sentence_count = text.count('.') + text.count('!') + text.count('?')
+    punctuation_score = 0.5
+
+    if word_count > 20:
+        if sentence_count == 0:
+            punctuation_score = 0.2
+        else:
+            avg_words_per_sentence = word_count / sentence_count
+            if avg_words_per_sentence > 30:
+                punctuation_score = 0.3
+            elif avg_words_per_sentence < 3:
+                punctuation_score = 0.4
+            else:
+                punctuation_score = 0.8
+
+    # 9. 문자 다양성 비율 최적화 - 공백 제거 텍스트 미리 계산
+    text_no_spaces = text.replace(" ", "")
+    total_chars = len(text_no_spaces)
+    unique_chars = len(set(text_no_spaces))
+    char_diversity = unique_chars / total_chars if total_chars > 0 else 0
+
+    # -------- 반복 기반 패널티 계산 --------
+    repetition_penalty = 0
+
+    # 조건부 패널티 계산 - 최적화된 방식으로 한 번에 계산
+    if most_frequent_word_ratio > 0.1:
+        repetition_penalty += pow(most_frequent_word_ratio, 1.5) * 2.0
+
+    if most_frequent_bigram_ratio > 0.08:
+        repetition_penalty += pow(most_frequent_bigram_ratio, 1.5) * 2.5
+
+    if char_diversity < 0.2:
+        repetition_penalty += (0.2 - char_diversity) * 3.0
+
+    repetition_penalty += repeated_char_ratio * 2.0
+    repetition_penalty += word_pattern_repetition
+
+    # -------- 최종 점수 계산 --------
+    base_quality_score = (
+        0.3 * ttr +
+        0.2 * normalized_bigram_entropy +
+        0.2 * punctuation_score +
+        0.1 * char_diversity
+    )
+
+    # 패널티 적용 로직 단순화
+    if repetition_penalty > 1.0:
+        final_score = max(0.05, 0.1 - (repetition_penalty - 1.0) * 0.05)
+    else:
+        final_score = max(0.05, base_quality_score - repetition_penalty)
+
+    return final_score
+
+
+def batch_evaluate_text_quality(text_list):
+    """
+    여러 텍스트의 품질 점수를 한 번에 계산합니다.
+
+    문자 단위 분석(바이그램 빈도/엔트로피, 연속 문자 반복, 문자 다양성)을
+    텍스트 전체를 이어 붙인 코드포인트 배열 위의 numpy 연산으로 처리합니다.
+    부동소수점 연산 순서까지 evaluate_text_quality 와 동일하게 맞추어 점수가 비트 단위로 일치합니다.
+
+    Args:
+        text_list (list): 텍스트 문자열들의 리스트
+    Returns:
+        list: text_list 와 같은 순서의 품질 점수 리스트
+    """
+    scores = []
+    for start in range(0, len(text_list), BATCH_CHUNK_SIZE):
+        scores.extend(_evaluate_chunk(text_list[start:start + BATCH_CHUNK_SIZE]))
+    return scores
+
+
+def parallel_evaluate_text_quality(text_list, max_workers=None, chunk_size=None, min_texts=PARALLEL_MIN_TEXTS):
+    """
+    text_list 를 청크로 나누어 ProcessPoolExecutor 에서 batch_evaluate_text_quality 로 평가합니다.
+
+    전체 리뷰 이력을 오프라인으로 처리할 때를 위한 것입니다.
+    executor.map 은 입력 순서대로 결과를 돌려주므로 병합 결과는 항상 직렬 평가와 같습니다.
+    텍스트 수가 min_texts 미만이거나 워커가 1개 이하이면 직렬로 평가하고,
+    프로세스 풀을 만들 수 없는 환경(예: /dev/shm 이 없는 AWS Lambda)에서도 직렬 평가로 대체합니다.
+
+    Args:
+        text_list (list): 텍스트 문자열들의 리스트
+        max_workers (int): 워커 프로세스 수 (None 이면 CPU 수)
+        chunk_size (int): 워커에 한 번에 넘길 텍스트 수 (None 이면 len(text_list) / workers 에서 계산해
+                          워커당 PARALLEL_CHUNKS_PER_WORKER 개가 되도록 함 - 청크 수가 항상 워커 수 이상)
+        min_texts (int): 병렬 평가를 시작하는 최소 텍스트 수
+    Returns:
+        list: text_list 와 같은 순서의 품질 점수 리스트
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2 or len(text_list) < min_texts:
+        return batch_evaluate_text_quality(text_list)
+
+    if chunk_size is None:
+        # BATCH_CHUNK_SIZE 는 워커 안의 배열 크기 제한이므로 청크 크기 하한으로 쓰지 않음
+        # (하한이 있으면 min_texts 바로 위 입력이 청크 하나가 되어 병렬 없이 풀만 시작됨)
+        chunk_size = -(-len(text_list) // (workers * PARALLEL_CHUNKS_PER_WORKER))
+    chunks = [text_list[start:start + chunk_size] for start in range(0, len(text_list), chunk_size)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            scores = []
+            for chunk_scores in executor.map(batch_evaluate_text_quality, chunks):
+                scores.extend(chunk_scores)
+            return scores
+    except (OSError, NotImplementedError) as e:
+        print(f"Process pool unavailable, falling back to serial quality scoring: {str(e)}")
+        return batch_evaluate_text_quality(text_list)
+
+
+def content_hash(text):
+    """저장된 품질 점수가 어떤 내용으로 계산되었는지 확인하기 위한 텍스트 해시"""
+    return hashlib.sha256((text or '').encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def fill_missing_quality_scores(text_list, quality_scores, max_workers=1):
+    """
+    미리 계산된 품질 점수 중 비어 있는(None) 항목만 새로 계산합니다.
+
+    점수는 텍스트별로 독립적으로 계산되므로 일부만 다시 계산해도 전체를 계산한 결과와 같습니다.
+
+    Args:
+        text_list (list): 텍스트 문자열들의 리스트
+        quality_scores (list): text_list 와 같은 순서의 저장된 점수 (없으면 None)
+        max_workers (int): 품질 평가 워커 프로세스 수
+    Returns:
+        list: 모든 항목이 채워진 품질 점수 리스트
+    """
+    missing = [i for i, score in enumerate(quality_scores) if score is None]
+    if not missing:
+        return list(quality_scores)
+
+    computed = parallel_evaluate_text_quality([text_list[i] for i in missing], max_workers=max_workers)
+    filled = list(quality_scores)
+    for i, score in zip(missing, computed):
+        filled[i] = score
+    return filled
+
+
+def _evaluate_chunk(texts):
+    """BATCH_CHUNK_SIZE 이하의 텍스트 묶음을 평가합니다."""
+    scores = [None] * len(texts)
+    pending_positions = []
+    pending_texts = []
+    pending_words = []
+
+    # 조기 반환 조건은 텍스트별로 먼저 처리
+    for position, text in enumerate(texts):
+        if not text or len(text) < 10:
+            scores[position] = 0.1
+            continue
+        words = text.split()
+        if len(words) < 3:
+            scores[position] = 0.2
+            continue
+        pending_positions.append(position)
+        pending_texts.append(text)
+        pending_words.append(words)
+
+    if not pending_texts:
+        return scores
+
+    char_features = _char_features(pending_texts)
+    for position, text, words, features in zip(pending_positions, pending_texts, pending_words, char_features):
+        scores[position] = _score_from_features(text, words, *features)
+
+    return scores
+
+
+def _char_features(texts):
+    """
+    텍스트별 문자 단위 특징을 numpy 로 계산합니다.
+
+    Returns:
+        list: 텍스트별 (최빈 바이그램 수, 바이그램 엔트로피, 반복 문자 수, 공백 제외 문자 수, 고유 문자 수)
+    """
+    n = len(texts)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.int64)
+    total_length = codes.size
+
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    ends = starts + lengths
+    text_ids = np.repeat(np.arange(n, dtype=np.int64), lengths)
+
+    # ---- 문자 바이그램: (텍스트 번호, 앞 글자, 뒷 글자)를 하나의 정수 키로 묶음 ----
+    has_next = np.ones(total_length, dtype=bool)
+    has_next[ends - 1] = False
+    positions = np.flatnonzero(has_next)
+    keys = (text_ids[positions] << (2 * _CODE_BITS)) | (codes[positions] << _CODE_BITS) | codes[positions + 1]
+    unique_keys, first_index, counts = np.unique(keys, return_index=True, return_counts=True)
+
+    # Counter 의 삽입 순서(첫 등장 순서)로 정렬 - 텍스트 순서로도 자동으로 묶임
+    order = np.argsort(first_index, kind='stable')
+    counts = counts[order]
+    bigram_text = unique_keys[order] >> (2 * _CODE_BITS)
+
+    total_bigrams = np.maximum(1, lengths - 1)
+    max_bigram = np.zeros(n, dtype=np.int64)
+    np.maximum.at(max_bigram, bigram_text, counts)
+
+    # 엔트로피 항: 확률값이 같은 항은 log2 를 한 번만 계산 (math.log2 와 결과를 맞추기 위함)
+    probs = counts / total_bigrams[bigram_text]
+    unique_probs, inverse = np.unique(probs, return_inverse=True)
+    logs = np.array([math.log2(p) for p in unique_probs.tolist()])
+    terms = probs * logs[inverse.ravel()]
+
+    # 텍스트별로 첫 등장 순서대로 누적 (기준 구현과 같은 덧셈 순서)
+    segment_start = np.searchsorted(bigram_text, np.arange(n))
+    ranks = np.arange(bigram_text.size) - segment_start[bigram_text]
+    rank_order = np.argsort(ranks, kind='stable')
+    rank_bounds = np.searchsorted(ranks[rank_order], np.arange(ranks.max() + 2))
+    entropy = np.zeros(n)
+    for rank in range(ranks.max() + 1):
+        selected = rank_order[rank_bounds[rank]:rank_bounds[rank + 1]]
+        entropy[bigram_text[selected]] -= terms[selected]
+
+    # ---- 연속 문자 반복: 길이 k 인 run 은 max(0, k - 2) 만큼 기여 ----
+    run_start = np.ones(total_length, dtype=bool)
+    run_start[1:] = codes[1:] != codes[:-1]
+    run_start[starts] = True
+    run_positions = np.flatnonzero(run_start)
+    run_lengths = np.diff(np.append(run_positions, total_length))
+    repeated = np.bincount(text_ids[run_positions], weights=np.maximum(run_lengths - 2, 0), minlength=n)
+
+    # ---- 문자 다양성: 공백(' ')만 제외 ----
+    non_space = codes != 32
+    total_chars = np.bincount(text_ids[non_space], minlength=n)
+    unique_chars = np.unique((text_ids[non_space] << _CODE_BITS) | codes[non_space])
+    unique_char_counts = np.bincount(unique_chars >> _CODE_BITS, minlength=n)
+
+    return list(zip(
+        max_bigram.tolist(),
+        entropy.tolist(),
+        repeated.astype(np.int64).tolist(),
+        total_chars.tolist(),
+        unique_char_counts.tolist(),
+    ))
+
+
+def _score_from_features(text, words, most_frequent_bigram_count, bigram_entropy,
+                         repeated_chars, total_chars, unique_chars):
+    """문자 단위 특징과 단어 단위 분석을 결합하여 최종 점수를 계산합니다 (evaluate_text_quality 와 동일한 식)."""
+    text_length = len(text)
+    word_count = len(words)
+    total_bigrams = max(1, text_length - 1)
+
+    # 소문자 변환은 텍스트 전체에 한 번만 적용 (단어별 변환과 결과 동일)
+    normalized_words = [w.strip('.,!?;:') for w in text.lower().split()]
+    word_freq = Counter(filter(None, normalized_words))
+
+    most_frequent_word_count = max(word_freq.values()) if word_freq else 0
+    most_frequent_word_ratio = most_frequent_word_count / word_count if word_count > 0 else 0
+    most_frequent_bigram_ratio = most_frequent_bigram_count / total_bigrams
+
+    max_bigram_entropy = math.log2(total_bigrams) if total_bigrams > 1 else 1
+    normalized_bigram_entropy = bigram_entropy / max_bigram_entropy if max_bigram_entropy > 0 else 0.5
+
+    repeated_char_ratio = repeated_chars / text_length if text_length > 0 else 0
+
+    unique_word_count = len(word_freq)
+    ttr = unique_word_count / word_count if word_count > 0 else 0
+
+    word_pattern_repetition = 0
+    if len(normalized_words) >= 2:
+        pair_counts = Counter(map('{}-{}'.format, normalized_words, normalized_words[1:]))
+        word_pattern_repetition = sum(0.2 for count in pair_counts.values() if count >= 3)
+
+    sentence_count = text.count('.') + text.count('!') + text.count('?')
+    punctuation_score = 0.5
+    if word_count > 20:
+        if sentence_count == 0:
+            punctuation_score = 0.2
+        else:
+            avg_words_per_sentence = word_count / sentence_count
+            if avg_words_per_sentence > 30:
+                punctuation_score = 0.3
+            elif avg_words_per_sentence < 3:
+                punctuation_score = 0.4
+            else:
+                punctuation_score = 0.8
+
+    char_diversity = unique_chars / total_chars if total_chars > 0 else 0
+
+    repetition_penalty = 0
+    if most_frequent_word_ratio > 0.1:
+        repetition_penalty += pow(most_frequent_word_ratio, 1.5) * 2.0
+    if most_frequent_bigram_ratio > 0.08:
+        repetition_penalty += pow(most_frequent_bigram_ratio, 1.5) * 2.5
+    if char_diversity < 0.2:
+        repetition_penalty += (0.2 - char_diversity) * 3.0
+    repetition_penalty += repeated_char_ratio * 2.0
+    repetition_penalty += word_pattern_repetition
+
+    base_quality_score = (
+        0.3 * ttr +
+        0.2 * normalized_bigram_entropy +
+        0.2 * punctuation_score +
+        0.1 * char_diversity
+    )
+
+    if repetition_penalty > 1.0:
+        return max(0.05, 0.1 - (repetition_penalty - 1.0) * 0.05)
+    return max(0.05, base_quality_score - repetition_penalty)
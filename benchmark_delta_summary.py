@@ -0,0 +1,125 @@
+"""
+증분(delta) 요약 입력 크기 / LLM 시간 측정 스크립트
+
+moto 로 만든 DynamoDB 와 스텁 LLM 으로, 40일치 리뷰가 쌓인 앱에 날마다 새 리뷰가 추가되는 DAILY_NEW_REVIEWS 일 동안
+매일 요약을 만들면서 summary_mode 'full' 과 'auto' 를 비교합니다.
+스텁 LLM 은 입력 길이에 비례해 기다리며 (LLM_BASE_SECONDS + 1000자당 LLM_SECONDS_PER_KCHAR), 입력 문자 수를 기록합니다.
+날짜별 요약 방식과 이유, 새 리뷰 수, LLM 입력 문자 수, LLM 시간을 출력하고 다음을 확인합니다 (다르면 종료 코드 1).
+- 새 리뷰가 적은 날은 증분 요약, 새 리뷰가 많은 날(급증)과 증분이 DELTA_MAX_DEPTH 번 이어진 뒤에는 전체 요약
+- 증분 요약 입력에는 직전 요약과 직전 end_date 이후 리뷰만 들어감
+- 'auto' 의 LLM 입력 문자 수 합계가 'full' 보다 작음
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import create_tables
+
+HISTORY_DAYS = 40
+HISTORY_REVIEWS = 1500
+# 날마다 추가되는 새 리뷰 수 (네 번째 날은 급증)
+DAILY_NEW_REVIEWS = [30, 25, 40, 400, 20, 35, 30, 25, 20, 30, 25, 30]
+LLM_BASE_SECONDS = 0.2
+LLM_SECONDS_PER_KCHAR = 0.05
+# 스텁 보고서 길이 (실제 o4-mini 보고서 정도, 증분 요약 입력에 그대로 들어감)
+STUB_SUMMARY_CHARS = 3000
+
+
+def make_reviews(count, first_day, days, seed):
+    rng = random.Random(seed)
+    return [{'content': text, 'score': rng.randint(1, 5),
+             'date': (first_day + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))).isoformat()}
+            for text in generate_reviews(count, seed=seed)]
+
+
+def run_benchmark():
+    import lambda_function as lf
+    from delta_summary import DELTA_MAX_DEPTH
+    from llm import LLM
+
+    llm_inputs = []
+
+    class StubLLM(LLM):
+        """입력 길이에 비례해 기다리고 STUB_SUMMARY_CHARS 자 보고서를 돌려주는 스텁"""
+
+        def __init__(self):
+            pass
+
+        def __call__(self, prompt, text):
+            chars = len(prompt) + len(text)
+            seconds = LLM_BASE_SECONDS + chars / 1000 * LLM_SECONDS_PER_KCHAR
+            llm_inputs.append((chars, seconds, text))
+            time.sleep(seconds)
+            return f"## 보고서 ({chars} chars)\n" + "- 인사이트\n" * (STUB_SUMMARY_CHARS // 7)
+
+    create_tables()
+    lf.LLM = StubLLM
+    first_day = datetime(2026, 8, 1)
+    history = make_reviews(HISTORY_REVIEWS, first_day, HISTORY_DAYS, seed=40)
+    daily = [make_reviews(count, first_day + timedelta(days=HISTORY_DAYS + i), 1, seed=41 + i)
+             for i, count in enumerate(DAILY_NEW_REVIEWS)]
+
+    results = {}
+    for mode in ('full', 'auto'):
+        app_id = f"check.delta.{mode}"
+        reviews = list(history)
+        rows = []
+        lf.generate_and_save_summary(app_id, 'check-user', reviews=reviews, summary_mode=mode)
+        for day, new_reviews in enumerate(daily, 1):
+            reviews = reviews + new_reviews
+            llm_inputs.clear()
+            result = lf.generate_and_save_summary(app_id, 'check-user', reviews=reviews, summary_mode=mode)
+            item = lf.get_latest_summary(app_id)
+            chars, seconds, text = llm_inputs[0]
+            rows.append((day, len(new_reviews), item, chars, seconds, text, result))
+        results[mode] = rows
+
+    print(f"{'day':>3} {'new':>4} | {'full chars':>10} {'full s':>7} | {'auto mode':<9} {'reason':<24} "
+          f"{'depth':>5} {'chars':>7} {'s':>6}")
+    ok = True
+    for (day, new_count, _, full_chars, full_seconds, _, _), (_, _, item, chars, seconds, text, result) in \
+            zip(results['full'], results['auto']):
+        print(f"{day:>3} {new_count:>4} | {full_chars:>10} {full_seconds:>7.2f} | {item['summary_mode']:<9} "
+              f"{item['summary_reason']:<24} "
+              f"{int(item['delta_depth']):>5} {chars:>7} {seconds:>6.2f}")
+        if item['summary_mode'] == 'delta':
+            base = lf.get_summary_by_app_id_and_end_date(item['app_id'], item['base_end_date'])
+            # 직전 요약 + 직전 end_date 이후 리뷰만
+            ok = ok and text.startswith(f"[기존 보고서]\n{base['summary']}") and \
+                result['date_range'].startswith(base['start_date']) and \
+                int(item['delta_review_count']) <= new_count
+
+    modes = [item['summary_mode'] for _, _, item, *_ in results['auto']]
+    spike = DAILY_NEW_REVIEWS.index(max(DAILY_NEW_REVIEWS))
+    expected = []
+    depth = 0
+    for day in range(len(DAILY_NEW_REVIEWS)):
+        depth = 0 if day == spike or depth == DELTA_MAX_DEPTH else depth + 1
+        expected.append('full' if depth == 0 else 'delta')
+    ok = ok and modes == expected
+
+    full_total, auto_total = (sum(row[3] for row in results[mode]) for mode in ('full', 'auto'))
+    full_seconds, auto_seconds = (sum(row[4] for row in results[mode]) for mode in ('full', 'auto'))
+    print(f"total LLM input chars: full {full_total}, auto {auto_total} ({auto_total / full_total:.0%}); "
+          f"LLM seconds: full {full_seconds:.2f}, auto {auto_seconds:.2f}")
+    ok = ok and auto_total < full_total
+    print(f"delta/full schedule {modes} as expected, delta inputs hold only the base summary and newer reviews: {ok}")
+    return ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,130 @@
+"""
+다양성 기반 탐욕 선택 벤치마크 스크립트
+
+기존 llm.py 의 선택 루프(매 라운드마다 누적 선택 텍스트 전체와 jaccard_similarity 계산)와
+diversity.greedy_select(후보 토큰 집합 1회 생성 + 교집합/합집합 크기 점진 갱신)를
+후보 100 / 1,000 / 10,000 개에서 비교합니다.
+LARGE_COUNTS 에서는 기존 알고리즘 없이 greedy_select 만 실행해 후보 수와 길이 예산(SamplingConfig.max_length)을
+크게 늘렸을 때의 확장성을 확인합니다.
+선택 결과가 하나라도 다르면 종료 코드 1 로 종료합니다.
+"""
+
+import os
+import sys
+import time
+import random
+
+# diversity 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from diversity import jaccard_similarity, greedy_select
+from text_quality import batch_evaluate_text_quality
+
+CANDIDATE_COUNTS = [100, 1000, 10000]
+LARGE_COUNTS = [100000]
+
+
+# 기존 선택 알고리즘 (llm.py 에서 추출)
+def greedy_select_reference(text_list, quality_scores, candidate_indices, max_length=5000):
+    candidate_indices = list(candidate_indices)
+    selected_indices = []
+    selected_diversity_scores = []
+    total_length = 0
+
+    best_first_index = -1
+    best_first_score = -1
+    for index in candidate_indices:
+        quality_score = quality_scores[index]
+        length_score = min(1, len(text_list[index]) / 500)
+        combined_score = quality_score * 0.7 + length_score * 0.3
+        if combined_score > best_first_score:
+            best_first_score = combined_score
+            best_first_index = index
+
+    selected_indices.append(best_first_index)
+    selected_diversity_scores.append(0)
+    total_length += len(text_list[best_first_index])
+    candidate_indices.remove(best_first_index)
+
+    accumulated_selected_text = text_list[selected_indices[0]]
+
+    while candidate_indices and total_length < max_length:
+        best_index = -1
+        best_combined_score = -1
+        best_diversity_score = -1
+
+        for index in candidate_indices[:]:
+            text = text_list[index]
+            if total_length + len(text) > max_length:
+                continue
+            similarity = jaccard_similarity(text, accumulated_selected_text)
+            diversity_score = 1 - similarity
+            combined_score = quality_scores[index] * 0.1 + diversity_score * 0.9
+            if combined_score > best_combined_score:
+                best_combined_score = combined_score
+                best_index = index
+                best_diversity_score = diversity_score
+
+        if best_index == -1:
+            break
+
+        selected_indices.append(best_index)
+        selected_diversity_scores.append(best_diversity_score)
+        total_length += len(text_list[best_index])
+        accumulated_selected_text += " " + text_list[best_index]
+        candidate_indices.remove(best_index)
+
+    return selected_indices, selected_diversity_scores
+
+
+def generate_reviews(count, seed=0):
+    """단어 빈도가 Zipf 분포를 따르는 50~400자 리뷰 생성 (리뷰 간 단어 중복이 실제처럼 발생)"""
+    rng = random.Random(seed)
+    syllables = "가나다라마바사아자차카타파하앱리뷰좋별로업데트오류느려요빠른결제광고화면"
+    vocabulary = [''.join(rng.choice(syllables) for _ in range(rng.randint(1, 4))) for _ in range(3000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    reviews = []
+    while len(reviews) < count:
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(15, 90))
+        text = ' '.join(words) + rng.choice(['.', '!', '?', ''])
+        if 50 < len(text) < 400:
+            reviews.append(text)
+    return reviews
+
+
+def time_call(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark():
+    all_identical = True
+    print(f"{'candidates':>10} {'budget':>7} {'reference(s)':>13} {'incremental(s)':>15} {'selected':>9}")
+    cases = [(count, 5000, True) for count in CANDIDATE_COUNTS]
+    cases += [(count, budget, False) for count in LARGE_COUNTS for budget in (5000, 50000)]
+    for count, budget, with_reference in cases:
+        text_list = generate_reviews(count, seed=count)
+        quality_scores = batch_evaluate_text_quality(text_list)
+        candidate_indices = sorted(range(count), key=lambda i: quality_scores[i], reverse=True)
+
+        incremental, incremental_time = time_call(greedy_select, text_list, quality_scores,
+                                                  candidate_indices, budget)
+        identical = True
+        reference_column = f"{'-':>13}"
+        if with_reference:
+            reference, reference_time = time_call(greedy_select_reference, text_list, quality_scores,
+                                                  candidate_indices, budget)
+            identical = reference == incremental
+            reference_column = f"{reference_time:>13.3f}"
+
+        all_identical = all_identical and identical
+        print(f"{count:>10} {budget:>7} {reference_column} {incremental_time:>15.3f} "
+              f"{len(incremental[0]):>9}{'' if identical else '  MISMATCH'}")
+
+    return all_identical
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
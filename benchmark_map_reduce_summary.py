@@ -0,0 +1,236 @@
+"""
+map-reduce 요약 처리량 / 토큰 사용량 측정 스크립트
+
+로컬 스텁 LLM 서버(OpenAI 호환 /v1/chat/completions)를 띄우고 OPENAI_BASE_URL 로 연결한 실제 LLM 클라이언트로
+REVIEW_COUNT 개 리뷰를 map_reduce_summary 로 요약하며, 동시 호출 상한(max_in_flight)별로 다음을 출력합니다.
+- LLM 호출 수, 청크 수, 단계 수, 소요 시간, 처리량(리뷰/초)
+- 클라이언트(LLM.usage)와 서버가 센 입력/출력 토큰 수, 서버에서 관측한 동시 요청 수 최댓값
+스텁 서버는 입력 길이에 비례해 기다리고(LLM_BASE_SECONDS + 1000자당 LLM_SECONDS_PER_KCHAR),
+CHARS_PER_TOKEN 자를 토큰 하나로 세어 usage 를 돌려줍니다.
+전체 요약(최근 500개 윈도우 샘플링)과 요약에 반영된 리뷰 수를 비교하고, moto 로 만든 DynamoDB 에서
+summary_mode 'map_reduce' 요약이 저장되는지 확인합니다.
+다음 중 하나라도 다르면 종료 코드 1 로 종료합니다.
+- 서버의 동시 요청 수가 max_in_flight 이하, 클라이언트와 서버의 토큰 수가 같음
+- max_in_flight 에 관계없이 같은 보고서, 마지막 호출은 최종 프롬프트(PROMPT)
+- 저장된 요약 항목의 summary_mode / review_count / 토큰 수
+- 같은 날 다른 종류 요약(full)이 있어도 map_reduce 요청은 캐시로 답하지 않고 다시 생성하며(반대도 같음),
+  full 요약의 잠금을 다른 요청이 잡고 있어도 기다리지 않음, 같은 종류 요청은 캐시로 답함
+- 동기 summary 요청의 summary_mode 'map_reduce' 는 400
+- group_summaries 의 여러 개짜리 묶음은 reduce 입력이 한도 이하, 잘못된 MAP_REDUCE_MAX_IN_FLIGHT 는 기본값으로 처리
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import create_tables
+
+REVIEW_COUNT = 5000
+REVIEW_DAYS = 120
+MAX_IN_FLIGHT = [1, 4, 8, 16]
+LLM_BASE_SECONDS = 0.3
+LLM_SECONDS_PER_KCHAR = 0.02
+CHARS_PER_TOKEN = 1.5
+# 스텁 응답 길이 (map 부분 요약 / reduce 부분 요약 / 최종 보고서)
+MAP_OUTPUT_CHARS = 1200
+REDUCE_OUTPUT_CHARS = 1500
+FINAL_OUTPUT_CHARS = 3000
+
+
+class StubLLMServer:
+    """입력 길이에 비례해 기다리고 고정 길이 응답과 usage 를 돌려주는 OpenAI 호환 스텁 서버"""
+
+    def __init__(self, map_prompt, reduce_prompt):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                system, user = (message['content'] for message in request['messages'])
+                body = json.dumps(server.complete(system, user)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.map_prompt = map_prompt
+        self.reduce_prompt = reduce_prompt
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def reset(self):
+        with self.lock:
+            self.max_in_flight = 0
+            self.calls = []
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def complete(self, system, user):
+        chars = len(system) + len(user)
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(LLM_BASE_SECONDS + chars / 1000 * LLM_SECONDS_PER_KCHAR)
+        if system == self.map_prompt:
+            stage, length = 'map', MAP_OUTPUT_CHARS
+        elif system == self.reduce_prompt:
+            stage, length = 'reduce', REDUCE_OUTPUT_CHARS
+        else:
+            stage, length = 'final', FINAL_OUTPUT_CHARS
+        # 입력에 따라 정해지는 응답 (max_in_flight 에 관계없이 같은 보고서인지 확인)
+        content = (f"- {stage} {chars} {sum(map(ord, user)) % 9973} " * length)[:length]
+        prompt_tokens = math.ceil(chars / CHARS_PER_TOKEN)
+        completion_tokens = math.ceil(length / CHARS_PER_TOKEN)
+        with self.lock:
+            self.in_flight -= 1
+            self.calls.append(stage)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return {
+            'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': 'stub',
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        }
+
+
+def make_reviews(count, seed):
+    rng = random.Random(seed)
+    first_day = datetime(2026, 6, 1)
+    reviews = [{'content': text, 'score': rng.randint(1, 5),
+                'date': (first_day + timedelta(days=rng.randrange(REVIEW_DAYS),
+                                               seconds=rng.randrange(86400))).isoformat()}
+               for text in generate_reviews(count, seed=seed)]
+    reviews.sort(key=lambda review: review['date'])
+    return reviews
+
+
+def run_benchmark():
+    import map_reduce_summary as mrs
+
+    server = StubLLMServer(mrs.MAP_PROMPT, mrs.REDUCE_PROMPT)
+    os.environ['OPENAI_API_KEY'] = 'stub'
+    os.environ['OPENAI_BASE_URL'] = server.base_url
+
+    import lambda_function as lf
+    from llm import LLM, SamplingConfig
+
+    reviews = make_reviews(REVIEW_COUNT, seed=50)
+    window = [(review['date'][:10], review['content']) for review in reviews]
+    ok = True
+
+    print(f"{REVIEW_COUNT} reviews, {sum(len(text) for _, text in window)} chars")
+    print(f"{'in-flight':>9} {'calls':>6} {'chunks':>6} {'levels':>6} {'seconds':>8} {'reviews/s':>10} "
+          f"{'prompt tok':>11} {'compl tok':>10} {'server max':>10}")
+    reports = set()
+    for max_in_flight in MAX_IN_FLIGHT:
+        server.reset()
+        llm = LLM()
+        summary, stats = mrs.map_reduce_summary(llm, window, lf.PROMPT, max_in_flight=max_in_flight)
+        reports.add(summary)
+        print(f"{max_in_flight:>9} {stats.llm_calls:>6} {stats.chunks:>6} {stats.levels:>6} {stats.seconds:>8.2f} "
+              f"{stats.review_count / stats.seconds:>10.1f} {stats.prompt_tokens:>11} {stats.completion_tokens:>10} "
+              f"{server.max_in_flight:>10}")
+        ok = ok and server.max_in_flight <= max_in_flight and stats.max_in_flight <= max_in_flight and \
+            stats.prompt_tokens == server.prompt_tokens and stats.completion_tokens == server.completion_tokens and \
+            llm.usage['calls'] == stats.llm_calls == len(server.calls) and server.calls[-1] == 'final'
+    ok = ok and len(reports) == 1
+    print(f"in-flight bounded, client/server token counts equal, same report for every limit: {ok}")
+
+    # 전체 요약: 최근 500개 윈도우에서 샘플링한 리뷰만 LLM 에 들어감
+    config = SamplingConfig()
+    recent = [text for _, text in window[-config.review_window:]]
+    sampled = LLM().sampling(recent, config)
+    print(f"reviews reaching the LLM: full {len(sampled)} ({sum(map(len, sampled))} chars), "
+          f"map_reduce {REVIEW_COUNT}")
+
+    # lambda_function 경로: 저장된 요약 항목
+    create_tables()
+    server.reset()
+    result = lf.generate_and_save_summary('check.mapreduce', 'check-user', reviews=reviews, summary_mode='map_reduce')
+    item = lf.get_latest_summary('check.mapreduce')
+    saved_ok = not result['cached'] and item['summary_mode'] == 'map_reduce' and \
+        int(item['review_count']) == REVIEW_COUNT and int(item['llm_calls']) == len(server.calls) and \
+        int(item['prompt_tokens']) == server.prompt_tokens and \
+        int(item['completion_tokens']) == server.completion_tokens and \
+        result['date_range'] == f"{reviews[0]['date'][:10]} ~ {reviews[-1]['date'][:10]}"
+    print(f"generate_and_save_summary(summary_mode='map_reduce') saved "
+          f"{ {key: item[key] for key in ['summary_mode', 'review_count', 'llm_calls', 'map_chunks', 'input_chars', 'prompt_tokens', 'completion_tokens']} }: {saved_ok}")
+
+    # 같은 (app_id, end_date) 에서 요약 종류가 다르면 캐시로 답하지 않음
+    from summary_lock import SummaryLock
+    modes = []
+    full = lf.generate_and_save_summary('check.mapreduce', 'check-user', reviews=reviews, summary_mode='full')
+    modes.append(('full after map_reduce', full['cached'], lf.get_latest_summary('check.mapreduce')['summary_mode']))
+    sampled_lock = SummaryLock('check.mapreduce', reviews[-1]['date'][:10])
+    held = sampled_lock.acquire()
+    try:
+        mapped = lf.generate_and_save_summary('check.mapreduce', 'check-user', reviews=reviews,
+                                              summary_mode='map_reduce', lock_wait_seconds=0)
+    finally:
+        sampled_lock.release()
+    modes.append(('map_reduce after full', mapped['cached'], lf.get_latest_summary('check.mapreduce')['summary_mode']))
+    again = lf.generate_and_save_summary('check.mapreduce', 'check-user', reviews=reviews, summary_mode='map_reduce')
+    modes.append(('map_reduce again', again['cached'], lf.get_latest_summary('check.mapreduce')['summary_mode']))
+    mode_ok = held and modes == [('full after map_reduce', False, 'full'), ('map_reduce after full', False, 'map_reduce'),
+                                 ('map_reduce again', True, 'map_reduce')]
+    print(f"(request, cached, stored summary_mode): {modes}, map_reduce did not wait on the held full lock: {mode_ok}")
+
+    sync = lf.lambda_handler({'body': {'request_type': 'summary', 'app_id': 'check.mapreduce',
+                                       'google_id': 'check-user', 'summary_mode': 'map_reduce'}}, None)
+    sync_ok = sync['statusCode'] == 400 and 'summary_submit' in json.loads(sync['body'])['error']
+    print(f"synchronous summary with summary_mode 'map_reduce' rejected ({sync['statusCode']}): {sync_ok}")
+    server.httpd.shutdown()
+
+    # 긴 요약 사이의 짧은 요약이 옆 묶음에 붙어 한도를 넘지 않음
+    summaries = ['가' * 900, '나' * 50, '다' * 900, '라' * 50, '마' * 50]
+    groups = mrs.group_summaries(summaries, 1000)
+    group_ok = [summary for group in groups for summary in group] == summaries and \
+        all(len(mrs.summaries_input(group)) <= 1000 for group in groups if len(group) > 1)
+    print(f"group_summaries sizes {[len(group) for group in groups]}, "
+          f"input chars {[len(mrs.summaries_input(group)) for group in groups]}: {group_ok}")
+    limits = []
+    for value in ['abc', '0', '3', '']:
+        os.environ['MAP_REDUCE_MAX_IN_FLIGHT'] = value
+        limits.append(mrs.default_max_in_flight())
+    del os.environ['MAP_REDUCE_MAX_IN_FLIGHT']
+    env_ok = limits == [mrs.MAP_REDUCE_MAX_IN_FLIGHT, mrs.MAP_REDUCE_MAX_IN_FLIGHT, 3, mrs.MAP_REDUCE_MAX_IN_FLIGHT]
+    print(f"MAP_REDUCE_MAX_IN_FLIGHT 'abc', '0', '3', '' -> {limits}: {env_ok}")
+    return ok and saved_ok and mode_ok and sync_ok and group_ok and env_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,163 @@
+"""
+MinHash/LSH 유사 중복 탐지 정확도 및 다양성 백엔드 비교 스크립트
+
+1. test_reviews.json 의 리뷰와, 각 리뷰를 조금씩 변형한 스팸형 복제본(단어 삭제/추가, 문장부호 변경)에 대해
+   문자 3-gram 정확 Jaccard 유사도를 기준으로 LSH 질의(서명 추정치만 / 후보를 정확한 유사도로 확인)의
+   정밀도(precision)/재현율(recall)을 계산합니다.
+   같은 원문에서 나온 리뷰 쌍을 실제 중복으로 보고 임계값별 정밀도/재현율도 계산하고,
+   서로 다른 리뷰 DISTINCT_REVIEWS 개(자주 쓰는 단어가 겹치는 생성 리뷰) 중 잘못 표시되는 리뷰 수를 셉니다
+   (lambda_function.NEAR_DUPLICATE_THRESHOLD 를 이 결과로 정함).
+2. 샘플링 다양성 계산을 exact(토큰 집합) 백엔드와 minhash 백엔드로 각각 실행해
+   선택 결과 겹침 비율과 처리 시간을 비교합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+from itertools import combinations
+
+# minhash 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from minhash import MinHasher, MinHashLSH, char_shingles
+from diversity import greedy_select
+from text_quality import batch_evaluate_text_quality
+from benchmark_diversity import generate_reviews
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9]
+VARIANTS_PER_REVIEW = 5
+DISTINCT_REVIEWS = 2000
+
+
+def load_test_reviews():
+    """테스트 리뷰 데이터 로드"""
+    with open('test_reviews.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [review['content'] for review in data['reviews']]
+
+
+def make_variant(text, rng):
+    """스팸 리뷰처럼 원문을 조금 변형한 복제본 생성"""
+    words = text.split()
+    for _ in range(rng.randint(0, 3)):
+        operation = rng.random()
+        if operation < 0.4 and len(words) > 3:
+            words.pop(rng.randrange(len(words)))
+        elif operation < 0.8:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(["진짜", "완전", "ㅋㅋ", "강추", "최고"]))
+        else:
+            words[-1] = words[-1].rstrip('.!?') + rng.choice(["!!", "~", "...", ""])
+    return ' '.join(words)
+
+
+def exact_jaccard(set1, set2):
+    union = set1 | set2
+    return len(set1 & set2) / len(union) if union else 1.0
+
+
+def precision_recall(found, truth):
+    true_positive = len(found & truth)
+    precision = true_positive / len(found) if found else 1.0
+    recall = true_positive / len(truth) if truth else 1.0
+    return precision, recall
+
+
+def false_flags(texts, threshold):
+    """lambda_function.is_near_duplicate 와 같이 순서대로 색인하며 유사 중복으로 표시되는 텍스트 수"""
+    hasher = MinHasher()
+    index = MinHashLSH(num_perm=hasher.num_perm)
+    shingle_sets = [char_shingles(text) for text in texts]
+    flagged = 0
+    for key, (signature, shingles) in enumerate(zip(hasher.signatures(shingle_sets), shingle_sets)):
+        if index.query(signature, threshold, shingles):
+            flagged += 1
+        else:
+            index.insert(key, signature, shingles)
+    return flagged
+
+
+def evaluate_lsh(texts, groups):
+    """
+    정확 Jaccard 대비 LSH 질의의 정밀도/재현율과, 실제 중복(같은 원문 groups) 대비 임계값별 정밀도/재현율
+
+    Args:
+        texts (list): 리뷰 텍스트
+        groups (list): 텍스트마다 원문 번호 (같은 번호끼리 실제 중복)
+    """
+    shingle_sets = [char_shingles(text) for text in texts]
+    hasher = MinHasher()
+
+    start = time.perf_counter()
+    signatures = hasher.signatures(shingle_sets)
+    index = MinHashLSH(num_perm=hasher.num_perm)
+    for key, (signature, shingles) in enumerate(zip(signatures, shingle_sets)):
+        index.insert(key, signature, shingles)
+    build_time = time.perf_counter() - start
+
+    exact = {(i, j): exact_jaccard(shingle_sets[i], shingle_sets[j])
+             for i, j in combinations(range(len(texts)), 2)}
+    duplicates = {(i, j) for i, j in exact if groups[i] == groups[j]}
+
+    print(f"{len(texts)} reviews, {len(exact)} pairs ({len(duplicates)} duplicates), "
+          f"signature+index build {build_time * 1000:.1f} ms")
+    distinct = generate_reviews(DISTINCT_REVIEWS, seed=7)
+    print(f"{'':>9} {'vs exact Jaccard >= threshold':^46} {'vs duplicates (verified)':^28}")
+    print(f"{'threshold':>9} {'true pairs':>10} {'estimate P/R':>13} {'verified P/R':>13} {'query(ms)':>9} "
+          f"{'precision':>9} {'recall':>7} {'false flags':>11}")
+    for threshold in THRESHOLDS:
+        truth = {pair for pair, similarity in exact.items() if similarity >= threshold}
+
+        found = {}
+        query_times = {}
+        for verified in (False, True):
+            start = time.perf_counter()
+            pairs = set()
+            for i, signature in enumerate(signatures):
+                for j, _ in index.query(signature, threshold, shingle_sets[i] if verified else None):
+                    if i < j:
+                        pairs.add((i, j))
+            query_times[verified] = time.perf_counter() - start
+            found[verified] = pairs
+
+        estimate = precision_recall(found[False], truth)
+        verified = precision_recall(found[True], truth)
+        labelled = precision_recall(found[True], duplicates)
+        print(f"{threshold:>9.1f} {len(truth):>10} {estimate[0]:>6.3f}/{estimate[1]:.3f} "
+              f"{verified[0]:>6.3f}/{verified[1]:.3f} {query_times[True] * 1000:>9.1f} "
+              f"{labelled[0]:>9.3f} {labelled[1]:>7.3f} {false_flags(distinct, threshold):>5}/{len(distinct)}")
+
+
+def compare_diversity_backends(count=10000):
+    """exact / minhash 다양성 백엔드의 선택 결과와 처리 시간 비교"""
+    text_list = generate_reviews(count, seed=count)
+    quality_scores = batch_evaluate_text_quality(text_list)
+    candidate_indices = sorted(range(count), key=lambda i: quality_scores[i], reverse=True)
+
+    results = {}
+    for backend in ('exact', 'minhash'):
+        start = time.perf_counter()
+        selected, _ = greedy_select(text_list, quality_scores, candidate_indices, diversity_backend=backend)
+        results[backend] = (selected, time.perf_counter() - start)
+
+    overlap = len(set(results['exact'][0]) & set(results['minhash'][0])) / len(results['exact'][0])
+    print(f"\n{count} candidates: exact {results['exact'][1]:.3f}s, minhash {results['minhash'][1]:.3f}s, "
+          f"selection overlap {overlap:.1%}")
+
+
+def run_benchmark():
+    rng = random.Random(0)
+    originals = load_test_reviews()
+    texts = list(originals)
+    groups = list(range(len(originals)))
+    for group, text in enumerate(originals):
+        texts.extend(make_variant(text, rng) for _ in range(VARIANTS_PER_REVIEW))
+        groups.extend([group] * VARIANTS_PER_REVIEW)
+
+    evaluate_lsh(texts, groups)
+    compare_diversity_backends()
+
+
+if __name__ == "__main__":
+    run_benchmark()
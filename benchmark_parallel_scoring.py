@@ -0,0 +1,64 @@
+"""
+품질 평가 직렬/병렬(ProcessPoolExecutor) 처리 시간 비교 스크립트
+
+리뷰 수를 늘려가며 batch_evaluate_text_quality(직렬)와
+parallel_evaluate_text_quality(프로세스 풀, 최소 텍스트 수 제한 없이 강제 병렬)를 비교하고,
+병렬 처리가 직렬보다 빨라지는 지점(crossover)을 출력합니다.
+text_quality.PARALLEL_MIN_TEXTS 는 이 결과를 바탕으로 정합니다.
+
+사용법: python benchmark_parallel_scoring.py [워커 수]
+"""
+
+import os
+import sys
+import time
+
+# text_quality 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from text_quality import batch_evaluate_text_quality, parallel_evaluate_text_quality, PARALLEL_MIN_TEXTS
+from benchmark_diversity import generate_reviews
+
+REVIEW_COUNTS = [500, 1000, 2000, 2100, 5000, 10000, 20000, 50000]
+
+
+def best_time(function, repeat=3):
+    """여러 번 실행한 처리 시간 중 최솟값 (초)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def run_benchmark(workers):
+    reviews = generate_reviews(max(REVIEW_COUNTS))
+    crossover = None
+    all_identical = True
+
+    print(f"workers={workers}, PARALLEL_MIN_TEXTS={PARALLEL_MIN_TEXTS}")
+    print(f"{'reviews':>8} {'serial(s)':>10} {'parallel(s)':>12} {'speedup':>8}")
+    for count in REVIEW_COUNTS:
+        text_list = reviews[:count]
+        serial, serial_time = best_time(lambda: batch_evaluate_text_quality(text_list))
+        parallel, parallel_time = best_time(
+            lambda: parallel_evaluate_text_quality(text_list, max_workers=workers, min_texts=0))
+
+        identical = serial == parallel
+        all_identical = all_identical and identical
+        if crossover is None and parallel_time < serial_time:
+            crossover = count
+        print(f"{count:>8} {serial_time:>10.3f} {parallel_time:>12.3f} {serial_time / parallel_time:>7.2f}x"
+              f"{'' if identical else '  MISMATCH'}")
+
+    if crossover is None:
+        print("Parallel scoring was never faster than serial on this machine.")
+    else:
+        print(f"Parallel scoring becomes faster at about {crossover} reviews.")
+    return all_identical
+
+
+if __name__ == "__main__":
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    sys.exit(0 if run_benchmark(max(2, worker_count)) else 1)
@@ -0,0 +1,70 @@
+"""
+리뷰 수집(fetch_and_save_new_reviews) 처리 시간/최대 메모리 측정 스크립트
+
+moto 로 만든 DynamoDB 에 리뷰가 없는 앱을 처음부터 수집(cold backfill)하며 걸리는 시간과
+tracemalloc 기준 최대 메모리 사용량을 측정합니다.
+스토어 호출은 페이지당 STORE_LATENCY 초가 걸리는 로컬 스텁으로,
+DynamoDB 쓰기는 BatchWriteItem / TransactWriteItems 호출마다 WRITE_LATENCY 초의 네트워크 지연을 더해 흉내 냅니다.
+
+사용법: python benchmark_pipelined_ingest.py [리뷰 수]
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+REVIEW_COUNT = 5000
+STORE_LATENCY = 0.3
+WRITE_LATENCY = 0.02
+
+
+def run_benchmark(count):
+    import lambda_function as lf
+    import dynamodb_writer
+
+    create_tables()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(count), today - timedelta(days=50), today - timedelta(days=1), random.Random(0))
+
+    def slow_store(app_id, **kwargs):
+        time.sleep(STORE_LATENCY)
+        return store(app_id, **kwargs)
+
+    for operation in ('BatchWriteItem', 'TransactWriteItems'):
+        dynamodb_writer.dynamodb_client.meta.events.register(
+            f'before-call.dynamodb.{operation}', lambda **kwargs: time.sleep(WRITE_LATENCY))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    lf.fetch_and_save_new_reviews('benchmark.ingest.app', fetch_reviews=slow_store)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stored = sum(1 for _ in lf.iter_app_reviews('benchmark.ingest.app', ['reviewId']))
+    pages = -(-count // 200)
+    print(f"{count} reviews ({pages} store pages x {STORE_LATENCY}s, +{WRITE_LATENCY}s per write request)")
+    print(f"elapsed {elapsed:.2f}s, peak traced memory {peak / 1024 / 1024:.1f} MB, stored {stored}")
+    return stored == count
+
+
+if __name__ == "__main__":
+    review_count = int(sys.argv[1]) if len(sys.argv) > 1 else REVIEW_COUNT
+    with mock_aws():
+        sys.exit(0 if run_benchmark(review_count) else 1)
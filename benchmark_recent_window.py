@@ -0,0 +1,132 @@
+"""
+요약용 최근 리뷰 윈도우 조회의 읽기 용량(RCU)/지연 시간 비교 스크립트
+
+큰 파티션(기본 20,000개 리뷰, 60일)을 만든 뒤 다음 두 방식을 비교합니다.
+1. 기존 방식: get_app_reviews 로 파티션 전체를 읽고 pandas 로 길이 필터 -> 날짜 정렬 -> head(500)
+2. get_recent_review_window: 정렬 키 내림차순 조회 + 서버 측 길이 필터 + 윈도우가 채워지면 조기 종료
+
+RCU 는 DynamoDB 과금 방식(필터/프로젝션과 무관하게 평가된 항목의 전체 크기 합 / 4KB,
+eventually consistent 읽기는 0.5배)으로 추정합니다.
+moto 는 ConsumedCapacity 를 호출당 고정값으로 돌려주므로 응답 값도 함께 출력만 합니다.
+AWS_ENDPOINT_URL_DYNAMODB 를 DynamoDB Local 주소로 지정하면 moto 대신 DynamoDB Local 에서 실행합니다.
+두 방식의 요약 대상 리뷰가 다르면 종료 코드 1 로 종료합니다.
+
+사용법: python benchmark_recent_window.py [리뷰 수]
+"""
+
+import os
+import sys
+import math
+import time
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import pandas as pd
+
+from benchmark_diversity import generate_reviews, time_call
+from check_review_snapshot import create_tables
+
+REVIEW_COUNT = 20000
+DAYS = 60
+SHORT_REVIEW_RATIO = 0.3
+REVIEW_WINDOW = 500
+
+
+def make_scraped_reviews(count, seed=0):
+    """google_play_scraper 결과 형식의 리뷰 생성 (일부는 요약 대상이 아닌 짧은 리뷰)"""
+    rng = random.Random(seed)
+    end = datetime.now() - timedelta(days=1)
+    scraped = []
+    for i, text in enumerate(generate_reviews(count, seed=seed)):
+        if rng.random() < SHORT_REVIEW_RATIO:
+            text = text[:rng.randint(5, 40)]
+        scraped.append({
+            'reviewId': f"review-{i}",
+            'userName': f"user{i}",
+            'content': text,
+            'score': rng.randint(1, 5),
+            'at': end - timedelta(seconds=rng.randint(0, DAYS * 86400)),
+        })
+    return scraped
+
+
+def item_size(item):
+    """DynamoDB 항목 크기 근사치 (속성 이름 + 값의 바이트 수)"""
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode('utf-8'))
+        if isinstance(value, str):
+            size += len(value.encode('utf-8'))
+        elif isinstance(value, Decimal):
+            size += math.ceil(len(value.as_tuple().digits) / 2) + 1
+        else:
+            size += len(str(value))
+    return size
+
+
+def estimated_rcu(sizes):
+    """eventually consistent Query 의 RCU 추정치"""
+    return math.ceil(sum(sizes) / 4096) * 0.5
+
+
+def summary_window(reviews, is_summary_candidate):
+    """generate_and_save_summary 와 같은 길이 필터/날짜 정렬로 요약 대상 리뷰 목록 생성"""
+    df = pd.DataFrame([review for review in reviews if is_summary_candidate(review)])
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values(by='date', ascending=False).head(REVIEW_WINDOW)
+    return sorted(zip(df['date'].astype(str), df['content']))
+
+
+def run_benchmark(count):
+    import lambda_function as lf
+
+    # 리뷰 저장 시 일별 집계(AppReviewDaily)도 갱신하므로 테이블 전체 생성
+    create_tables()
+    lf.save_reviews_to_dynamodb('benchmark.app', make_scraped_reviews(count))
+
+    # 평가 순서(최신순)대로 항목 크기를 구해 두고 RCU 추정에 사용
+    sizes = [item_size(item) for item in lf.iter_app_reviews('benchmark.app', newest_first=True)]
+
+    full_stats = {}
+    full_reviews, full_time = time_call(
+        lambda: [review for page in lf.iter_app_review_pages('benchmark.app', read_stats=full_stats)
+                 for review in page])
+    expected = summary_window(full_reviews, lf.is_summary_candidate)
+
+    (window_reviews, window_stats), window_time = time_call(
+        lf.get_recent_review_window, 'benchmark.app', REVIEW_WINDOW)
+    actual = summary_window(window_reviews, lf.is_summary_candidate)
+
+    rows = [
+        ('full partition', full_stats, len(full_reviews), estimated_rcu(sizes), full_time),
+        ('recent window', window_stats, len(window_reviews),
+         estimated_rcu(sizes[:window_stats['scanned_count']]), window_time),
+    ]
+    print(f"{count} reviews over {DAYS} days, window={REVIEW_WINDOW}")
+    print(f"{'method':>15} {'pages':>6} {'evaluated':>10} {'held':>7} {'est. RCU':>9} "
+          f"{'reported CU':>12} {'time(s)':>8}")
+    for name, stats, held, rcu, elapsed in rows:
+        print(f"{name:>15} {stats['pages']:>6} {stats['scanned_count']:>10} {held:>7} {rcu:>9.1f} "
+              f"{stats['capacity_units']:>12.1f} {elapsed:>8.3f}")
+
+    identical = expected == actual
+    print("Summary windows identical" if identical else "Summary windows MISMATCH")
+    return identical
+
+
+if __name__ == "__main__":
+    review_count = int(sys.argv[1]) if len(sys.argv) > 1 else REVIEW_COUNT
+    if os.environ.get('AWS_ENDPOINT_URL_DYNAMODB'):
+        sys.exit(0 if run_benchmark(review_count) else 1)
+
+    from moto import mock_aws
+    with mock_aws():
+        sys.exit(0 if run_benchmark(review_count) else 1)
@@ -0,0 +1,108 @@
+"""
+람다 응답 압축(response_encoding) 크기/지연 시간 측정 스크립트
+
+실제 응답과 같은 형식(serializer.dumps, UTF-8 그대로)의 리뷰 목록과 요약 마크다운 응답을 만들어
+인코딩/압축 수준별 압축 크기, 압축 시간(CPU)과 모바일 회선(MOBILE_MBPS)에서의 예상 전송 시간을 비교합니다.
+예상 응답 시간 = 압축 시간 + base64 본문 전송 시간 (압축하지 않으면 원본 전송 시간)
+이 결과로 response_encoding.COMPRESSION_MIN_BYTES / GZIP_LEVEL 을 정합니다.
+"""
+
+import os
+import sys
+import time
+import gzip
+import base64
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from benchmark_diversity import generate_reviews
+from response_encoding import COMPRESSION_MIN_BYTES, brotli
+from serializer import dumps
+
+REVIEW_COUNTS = [1, 3, 10, 100, 1000, 10000]
+GZIP_LEVELS = [1, 5, 9]
+BROTLI_QUALITIES = [1, 5, 11]
+MOBILE_MBPS = 5.0
+REPEAT = 5
+
+
+def review_items(count, seed=0):
+    """DynamoDB 에서 읽은 것과 같은 형식(숫자는 Decimal)의 리뷰 항목"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    reviews = []
+    for i, content in enumerate(generate_reviews(count, seed=seed)):
+        at = start + timedelta(minutes=rng.randint(0, 400000))
+        reviews.append({
+            'app_id': 'com.example.app',
+            'date_user_id': f"{at.strftime('%Y-%m-%d')}#사용자{i}",
+            'date': at.isoformat(),
+            'username': f"사용자{i}",
+            'score': Decimal(rng.randint(1, 5)),
+            'content': content,
+            'reviewId': f"gp:AOqpTOH{rng.getrandbits(64):x}",
+            'quality_score': Decimal(repr(rng.random())),
+        })
+    return reviews
+
+
+def review_payload(count, seed=0):
+    """app_review_read 응답 본문"""
+    reviews = review_items(count, seed)
+    return dumps({"reviews": reviews, "count": len(reviews), "new_reviews_added": False})
+
+
+def summary_payload():
+    """summary 응답 본문 (마크다운 보고서)"""
+    sections = generate_reviews(40, seed=99)
+    markdown = "\n".join(f"## {i}. 섹션\n- {text}\n- {text[:60]}" for i, text in enumerate(sections, 1))
+    return dumps({"summary": markdown, "app_id": "com.example.app", "from_cache": False})
+
+
+def timed(function, data):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(data)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def transfer_seconds(size):
+    return size * 8 / (MOBILE_MBPS * 1_000_000)
+
+
+def main():
+    encoders = [(f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level))
+                for level in GZIP_LEVELS]
+    if brotli:
+        encoders += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality))
+                     for quality in BROTLI_QUALITIES]
+    else:
+        print("brotli is not installed; only gzip is measured")
+
+    payloads = [(f"{count} reviews", review_payload(count)) for count in REVIEW_COUNTS]
+    payloads.append(("summary", summary_payload()))
+
+    print(f"estimated response time = compression + transfer of the base64 body at {MOBILE_MBPS} Mbps")
+    print(f"{'payload':<14} {'encoding':<9} {'bytes':>10} {'base64':>10} {'ratio':>6} {'compress ms':>12} "
+          f"{'total ms':>9}")
+    for name, body in payloads:
+        data = body.encode('utf-8')
+        print(f"{name:<14} {'none':<9} {len(data):>10} {len(data):>10} {1.0:>6.2f} {0.0:>12.2f} "
+              f"{transfer_seconds(len(data)) * 1000:>9.2f}")
+        for encoder_name, encoder in encoders:
+            compressed, seconds = timed(encoder, data)
+            encoded_size = len(base64.b64encode(compressed))
+            total = seconds + transfer_seconds(encoded_size)
+            print(f"{'':<14} {encoder_name:<9} {len(compressed):>10} {encoded_size:>10} "
+                  f"{encoded_size / len(data):>6.2f} {seconds * 1000:>12.2f} {total * 1000:>9.2f}")
+    print(f"current threshold: COMPRESSION_MIN_BYTES = {COMPRESSION_MIN_BYTES}")
+
+
+if __name__ == "__main__":
+    main()
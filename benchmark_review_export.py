@@ -0,0 +1,213 @@
+"""
+리뷰 내보내기(review_export) 처리량/메모리 측정 스크립트
+
+moto 로 만든 DynamoDB 에 리뷰를 저장한 뒤 다음을 비교합니다.
+- 일괄 내보내기: 모든 페이지를 리스트에 모은 뒤 json.dumps(default=str) 로 한 번에 쓰기 (기존 방식)
+- 스트리밍 내보내기: review_export.export_reviews (NDJSON, 페이지마다 쓰기)
+초당 행 수와 tracemalloc 최대 메모리를 출력하고 다음을 확인합니다 (다르면 종료 코드 1).
+- 스트리밍 결과가 저장된 리뷰 전체와 같음
+- max_pages 로 중간에 멈춘 뒤 체크포인트의 cursor 로 이어서 내보낸 파일이 한 번에 내보낸 파일과 같음
+- since / until 로 내보낸 리뷰가 날짜 범위로 거른 결과와 같음
+- (pyarrow 가 있으면) Parquet 내보내기가 저장된 리뷰와 같고, 체크포인트의 cursor 앞 리뷰는 모두 닫힌 파일에 있으며,
+  중단 후 이어서 내보내면 처음 파일을 덮어쓰지 않고 part 파일에 써서 모든 파일을 합치면 한 번에 내보낸 결과와 같음
+moto 는 조회 한 번에 파티션 전체를 훑으므로 초당 행 수는 실제 DynamoDB 보다 낮게 나오고, 최대 메모리에도 moto 가
+조회마다 만드는 파티션 사본이 포함됩니다. 그래서 조회를 뺀 클라이언트 쪽 처리(응답 변환 + 직렬화)의 초당 행 수도 따로 측정합니다.
+
+사용법: python benchmark_review_export.py [리뷰 수]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import APP_ID, FakeStore, create_tables
+
+REVIEW_COUNT = 10000
+
+
+def measured(function, *args, **kwargs):
+    """(결과, 초, 최대 메모리 바이트)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def batch_export(lf, path):
+    """기존 방식: 전체 리뷰를 메모리에 모은 뒤 한 번에 쓰기"""
+    items = list(lf.iter_app_reviews(APP_ID, newest_first=False))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(items, default=str))
+    return len(items)
+
+
+def read_parquet_ids(paths):
+    import pyarrow.parquet
+    return [value for path in paths for value in pyarrow.parquet.read_table(path).column('date_user_id').to_pylist()]
+
+
+def check_parquet(lf, workdir, stored):
+    """Parquet 내보내기 / 체크포인트 / 이어서 내보내기 확인"""
+    import review_export
+    from review_export import export_files, export_reviews
+
+    stored_ids = [review['date_user_id'] for review in stored]
+    parquet_path = os.path.join(workdir, 'full.parquet')
+    result = export_reviews(APP_ID, parquet_path, export_format='parquet')
+    ok_full = read_parquet_ids(export_files(parquet_path)) == stored_ids and result['files'] == export_files(parquet_path)
+    print(f"parquet export ({len(result['files'])} files) matches stored reviews: {ok_full}")
+
+    # 작은 묶음으로: 조회할 때마다 (중단되면 남을) 체크포인트의 cursor 앞 리뷰가 모두 닫힌 파일에 있는지 확인
+    row_group_rows = review_export.PARQUET_ROW_GROUP_ROWS
+    review_export.PARQUET_ROW_GROUP_ROWS = 1200
+    resume_path = os.path.join(workdir, 'resume.parquet')
+    checkpoint = os.path.join(workdir, 'resume.parquet.cursor')
+    query_params = {'since': None, 'until': None, 'newest_first': False}
+    durable = []
+
+    def check_checkpoint(**kwargs):
+        if os.path.exists(checkpoint):
+            with open(checkpoint, encoding='utf-8') as f:
+                cursor = f.read()
+            key = lf.decode_review_page_token(cursor, APP_ID, query_params)['date_user_id']
+            durable.append(read_parquet_ids(export_files(resume_path)) == [i for i in stored_ids if i <= key])
+
+    client = review_export.dynamodb_client
+    client.meta.events.register('before-call.dynamodb.Query', check_checkpoint)
+    try:
+        first = export_reviews(APP_ID, resume_path, 'parquet', checkpoint=checkpoint, page_size=500, max_pages=4)
+        with open(checkpoint, encoding='utf-8') as f:
+            cursor = f.read()
+        first_files = export_files(resume_path)
+        second = export_reviews(APP_ID, resume_path, 'parquet', cursor=cursor, checkpoint=checkpoint, page_size=500)
+    finally:
+        client.meta.events.unregister('before-call.dynamodb.Query', check_checkpoint)
+        review_export.PARQUET_ROW_GROUP_ROWS = row_group_rows
+    ok_checkpoint = bool(durable) and all(durable)
+    print(f"checkpoint never ahead of closed files ({len(durable)} queries checked): {ok_checkpoint}")
+    files = export_files(resume_path)
+    ok_resume = (second['cursor'] is None and files[:len(first_files)] == first_files and
+                 set(second['files']) == set(files[len(first_files):]) and read_parquet_ids(files) == stored_ids)
+    print(f"interrupted after {first['rows']} rows ({len(first_files)} files), resumed {second['rows']} rows "
+          f"({len(second['files'])} part files), files match one-shot export: {ok_resume}")
+    return ok_full and ok_checkpoint and ok_resume
+
+
+def page_processing(lf, repeat=5):
+    """응답 한 페이지의 변환+직렬화 초당 행 수: (리소스 방식 TypeDeserializer + json.dumps, 스트리밍 방식)"""
+    from boto3.dynamodb.types import TypeDeserializer
+    from dynamodb_writer import dynamodb_client
+    from review_export import plain_value
+    from serializer import dumps
+
+    raw = dynamodb_client.query(TableName=lf.app_review_table.name, KeyConditionExpression='app_id = :app_id',
+                                ExpressionAttributeValues={':app_id': {'S': APP_ID}})['Items']
+    deserializer = TypeDeserializer()
+
+    def resource_style():
+        items = [{name: deserializer.deserialize(value) for name, value in item.items()} for item in raw]
+        return '\n'.join(json.dumps(item, default=str) for item in items)
+
+    def streaming_style():
+        return '\n'.join(dumps({name: plain_value(value) for name, value in item.items()}) for item in raw)
+
+    rates = []
+    for function in (resource_style, streaming_style):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        rates.append(len(raw) / best)
+    return len(raw), rates
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def run_benchmark(count):
+    import lambda_function as lf
+    from review_export import export_reviews
+
+    create_tables()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(count, seed=12), today - timedelta(days=365), today - timedelta(days=1),
+              random.Random(12))
+    lf.save_reviews_to_dynamodb(APP_ID, store.reviews)
+    stored = sorted(lf.iter_app_reviews(APP_ID), key=lambda review: review['date_user_id'])
+
+    workdir = tempfile.mkdtemp(prefix='review_export_')
+    full_path = os.path.join(workdir, 'full.ndjson')
+    rows, batch_seconds, batch_peak = measured(batch_export, lf, os.path.join(workdir, 'batch.json'))
+    result, stream_seconds, stream_peak = measured(export_reviews, APP_ID, full_path)
+
+    print(f"{count} reviews stored")
+    print(f"{'export':<12} {'rows':>7} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+    for name, exported, seconds, peak in [('batch', rows, batch_seconds, batch_peak),
+                                          ('streaming', result['rows'], stream_seconds, stream_peak)]:
+        print(f"{name:<12} {exported:>7} {seconds:>8.2f} {exported / seconds:>9.0f} {peak / 1024 / 1024:>8.1f}")
+
+    page_rows, (resource_rate, streaming_rate) = page_processing(lf)
+    print(f"client-side processing of one {page_rows}-row page: resource+json {resource_rate:,.0f} rows/s, "
+          f"plain_value+serializer {streaming_rate:,.0f} rows/s")
+
+    full_lines = read_lines(full_path)
+    exported = [json.loads(line) for line in full_lines]
+    ok_full = [review['date_user_id'] for review in exported] == [review['date_user_id'] for review in stored]
+    ok_full = ok_full and all(review['score'] == int(stored_review['score'])
+                              for review, stored_review in zip(exported, stored))
+    print(f"streaming export matches stored reviews: {ok_full}")
+
+    # 두 페이지 후 중단 -> 체크포인트의 cursor 로 이어서
+    resume_path = os.path.join(workdir, 'resume.ndjson')
+    checkpoint = os.path.join(workdir, 'resume.cursor')
+    first = export_reviews(APP_ID, resume_path, checkpoint=checkpoint, max_pages=2)
+    with open(checkpoint, encoding='utf-8') as f:
+        cursor = f.read()
+    second = export_reviews(APP_ID, resume_path, cursor=cursor, checkpoint=checkpoint)
+    ok_resume = bool(cursor) and second['cursor'] is None and read_lines(resume_path) == full_lines
+    print(f"interrupted after {first['rows']} rows, resumed {second['rows']} rows, "
+          f"file matches one-shot export: {ok_resume}")
+
+    since, until = (today - timedelta(days=200)).strftime('%Y-%m-%d'), (today - timedelta(days=100)).strftime('%Y-%m-%d')
+    range_path = os.path.join(workdir, 'range.ndjson')
+    export_reviews(APP_ID, range_path, fields=['date_user_id', 'score'], since=since, until=until)
+    expected = [review['date_user_id'] for review in stored if since <= review['date_user_id'][:10] <= until]
+    ok_range = [json.loads(line)['date_user_id'] for line in read_lines(range_path)] == expected
+    print(f"since/until export ({len(expected)} rows) matches filtered reviews: {ok_range}")
+
+    from review_export import pyarrow
+    if pyarrow:
+        ok_parquet = check_parquet(lf, workdir, stored)
+    else:
+        ok_parquet = True
+        print("pyarrow is not installed; parquet export skipped")
+
+    return ok_full and ok_resume and ok_range and ok_parquet
+
+
+if __name__ == "__main__":
+    review_count = int(sys.argv[1]) if len(sys.argv) > 1 else REVIEW_COUNT
+    with mock_aws():
+        sys.exit(0 if run_benchmark(review_count) else 1)
@@ -0,0 +1,94 @@
+"""
+app_review_read 응답 크기/지연 시간 측정 스크립트 (전체 응답 vs 페이지 응답)
+
+moto 로 만든 DynamoDB 에 리뷰를 저장한 뒤 다음을 비교합니다.
+- 전체 응답: 기존 app_review_read (모든 리뷰의 모든 속성을 한 번에)
+- 첫 페이지: page_size / fields 를 지정한 app_review_read 첫 요청 (앱 화면이 처음 그리는 데 필요한 양)
+- 전체 페이지: next_token 으로 마지막 페이지까지 받은 합계
+API Gateway 응답 한도(6 MB) 대비 크기도 출력하고, 페이지를 이어 붙인 결과가 전체 응답과 같은지,
+잘못된 next_token 이 400 으로 거부되는지 확인합니다 (다르면 종료 코드 1).
+
+사용법: python benchmark_review_pages.py [리뷰 수]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import APP_ID, FakeStore, create_tables
+
+REVIEW_COUNT = 10000
+PAGE_SIZE = 100
+PAGE_FIELDS = ['date', 'username', 'score', 'content']
+API_GATEWAY_LIMIT = 6 * 1024 * 1024
+
+
+def call(lf, **body):
+    start = time.perf_counter()
+    response = lf.lambda_handler({'body': {'request_type': 'app_review_read', 'app_id': APP_ID, **body}}, None)
+    return response, time.perf_counter() - start
+
+
+def run_benchmark(count):
+    import lambda_function as lf
+
+    create_tables()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(count, seed=8), today - timedelta(days=365), today - timedelta(days=1), random.Random(8))
+    lf.save_reviews_to_dynamodb(APP_ID, store.reviews)
+    # 저장된 리뷰가 최신이므로 스토어 호출은 일어나지 않음
+    lf.reviews = lambda *args, **kwargs: ([], None)
+
+    full_response, full_seconds = call(lf)
+    full_reviews = json.loads(full_response['body'])['reviews']
+
+    first_response, first_seconds = call(lf, page_size=PAGE_SIZE, fields=PAGE_FIELDS)
+    pages, paged_reviews, paged_bytes, paged_seconds = 0, [], 0, 0.0
+    response, seconds, token = first_response, first_seconds, None
+    while True:
+        body = json.loads(response['body'])
+        pages += 1
+        paged_reviews.extend(body['reviews'])
+        paged_bytes += len(response['body'])
+        paged_seconds += seconds
+        token = body['next_token']
+        if not token:
+            break
+        response, seconds = call(lf, page_size=PAGE_SIZE, fields=PAGE_FIELDS, next_token=token)
+
+    newest_first = sorted(full_reviews, key=lambda review: review['date_user_id'], reverse=True)
+    ok = paged_reviews == [{field: review[field] for field in PAGE_FIELDS} for review in newest_first]
+
+    bad_token, _ = call(lf, page_size=PAGE_SIZE, next_token='not-a-token')
+    other_query = json.loads(first_response['body'])['next_token']
+    mismatched, _ = call(lf, page_size=PAGE_SIZE, since='2020-01-01', next_token=other_query)
+    ok = ok and bad_token['statusCode'] == 400 and mismatched['statusCode'] == 400
+
+    print(f"{count} reviews, page_size={PAGE_SIZE}, fields={PAGE_FIELDS}")
+    print(f"{'response':<24} {'bytes':>12} {'% of 6 MB':>10} {'seconds':>8}")
+    for name, size, seconds in [('full (legacy)', len(full_response['body']), full_seconds),
+                                ('first page', len(first_response['body']), first_seconds),
+                                (f'all pages ({pages})', paged_bytes, paged_seconds)]:
+        print(f"{name:<24} {size:>12} {size / API_GATEWAY_LIMIT * 100:>9.1f}% {seconds:>8.2f}")
+    print(f"pages concatenate to the full response, invalid tokens rejected: {ok}")
+    return ok
+
+
+if __name__ == "__main__":
+    review_count = int(sys.argv[1]) if len(sys.argv) > 1 else REVIEW_COUNT
+    with mock_aws():
+        sys.exit(0 if run_benchmark(review_count) else 1)
@@ -0,0 +1,89 @@
+"""
+응답 JSON 직렬화(serializer) 마이크로벤치마크
+
+app_review_read 응답 형식의 리뷰 REVIEW_COUNT 개 페이로드(DynamoDB 에서 읽은 것처럼 숫자는 Decimal)를
+방식별로 직렬화해 시간(REPEAT 번 중 최소)과 본문 크기를 비교합니다.
+- 기존: json.dumps(..., default=str)
+- serializer.dumps (orjson 이 있으면 orjson, 없으면 표준 json)
+- 표준 json 경로 / orjson + Decimal 을 미리 변환하는 방식 (비교용)
+serializer.dumps 결과를 다시 읽으면 Decimal 이 숫자로, 나머지 값은 기존과 같게 나오는지도 확인합니다.
+"""
+
+import os
+import sys
+import json
+import time
+from decimal import Decimal
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from benchmark_response_compression import review_items
+import serializer
+
+REVIEW_COUNT = 10000
+REPEAT = 5
+
+
+def load_payload(count):
+    """app_review_read 응답 객체"""
+    reviews = review_items(count)
+    return {"reviews": reviews, "count": len(reviews), "new_reviews_added": False}
+
+
+def convert(value):
+    """Decimal 을 미리 숫자로 바꾸는 재귀 변환 (비교용)"""
+    if type(value) is dict:
+        return {key: convert(item) for key, item in value.items()}
+    if type(value) is list:
+        return [convert(item) for item in value]
+    if type(value) is Decimal:
+        return serializer.decimal_to_number(value)
+    return value
+
+
+def stdlib_dumps(value):
+    return json.dumps(value, default=serializer._default, ensure_ascii=False, separators=(',', ':'))
+
+
+def timed(function, value):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(value)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    payload = load_payload(REVIEW_COUNT)
+    methods = [
+        ('json.dumps(default=str)', lambda value: json.dumps(value, default=str)),
+        (f"serializer.dumps ({'orjson' if serializer.orjson else 'json'})", serializer.dumps),
+        ('stdlib json + _default', stdlib_dumps),
+    ]
+    if serializer.orjson:
+        methods.append(('pre-convert + orjson',
+                        lambda value: serializer.orjson.dumps(convert(value)).decode('utf-8')))
+
+    print(f"{REVIEW_COUNT} reviews, best of {REPEAT}")
+    print(f"{'method':<28} {'ms':>9} {'bytes':>10}")
+    results = {}
+    for name, function in methods:
+        body, seconds = timed(function, payload)
+        results[name] = body
+        print(f"{name:<28} {seconds * 1000:>9.1f} {len(body.encode('utf-8')):>10}")
+
+    legacy = json.loads(results['json.dumps(default=str)'])
+    current = json.loads(serializer.dumps(payload))
+    first_legacy, first_current = legacy['reviews'][0], current['reviews'][0]
+    ok = (isinstance(first_current['score'], int) and first_current['score'] == int(first_legacy['score']) and
+          isinstance(first_current['quality_score'], float) and
+          all(first_current[key] == first_legacy[key] for key in ('date', 'content', 'username', 'reviewId')) and
+          len({body for name, body in results.items() if name != 'json.dumps(default=str)'}) == 1)
+    print(f"numbers instead of strings, other values unchanged, backends agree: {ok}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,114 @@
+"""
+요약 캐시 사전 확인(get_cached_summary) 응답 시간 측정 스크립트
+
+moto 로 만든 DynamoDB 와 스토어 스텁, 스텁 LLM 으로 한 앱의 summary 를 한 번 만든 뒤,
+같은 날 다시 요청했을 때의 응답 시간과 스토어 호출 / DynamoDB 호출 수를 비교합니다.
+- 기존 경로: 스토어 수집 → 요약 윈도우 조회 → DataFrame → (app_id, end_date) 캐시 확인
+- 사전 확인: AppIngestState / AppSummary get_item 각 1번
+두 응답이 같은지(review_count 는 요약을 만든 요청의 값), 오늘 수집하지 않은 앱과 review_count 없이 저장된 이전 요약은 기존 경로로 처리되는지 확인합니다
+(다르면 종료 코드 1).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import APP_ID, FakeStore, create_tables
+
+REVIEW_COUNT = 3000
+REPEAT = 5
+
+
+def run_benchmark():
+    import lambda_function as lf
+    from llm import LLM
+
+    class StubLLM(LLM):
+        def __init__(self):
+            pass
+
+        def __call__(self, prompt, text):
+            return "stub summary"
+
+    create_tables()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(REVIEW_COUNT, seed=30), today - timedelta(days=40), today - timedelta(hours=1),
+              random.Random(30))
+    store_calls = []
+
+    def fetch_reviews(*args, **kwargs):
+        store_calls.append(kwargs.get('continuation_token'))
+        return store(*args, **kwargs)
+
+    lf.reviews = fetch_reviews
+    lf.LLM = StubLLM
+
+    dynamodb_calls = Counter()
+    lf.dynamodb.meta.client.meta.events.register(
+        'provide-client-params.dynamodb.*',
+        lambda params, model, **kwargs: dynamodb_calls.update([model.name]))
+
+    def request():
+        store_calls.clear()
+        dynamodb_calls.clear()
+        start = time.perf_counter()
+        response = lf.lambda_handler({'body': {'request_type': 'summary', 'app_id': APP_ID,
+                                               'google_id': 'check-user'}}, None)
+        seconds = time.perf_counter() - start
+        assert response['statusCode'] == 200, response
+        return json.loads(response['body']), seconds, len(store_calls), dict(dynamodb_calls)
+
+    first, first_seconds, _, _ = request()
+
+    def timed(get_cached_summary):
+        lf.get_cached_summary = get_cached_summary
+        runs = [request() for _ in range(REPEAT)]
+        return runs[-1][0], min(run[1] for run in runs), runs[-1][2], runs[-1][3]
+
+    pre_check = lf.get_cached_summary
+    full_body, full_seconds, full_store, full_calls = timed(lambda app_id, summary_mode=None: None)
+    fast_body, fast_seconds, fast_store, fast_calls = timed(pre_check)
+
+    print(f"{REVIEW_COUNT} stored reviews, first summary (LLM) {first_seconds:.2f}s")
+    print(f"{'repeat request':<16} {'ms':>8} {'store calls':>12}  DynamoDB calls")
+    for name, seconds, store_count, calls in [('full path', full_seconds, full_store, full_calls),
+                                             ('pre-check', fast_seconds, fast_store, fast_calls)]:
+        print(f"{name:<16} {seconds * 1000:>8.1f} {store_count:>12}  {calls}")
+    # review_count 는 요약을 만든 요청의 윈도우 리뷰 수 (기존 경로는 요청마다 윈도우를 다시 읽음)
+    same = {key: value for key, value in full_body.items() if key != 'review_count'} == \
+        {key: value for key, value in fast_body.items() if key != 'review_count'}
+    ok = not first['cached'] and same and fast_body['cached'] and fast_store == 0 and \
+        fast_body['review_count'] == first['review_count']
+    print(f"pre-check returns the same cached summary without scraping: {ok}")
+
+    # 오늘 수집하지 않은 앱: 워터마크 갱신 시각을 어제로 -> 기존 경로
+    state = lf.ingest_state_table.get_item(Key={'app_id': APP_ID})['Item']
+    lf.ingest_state_table.put_item(Item={**state, 'updated_at': (today - timedelta(hours=1)).isoformat()})
+    stale_ok = pre_check(APP_ID) is None
+    # review_count 없이 저장된 이전 요약 -> 기존 경로
+    lf.ingest_state_table.put_item(Item=state)
+    summary_item = lf.get_latest_summary(APP_ID)
+    lf.app_summary_table.put_item(Item={key: value for key, value in summary_item.items() if key != 'review_count'})
+    legacy_ok = pre_check(APP_ID) is None
+    print(f"falls back when not crawled today: {stale_ok}, for items without review_count: {legacy_ok}")
+    return ok and stale_ok and legacy_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,177 @@
+"""
+비동기 요약 작업(summary_jobs) 응답 시간 / 대기 시간 측정 스크립트
+
+moto 로 만든 DynamoDB 와 스토어 스텁, LLM_SECONDS 만큼 기다리는 스텁 LLM 으로 다음을 측정합니다.
+- 동기 summary 요청의 응답 시간 (수집 + 샘플링 + LLM 호출이 모두 요청 안에서 실행)
+- summary_submit 응답 시간과, 앱 APP_COUNT 개의 작업을 한꺼번에 제출했을 때 작업별
+  대기 시간(queue_seconds: 제출 → 워커 시작), 실행 시간(run_seconds), 제출부터 결과 조회까지의 시간
+  (로컬 워커 SUMMARY_LOCAL_WORKERS 개가 처리하므로 뒤에 제출한 작업일수록 대기 시간이 길어짐)
+다음도 확인합니다 (다르면 종료 코드 1).
+- 작업 결과가 같은 앱의 동기 summary 결과와 같은 형식이고 AppSummary 에 저장됨
+- 이미 끝난 작업을 다시 실행해도(비동기 호출 중복 전달) 실행되지 않음
+- LLM 오류는 'failed' 와 error 로 보고, 없는 job_id 는 404, job_id 없는 요청은 400
+- 워커가 시작하지 않아 SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS 넘게 'queued' 인 작업은 'failed' 로 보고하고,
+  늦게 도착한 워커는 실행하지 않음
+- 람다 안(AWS_LAMBDA_FUNCTION_NAME)에서 SUMMARY_WORKER_FUNCTION 이 없으면 로컬 스레드 풀로 넘기지 않고 오류 응답
+
+사용법: python benchmark_summary_jobs.py [LLM 호출 시간(초)]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.pop('SUMMARY_WORKER_FUNCTION', None)
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+LLM_SECONDS = 1.0
+APP_COUNT = 6
+REVIEWS_PER_APP = 600
+POLL_SECONDS = 0.05
+
+
+def run_benchmark(llm_seconds):
+    import lambda_function as lf
+    import summary_jobs
+    from llm import LLM
+
+    llm_calls = []
+
+    class StubLLM(LLM):
+        """샘플링은 그대로 두고 요약 생성만 llm_seconds 기다린 뒤 고정 문자열로 대체"""
+
+        def __init__(self):
+            pass
+
+        def __call__(self, prompt, text):
+            if 'fail' in text:
+                raise ValueError("Failed to call OpenAI API: stub error")
+            llm_calls.append(len(text))
+            time.sleep(llm_seconds)
+            return "stub summary"
+
+    create_tables()
+    app_info_table = boto3.resource('dynamodb').Table('AppInfo')
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    stores = {}
+    for i in range(APP_COUNT + 2):
+        app_id = f"check.summary.app{i}"
+        app_info_table.put_item(Item={'app_id': app_id, 'name': f"Summary job app {i}"})
+        stores[app_id] = FakeStore()
+        stores[app_id].add(generate_reviews(REVIEWS_PER_APP, seed=i), today - timedelta(days=30),
+                           today - timedelta(days=1), random.Random(i))
+    # 실패 확인용 앱: 모든 리뷰에 'fail' 포함
+    failing_app = f"check.summary.app{APP_COUNT + 1}"
+    for review in stores[failing_app].reviews:
+        review['content'] = f"fail {review['content']}"
+
+    lf.reviews = lambda app_id, **kwargs: stores[app_id](app_id, **kwargs)
+    lf.LLM = StubLLM
+
+    def request(body):
+        start = time.perf_counter()
+        response = lf.lambda_handler({'body': body}, None)
+        return response['statusCode'], json.loads(response['body']), time.perf_counter() - start
+
+    def wait_for(job_id):
+        while True:
+            status, job, _ = request({'request_type': 'summary_status', 'job_id': job_id})
+            if job['status'] in ('done', 'failed'):
+                return job
+            time.sleep(job['poll_after_seconds'] if POLL_SECONDS is None else POLL_SECONDS)
+
+    ok = True
+
+    # 1. 동기 summary
+    sync_app = f"check.summary.app{APP_COUNT}"
+    status, sync_body, sync_seconds = request({'request_type': 'summary', 'app_id': sync_app, 'google_id': 'u'})
+    ok = ok and status == 200 and sync_body['summary'] == "stub summary"
+
+    # 2. 작업 APP_COUNT 개를 한꺼번에 제출
+    submitted = []
+    start = time.perf_counter()
+    for i in range(APP_COUNT):
+        status, job, seconds = request({'request_type': 'summary_submit', 'app_id': f"check.summary.app{i}",
+                                        'google_id': 'u'})
+        ok = ok and status == 202 and job['status'] in ('queued', 'running')
+        submitted.append((job['job_id'], seconds))
+    jobs = []
+    for job_id, submit_seconds in submitted:
+        job = wait_for(job_id)
+        jobs.append((job, submit_seconds, time.perf_counter() - start))
+
+    print(f"stub LLM call {llm_seconds:.2f}s, {REVIEWS_PER_APP} reviews per app, "
+          f"local workers {summary_jobs.SUMMARY_LOCAL_WORKERS}")
+    print(f"synchronous summary response: {sync_seconds:.2f}s")
+    print(f"{'job':<4} {'status':<7} {'submit ms':>10} {'queue s':>8} {'run s':>7} {'result after s':>15}")
+    for i, (job, submit_seconds, done_seconds) in enumerate(jobs):
+        print(f"{i:<4} {job['status']:<7} {submit_seconds * 1000:>10.1f} {job['queue_seconds']:>8.2f} "
+              f"{job['run_seconds']:>7.2f} {done_seconds:>15.2f}")
+        result = job.get('result') or {}
+        stored = lf.get_latest_summary(job['app_id'])
+        ok = ok and job['status'] == 'done' and result.get('summary') == "stub summary" and \
+            set(result) == set(sync_body) and stored is not None and stored['end_date'] in result['date_range']
+
+    # 3. 중복 전달된 작업은 다시 실행하지 않음
+    calls = len(llm_calls)
+    rerun = summary_jobs.run_summary_job(jobs[0][0]['job_id'])
+    ok_rerun = rerun is None and len(llm_calls) == calls
+    print(f"duplicate delivery of a finished job is ignored: {ok_rerun}")
+
+    # 4. 오류 / 잘못된 요청
+    _, failed_job, _ = request({'request_type': 'summary_submit', 'app_id': failing_app, 'google_id': 'u'})
+    failed_job = wait_for(failed_job['job_id'])
+    missing_status, _, _ = request({'request_type': 'summary_status', 'job_id': 'missing'})
+    no_id_status, _, _ = request({'request_type': 'summary_status'})
+    ok_errors = failed_job['status'] == 'failed' and 'stub error' in failed_job['error'] and \
+        missing_status == 404 and no_id_status == 400
+    print(f"LLM error reported as failed, unknown job 404, missing job_id 400: {ok_errors}")
+
+    # 5. 워커가 시작하지 않은 작업 (제출 시각을 대기 제한 시간보다 앞으로)
+    stale_job = summary_jobs.new_summary_job('check.summary.app0', 'u')
+    stale_job['submitted_at'] = (datetime.now() - timedelta(
+        seconds=summary_jobs.SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS + 60)).isoformat()
+    summary_jobs.summary_job_table.put_item(Item=stale_job)
+    _, stale_status, _ = request({'request_type': 'summary_status', 'job_id': stale_job['job_id']})
+    calls = len(llm_calls)
+    late_run = summary_jobs.run_summary_job(stale_job['job_id'])
+    ok_queue = stale_status['status'] == 'failed' and 'did not start' in stale_status['error'] and \
+        late_run is None and len(llm_calls) == calls
+    print(f"job queued past {summary_jobs.SUMMARY_JOB_QUEUE_TIMEOUT_SECONDS}s reported as failed, "
+          f"late worker skipped: {ok_queue}")
+
+    # 6. 람다 안에서 워커 함수 설정이 없으면 작업을 스레드 풀에 넘기지 않음
+    os.environ['AWS_LAMBDA_FUNCTION_NAME'] = 'check-summary-jobs'
+    try:
+        lambda_status, lambda_body, _ = request({'request_type': 'summary_submit', 'app_id': 'check.summary.app1',
+                                                 'google_id': 'u'})
+    finally:
+        del os.environ['AWS_LAMBDA_FUNCTION_NAME']
+    queued = summary_jobs.summary_job_table.scan(
+        FilterExpression=Attr('status').eq('queued'))['Items']
+    ok_lambda = lambda_status == 500 and 'SUMMARY_WORKER_FUNCTION' in lambda_body['error'] and \
+        not [job for job in queued if job['job_id'] != stale_job['job_id']]
+    print(f"summary_submit inside Lambda without SUMMARY_WORKER_FUNCTION refused ({lambda_status}): {ok_lambda}")
+
+    return ok and ok_rerun and ok_errors and ok_queue and ok_lambda
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else LLM_SECONDS
+    with mock_aws():
+        sys.exit(0 if run_benchmark(seconds) else 1)
@@ -0,0 +1,146 @@
+"""
+리뷰 일괄 쓰기(dynamodb_writer.BatchWriter) 확인 스크립트
+
+moto 로 만든 DynamoDB 에 save_reviews_to_dynamodb 로 리뷰를 저장하며 다음을 확인합니다.
+새 리뷰는 일별 집계와 함께 트랜잭션으로 쓰고, 이미 있는 리뷰를 바뀐 내용 없이 다시 쓸 때만 BatchWriter 를 씁니다.
+- 정상: 같은 날 같은 사용자의 리뷰(같은 키)가 섞여도 거부되지 않고, 같은 리뷰를 다시 저장하면
+  (새 리뷰 트랜잭션은 취소되고 덮어쓰기 트랜잭션 없이) BatchWriteItem 이 ceil(고유 키 수 / 25) 번만 호출되며 일별 집계는 그대로
+- 반환된 저장 항목은 실제로 저장된 행과 같음 (같은 키는 한 번만, 다른 요청으로 나뉘어 다시 써도 한 번만)
+- UnprocessedItems: 다시 저장할 때 클라이언트가 일부 항목을 처리하지 않은 것으로 돌려줘도 재전송으로 모두 저장되고 지표에 기록됨
+- 계속 처리되지 않음: 재시도 후 UnprocessedItemsError 가 발생하고 실패 항목 수가 지표에 기록됨
+하나라도 어긋나면 종료 코드 1 로 종료합니다.
+"""
+
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+REVIEW_COUNT = 240
+
+
+class FlakyClient:
+    """batch_write_item 요청마다 일부 항목을 보내지 않고 UnprocessedItems 로 돌려주는 클라이언트 래퍼"""
+
+    def __init__(self, client, unprocessed_ratio, seed=0):
+        self.client = client
+        self.unprocessed_ratio = unprocessed_ratio
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def batch_write_item(self, RequestItems):
+        self.calls += 1
+        (table_name, requests), = RequestItems.items()
+        unprocessed = [request for request in requests if self._rng.random() < self.unprocessed_ratio]
+        processed = [request for request in requests if request not in unprocessed]
+        if processed:
+            self.client.batch_write_item(RequestItems={table_name: processed})
+        return {'UnprocessedItems': {table_name: unprocessed} if unprocessed else {}}
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def make_reviews(count, seed):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(count, seed=seed), today - timedelta(days=10), today - timedelta(days=1),
+              random.Random(seed))
+    return store.reviews
+
+
+def stored_ids(lf, app_id):
+    return {item['reviewId'] for item in lf.iter_app_reviews(app_id, ['reviewId'])}
+
+
+def run_check():
+    import lambda_function as lf
+    import dynamodb_writer
+    from dynamodb_writer import UnprocessedItemsError
+    from review_stats import REVIEW_KEY_NAMES, get_daily_stats
+
+    create_tables()
+    real_client = dynamodb_writer.dynamodb_client
+    all_ok = True
+
+    # 1) 정상 저장: 같은 키(같은 날, 같은 사용자)의 리뷰를 하나 섞음
+    app_id = 'check.writer.normal'
+    reviews_data = make_reviews(REVIEW_COUNT, seed=1)
+    reviews_data.insert(1, {**reviews_data[0], 'reviewId': 'review-same-key', 'content': reviews_data[1]['content']})
+    # 다른 BatchWriteItem 요청으로 같은 키를 다시 씀 (나중 항목이 남음)
+    reviews_data.append({**reviews_data[50], 'reviewId': 'review-same-key-late'})
+    calls = {'BatchWriteItem': 0, 'TransactWriteItems': 0}
+
+    def count_writes(params, event_name, **kwargs):
+        calls[event_name.rsplit('.', 1)[-1]] += 1
+
+    for operation in calls:
+        real_client.meta.events.register(f'provide-client-params.dynamodb.{operation}', count_writes)
+    saved = lf.save_reviews_to_dynamodb(app_id, reviews_data)
+    first_calls = dict(calls)
+    stats = get_daily_stats(app_id)
+    # 같은 리뷰를 다시 저장: 새 리뷰 트랜잭션은 조건이 틀려 취소되고, 바뀐 내용이 없으므로 BatchWriter 로만 씀
+    calls.update({operation: 0 for operation in calls})
+    lf.save_reviews_to_dynamodb(app_id, reviews_data)
+    for operation in calls:
+        real_client.meta.events.unregister(f'provide-client-params.dynamodb.{operation}', count_writes)
+    stored = stored_ids(lf, app_id)
+    ok = (len(saved) == len(stored) == REVIEW_COUNT and {item['reviewId'] for item in saved} == stored and
+          {'review-same-key', 'review-same-key-late'} <= stored and first_calls['BatchWriteItem'] == 0 and
+          calls == {'BatchWriteItem': -(-REVIEW_COUNT // 25), 'TransactWriteItems': first_calls['TransactWriteItems']} and
+          get_daily_stats(app_id) == stats and sum(day['count'] for day in stats) == REVIEW_COUNT)
+    all_ok = all_ok and ok
+    print(f"normal: {len(saved)} saved, {len(stored)} stored, {first_calls['TransactWriteItems']} TransactWriteItems calls, "
+          f"{calls['BatchWriteItem']} BatchWriteItem calls on re-save{'' if ok else '  CHECK FAILED'}")
+
+    # 2) 일부 항목이 UnprocessedItems 로 돌아옴 -> 재전송으로 모두 저장
+    app_id = 'check.writer.unprocessed'
+    reviews_data = make_reviews(REVIEW_COUNT, seed=2)
+    lf.save_reviews_to_dynamodb(app_id, reviews_data)
+    flaky = FlakyClient(real_client, unprocessed_ratio=0.3)
+    dynamodb_writer.dynamodb_client = flaky
+    try:
+        before = dynamodb_writer.write_totals.snapshot()
+        lf.save_reviews_to_dynamodb(app_id, reviews_data)
+        after = dynamodb_writer.write_totals.snapshot()
+    finally:
+        dynamodb_writer.dynamodb_client = real_client
+    stored = stored_ids(lf, app_id)
+    retries = after.unprocessed_retries - before.unprocessed_retries
+    ok = (len(stored) == REVIEW_COUNT and retries > 0 and after.items - before.items == REVIEW_COUNT and
+          after.requests - before.requests == flaky.calls and after.failed_items == before.failed_items)
+    all_ok = all_ok and ok
+    print(f"unprocessed: {len(stored)} stored, {flaky.calls} requests, {retries} retries, "
+          f"{after.unprocessed_items - before.unprocessed_items} unprocessed items{'' if ok else '  CHECK FAILED'}")
+
+    # 3) 계속 처리되지 않음 -> 재시도 후 오류
+    writer = dynamodb_writer.BatchWriter('AppReview', REVIEW_KEY_NAMES, client=FlakyClient(real_client, 1.0),
+                                         max_retries=3, sleep=lambda delay: None)
+    try:
+        with writer:
+            for i in range(10):
+                writer.put({'app_id': 'check.writer.failing', 'date_user_id': f"2026-01-01#user{i}"})
+        ok = False
+    except UnprocessedItemsError as e:
+        ok = len(e.items) == 10 and writer.metrics.failed_items == 10 and writer.metrics.requests == 4
+    all_ok = all_ok and ok
+    print(f"always unprocessed: {writer.metrics.as_dict()}{'' if ok else '  CHECK FAILED'}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
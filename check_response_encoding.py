@@ -0,0 +1,93 @@
+"""
+람다 응답 압축(response_encoding) 확인 스크립트
+
+moto 로 만든 DynamoDB 에 앱 정보를 여러 개 등록한 뒤 app_info_read 응답을 요청 방식별로 확인합니다.
+- Accept-Encoding 이 없으면 기존과 같은 평문 응답
+- 헤더 Accept-Encoding 또는 본문 accept_encoding 으로 gzip 을 요청하면 base64 + isBase64Encoded + Content-Encoding,
+  디코딩한 본문은 평문 응답과 같음
+- q=0 으로 거부한 인코딩, 지원하지 않는 인코딩만 요청한 경우, 작은 응답은 압축하지 않음
+- 요청 본문은 요청마다 한 번만 파싱하고, 잘못된 본문(JSON 오류 400, body 없음 500, JSON 목록 500)은 그대로 오류 응답
+- 문자열이 아닌 accept_encoding(목록, 숫자)은 무시하고 압축하지 않음 (처리되지 않은 예외 없음)
+하나라도 어긋나면 종료 코드 1 로 종료합니다.
+"""
+
+import os
+import sys
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from check_review_snapshot import create_tables
+
+APP_COUNT = 30
+
+
+def run_check():
+    import lambda_function as lf
+    from response_encoding import brotli, decode_response_body
+
+    create_tables()
+    for i in range(APP_COUNT):
+        lf.app_info_table.put_item(Item={'app_id': f"check.encoding.app{i}", 'app_name': f"압축 확인용 앱 {i}"})
+
+    def call(headers=None, **body):
+        event = {'body': {'request_type': 'app_info_read', **body}}
+        if headers is not None:
+            event['headers'] = headers
+        return lf.lambda_handler(event, None)
+
+    parses = []
+    cover_api_and_invoke = lf.cover_api_and_invoke
+
+    def counting_cover_api_and_invoke(event, context):
+        parses.append(event)
+        return cover_api_and_invoke(event, context)
+
+    lf.cover_api_and_invoke = counting_cover_api_and_invoke
+    plain = call()
+    cases = [
+        ('no Accept-Encoding', call(), None),
+        ('header gzip', call({'Accept-Encoding': 'gzip, deflate'}), 'gzip'),
+        ('lower-case header', call({'accept-encoding': 'gzip'}), 'gzip'),
+        ('body accept_encoding', call(accept_encoding='gzip'), 'gzip'),
+        ('gzip;q=0', call({'Accept-Encoding': 'gzip;q=0, identity'}), None),
+        ('unsupported only', call({'Accept-Encoding': 'deflate'}), None),
+        ('br, gzip', call({'Accept-Encoding': 'br, gzip'}), 'br' if brotli else 'gzip'),
+        ('small body', call({'Accept-Encoding': 'gzip'}, app_id='missing.app'), None),
+    ]
+
+    all_ok = True
+    for name, response, expected_encoding in cases:
+        encoding = (response.get('headers') or {}).get('Content-Encoding')
+        body = decode_response_body(response)
+        expected_body = plain['body'] if name != 'small body' else body
+        ok = (encoding == expected_encoding and bool(response.get('isBase64Encoded')) == bool(expected_encoding) and
+              body == expected_body)
+        all_ok = all_ok and ok
+        print(f"{name:<22} encoding={str(encoding):<5} body {len(response['body']):>6} bytes"
+              f" (plain {len(plain['body'])}){'' if ok else '  CHECK FAILED'}")
+
+    errors = [lf.lambda_handler({'body': '{not json', 'headers': {'Accept-Encoding': 'gzip'}}, None),
+              lf.lambda_handler({'headers': {'Accept-Encoding': 'gzip'}}, None),
+              lf.lambda_handler({'body': '[1,2]', 'headers': {'Accept-Encoding': 'gzip'}}, None),
+              lf.lambda_handler({'body': {'request_type': 'x', 'accept_encoding': ['gzip']}}, None),
+              call(accept_encoding=['gzip']),
+              call(accept_encoding=5)]
+    ok = len(parses) == len(cases) + 1 + len(errors) and \
+        [response['statusCode'] for response in errors] == [400, 500, 500, 400, 200, 200] and \
+        not any(response.get('isBase64Encoded') for response in errors) and errors[-1]['body'] == plain['body']
+    all_ok = all_ok and ok
+    print(f"{len(parses)} body parses for {len(cases) + 1 + len(errors)} requests, malformed body status "
+          f"{[response['statusCode'] for response in errors]}{'' if ok else '  CHECK FAILED'}")
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
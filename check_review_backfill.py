@@ -0,0 +1,125 @@
+"""
+과거 리뷰 백필(review_backfill) 확인 스크립트
+
+moto 로 만든 DynamoDB 와 로컬 스토어 스텁으로, 일반 수집이 최근 2개월만 저장한 앱의 과거 리뷰를
+호출당 BACKFILL_PAGES_PER_CALL 페이지씩 여러 번의 run_backfill 호출로 끝까지 받습니다.
+중간 호출 하나는 스토어 오류로 중단시키고, 하나는 남은 시간이 부족한 상태로 호출합니다.
+다음을 확인하고 하나라도 어긋나면 종료 코드 1 로 종료합니다.
+- 스토어의 모든 리뷰가 한 번씩만 저장되고 체크포인트 status 가 'done'
+- 중단된 호출 다음 호출은 체크포인트에서 이어받음 (같은 토큰으로 두 번 받은 페이지 없음)
+- 남은 시간이 부족하면 페이지를 받지 않고 체크포인트를 그대로 둠
+- 오래된 pages 값으로 체크포인트를 저장하면 BackfillConflictError
+- google_play_scraper 의 continuation_token 이 DynamoDB 저장 후에도 같은 값으로 복원됨
+"""
+
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+APP_ID = 'check.backfill.app'
+STORE_REVIEWS = 3000
+HISTORY_DAYS = 400
+BACKFILL_PAGES_PER_CALL = 4
+FAILING_CALL = 6
+
+
+class CountingStore:
+    """FakeStore 호출 수를 세고, FAILING_CALL 번째 호출에서 한 번 오류를 냄"""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = 0
+        self.tokens = []
+
+    def __call__(self, app_id, continuation_token=None, **kwargs):
+        self.calls += 1
+        if self.calls == FAILING_CALL:
+            raise ConnectionError("stub store failure")
+        self.tokens.append(continuation_token)
+        return self.store(app_id, continuation_token=continuation_token, **kwargs)
+
+
+def run_check():
+    import lambda_function as lf
+    import review_backfill as rb
+    from google_play_scraper.features.reviews import _ContinuationToken
+
+    create_tables()
+    lf.app_info_table.put_item(Item={'app_id': APP_ID, 'app_name': APP_ID})
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    store = FakeStore()
+    store.add(generate_reviews(STORE_REVIEWS, seed=7), today - timedelta(days=HISTORY_DAYS),
+              today - timedelta(days=1), random.Random(7))
+    all_ok = True
+
+    # 일반 수집: 최근 2개월만 저장됨
+    lf.refresh_app_reviews(lf.ReviewSnapshot(APP_ID, lf.DEDUP_REVIEW_FIELDS), store)
+    regular_count = len(list(lf.iter_app_reviews(APP_ID, ['reviewId'])))
+
+    counting = CountingStore(store)
+    invocations = []
+    state = {'status': 'running'}
+    while state['status'] == 'running' and len(invocations) < 20:
+        try:
+            state = rb.run_backfill(APP_ID, max_pages=BACKFILL_PAGES_PER_CALL, fetch_reviews=counting)
+            invocations.append(('ok', int(state['pages'])))
+        except ConnectionError:
+            invocations.append(('failed', int(rb.get_backfill_state(APP_ID)['pages'])))
+        if len(invocations) == 2:
+            # 남은 시간이 부족한 호출: 페이지를 받지 않음
+            before = counting.calls
+            short = rb.run_backfill(APP_ID, time_left=lambda: rb.BACKFILL_SAFETY_SECONDS - 1, fetch_reviews=counting)
+            ok = counting.calls == before and short['pages'] == rb.get_backfill_state(APP_ID)['pages']
+            all_ok = all_ok and ok
+            print(f"short on time: pages stay at {int(short['pages'])}{'' if ok else '  CHECK FAILED'}")
+
+    items = list(lf.iter_app_reviews(APP_ID, ['reviewId']))
+    stored_ids = [item['reviewId'] for item in items]
+    store_pages = -(-STORE_REVIEWS // 200)
+    # 오류 난 호출은 토큰을 쓰지 않았으므로, 같은 토큰으로 두 번 받은 페이지가 없어야 함
+    ok = (state['status'] == 'done' and len(items) == STORE_REVIEWS and
+          set(stored_ids) == {review['reviewId'] for review in store.reviews} and
+          len(counting.tokens) == store_pages and len(set(counting.tokens)) == store_pages and
+          ('failed', 5) in invocations)
+    all_ok = all_ok and ok
+    print(f"regular crawl stored {regular_count}, backfill invocations {invocations}")
+    print(f"backfill: {len(items)} stored of {STORE_REVIEWS}, {int(state['reviews_saved'])} saved by backfill, "
+          f"{counting.calls} store calls for {store_pages} pages{'' if ok else '  CHECK FAILED'}")
+
+    # 오래된 pages 로 저장 -> 충돌
+    try:
+        rb.save_backfill_state(dict(state), int(state['pages']) - 1)
+        ok = False
+    except rb.BackfillConflictError:
+        ok = True
+    all_ok = all_ok and ok
+    print(f"stale checkpoint rejected: {ok}")
+
+    # google_play_scraper 토큰 저장/복원
+    token = _ContinuationToken('CpUBCpIBQVA', 'ko', 'kr', 2, 200, None, None)
+    rb.backfill_state_table.put_item(Item={'app_id': 'check.backfill.token',
+                                           'continuation_token': rb.encode_continuation_token(token)})
+    restored = rb.decode_continuation_token(rb.get_backfill_state('check.backfill.token')['continuation_token'])
+    ok = all(getattr(restored, name) == getattr(token, name) for name in _ContinuationToken.__slots__)
+    all_ok = all_ok and ok
+    print(f"continuation token round trip: {ok}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
@@ -0,0 +1,149 @@
+"""
+일괄 리뷰 수집기(review_crawler) 확인 스크립트
+
+moto 로 만든 DynamoDB 와 로컬 스크레이퍼 스텁으로 crawl_all_apps 를 실행합니다.
+스텁은 호출마다 지연 시간을 두고 일정 비율로 일시적 오류를 내며, 한 앱은 항상 실패합니다.
+다음을 확인하고 하나라도 어긋나면 종료 코드 1 로 종료합니다.
+- 항상 실패하는 앱만 failed_apps 에 기록되고 나머지 앱의 리뷰는 모두 저장됨
+- 일시적 오류는 재시도로 복구됨
+- 어느 1초 구간에서도 스토어 호출 수가 requests_per_second + burst 를 넘지 않음
+- 워커 스레드(수집 워커, ReviewWriter)가 스레드 안전하지 않은 boto3 Table 리소스를 쓰지 않음
+- get_all_app_info 가 AppInfo scan 의 모든 페이지를 읽음
+워커 수별 처리량(apps/sec, reviews/sec)도 출력합니다.
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+APPS_PER_RUN = 12
+REVIEWS_PER_APP = 600
+STUB_LATENCY = 0.5
+STUB_FAILURE_RATE = 0.1
+REQUESTS_PER_SECOND = 4.0
+BURST = 2
+WORKER_COUNTS = [1, 4]
+
+
+class StubScraper:
+    """google_play_scraper.reviews 로컬 스텁: 앱별 FakeStore 를 지연/일시적 오류와 함께 제공"""
+
+    def __init__(self, stores, broken_apps, seed=0):
+        self.stores = stores
+        self.broken_apps = set(broken_apps)
+        self.call_times = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, app_id, count=200, continuation_token=None, **kwargs):
+        with self._lock:
+            self.call_times.append(time.monotonic())
+            transient_failure = self._rng.random() < STUB_FAILURE_RATE
+        time.sleep(STUB_LATENCY)
+        if app_id in self.broken_apps:
+            raise ConnectionError("stub store unavailable")
+        if transient_failure:
+            raise ConnectionError("stub transient failure")
+        return self.stores[app_id](app_id, count=count, continuation_token=continuation_token)
+
+    def max_calls_per_second(self):
+        times = sorted(self.call_times)
+        return max(sum(1 for other in times[i:] if other < start + 1.0) for i, start in enumerate(times))
+
+
+class ThreadGuardTable:
+    """boto3 Table 대리 객체: 메인 스레드가 아닌 스레드에서 호출한 Table 메서드를 기록"""
+
+    def __init__(self, table, calls):
+        self._table = table
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attribute = getattr(self._table, name)
+        if callable(attribute) and threading.current_thread() is not threading.main_thread():
+            self._calls.append(f"{self._table.name}.{name} ({threading.current_thread().name})")
+        return attribute
+
+
+def run_check():
+    import lambda_function as lf
+    from review_crawler import crawl_all_apps
+
+    create_tables()
+    worker_table_calls = []
+    for name in ('app_info_table', 'app_review_table', 'app_summary_table', 'ingest_state_table'):
+        setattr(lf, name, ThreadGuardTable(getattr(lf, name), worker_table_calls))
+    app_info_table = boto3.resource('dynamodb').Table('AppInfo')
+    rng = random.Random(0)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    all_ok = True
+    print(f"{'workers':>7} {'apps':>5} {'failed':>6} {'reviews':>8} {'retries':>7} {'max calls/s':>12} "
+          f"{'apps/s':>7} {'reviews/s':>10}")
+    for run, workers in enumerate(WORKER_COUNTS):
+        app_ids = [f"check.crawler.run{run}.app{i}" for i in range(APPS_PER_RUN)]
+        stores = {}
+        for i, app_id in enumerate(app_ids):
+            app_info_table.put_item(Item={'app_id': app_id, 'app_name': app_id})
+            stores[app_id] = FakeStore()
+            stores[app_id].add(generate_reviews(REVIEWS_PER_APP, seed=run * 100 + i),
+                               today - timedelta(days=30), today - timedelta(days=1), rng)
+        scraper = StubScraper(stores, broken_apps=[app_ids[0]], seed=run)
+
+        report = crawl_all_apps(app_ids, max_workers=workers, requests_per_second=REQUESTS_PER_SECOND,
+                                burst=BURST, backoff_base=0.05, fetch_reviews=scraper)
+
+        stored_counts = [len(list(lf.iter_app_reviews(app_id, ['reviewId']))) for app_id in app_ids]
+        max_rate = scraper.max_calls_per_second()
+        ok = (
+            [failed['app_id'] for failed in report['failed_apps']] == [app_ids[0]] and
+            stored_counts == [0] + [REVIEWS_PER_APP] * (APPS_PER_RUN - 1) and
+            report['reviews_saved'] == REVIEWS_PER_APP * (APPS_PER_RUN - 1) and
+            report['retries'] > 0 and
+            max_rate <= REQUESTS_PER_SECOND + BURST
+        )
+        all_ok = all_ok and ok
+        print(f"{workers:>7} {report['apps']:>5} {len(report['failed_apps']):>6} {report['reviews_saved']:>8} "
+              f"{report['retries']:>7} {max_rate:>12} {report['apps_per_second']:>7.2f} "
+              f"{report['reviews_per_second']:>10.1f}{'' if ok else '  CHECK FAILED'}")
+
+    thread_ok = not worker_table_calls
+    all_ok = all_ok and thread_ok
+    print(f"Table resource calls from worker threads: {worker_table_calls[:5] or 'none'}"
+          f"{'' if thread_ok else '  CHECK FAILED'}")
+
+    # AppInfo scan 을 페이지당 5개로 제한해 여러 페이지를 읽게 함 (제한 없이는 한 페이지)
+    expected_apps = len(lf.get_all_app_info())
+    scan_pages = []
+
+    def limit_scan(params, **kwargs):
+        params['Limit'] = 5
+        scan_pages.append(params['TableName'])
+
+    lf.dynamodb.meta.client.meta.events.register('provide-client-params.dynamodb.Scan', limit_scan)
+    app_count = len(lf.get_all_app_info())
+    paging_ok = app_count == expected_apps >= APPS_PER_RUN * len(WORKER_COUNTS) and len(scan_pages) > 1
+    all_ok = all_ok and paging_ok
+    print(f"get_all_app_info: {app_count} apps over {len(scan_pages)} scan pages{'' if paging_ok else '  CHECK FAILED'}")
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
@@ -0,0 +1,278 @@
+"""
+요청당 AppReview 조회 횟수 확인 스크립트
+
+moto 로 만든 DynamoDB 에서 app_review_read / summary 요청을 실행하고,
+요청 하나가 AppReview 테이블에 보낸 Query 페이지 수를 셉니다 (P = 파티션 전체를 읽는 페이지 수).
+- app_review_read: 응답에 필요한 파티션 적재 P 만 (최신 리뷰 날짜, 중복 확인은 메모리에서 처리)
+- summary (수집 워터마크 있음): 최신 리뷰 날짜 조회 1 + 유사 중복 확인용 최근 리뷰 + 요약 윈도우 조회
+- summary (워터마크 손상): 최신 리뷰 날짜 조회 1 + 파티션 적재 P (요약 윈도우는 메모리에서 처리)
+응답 내용이 요청 후 테이블 상태와 같은지, 워터마크가 다시 만들어졌는지,
+유사 중복 리뷰가 near_duplicate 로 표시되어 저장되고 요약 윈도우에서 빠지는지,
+merge 한 리뷰가 페이지마다 다시 정렬하지 않고도 정렬된 순서로 읽히는지도 확인하며,
+하나라도 다르면 종료 코드 1 로 종료합니다.
+
+Google Play 스크레이퍼와 LLM 호출은 가짜 구현으로 바꾸어 실행합니다.
+"""
+
+import os
+import sys
+import copy
+import json
+import types
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+
+APP_ID = 'check.snapshot.app'
+INITIAL_REVIEWS = 3000
+NEW_REVIEWS = 50
+NEAR_DUPLICATE_REVIEWS = 3
+
+
+class FakeStore:
+    """google_play_scraper.reviews 대체: 최신순 리뷰 목록을 count 개씩 돌려줌"""
+
+    def __init__(self):
+        self.reviews = []
+
+    def add(self, texts, start, end, rng):
+        for text in texts:
+            self.reviews.append({
+                'reviewId': f"review-{len(self.reviews)}",
+                'userName': f"user{len(self.reviews)}",
+                'content': text,
+                'score': rng.randint(1, 5),
+                'at': start + (end - start) * rng.random(),
+            })
+        self.reviews.sort(key=lambda review: review['at'], reverse=True)
+
+    def __call__(self, app_id, count=200, continuation_token=None, **kwargs):
+        offset = continuation_token or 0
+        batch = self.reviews[offset:offset + count]
+        next_token = offset + count if offset + count < len(self.reviews) else None
+        return batch, next_token
+
+
+def patch_moto_transactions():
+    """
+    moto 의 TransactWriteItems 를 확인 스크립트에서 쓸 수 있게 바꿉니다.
+    - 롤백에 대비해 트랜잭션 항목마다 테이블 전체를 deepcopy 하므로 (리뷰 99 개를 쓰는 트랜잭션이면 AppReview 를
+      99 번 복사) 한 호출 안에서는 테이블마다 한 번만 복사하고, Update 가 없는 테이블은 항목 사전만 복사
+      (Put/Delete 는 저장된 Item 을 바꾸지 않고 사전의 값을 바꿈)
+    - 복사하는 동안 다른 스레드의 쓰기가 테이블을 바꾸면 실패하므로 DynamoDB 요청을 하나씩 처리
+      (실제 DynamoDB 처럼 요청 하나가 원자적으로 반영됨)
+    """
+    from moto.dynamodb import models
+    from moto.dynamodb.models.table import Table
+    from moto.dynamodb.responses import DynamoHandler
+    if isinstance(models.copy, types.SimpleNamespace):
+        return
+    deepcopy = copy.deepcopy
+    transaction = None
+
+    def copy_table(table):
+        if table.name in transaction['updated']:
+            return deepcopy(table)
+        table_copy = copy.copy(table)
+        table_copy.items = defaultdict(dict, {
+            hash_key: dict(items) if table.has_range_key else items for hash_key, items in table.items.items()})
+        return table_copy
+
+    def copy_once(value, memo=None):
+        if transaction is None or not isinstance(value, Table):
+            return deepcopy(value, memo)
+        copies = transaction['copies']
+        if id(value) not in copies:
+            copies[id(value)] = copy_table(value)
+        return copies[id(value)]
+
+    transact_write_items = models.DynamoDBBackend.transact_write_items
+
+    def transact_write_items_copying_once(self, transact_items):
+        nonlocal transaction
+        transaction = {'copies': {},
+                       'updated': {op['TableName'] for item in transact_items for kind, op in item.items()
+                                   if kind == 'Update'}}
+        try:
+            return transact_write_items(self, transact_items)
+        finally:
+            transaction = None
+
+    call_action = DynamoHandler.call_action
+    lock = threading.Lock()
+
+    def call_action_one_at_a_time(self):
+        with lock:
+            return call_action(self)
+
+    models.copy = types.SimpleNamespace(deepcopy=copy_once)
+    models.DynamoDBBackend.transact_write_items = transact_write_items_copying_once
+    DynamoHandler.call_action = call_action_one_at_a_time
+
+
+def create_tables():
+    patch_moto_transactions()
+    dynamodb = boto3.resource('dynamodb')
+    key_schemas = {
+        'AppInfo': [('app_id', 'HASH')],
+        'AppReview': [('app_id', 'HASH'), ('date_user_id', 'RANGE')],
+        'AppSummary': [('app_id', 'HASH'), ('end_date', 'RANGE')],
+        'AppIngestState': [('app_id', 'HASH')],
+        'AppBackfillState': [('app_id', 'HASH')],
+        'AppReviewDaily': [('app_id', 'HASH'), ('day', 'RANGE')],
+        'AppSummaryJob': [('job_id', 'HASH')],
+        'AppSummaryLock': [('lock_key', 'HASH')],
+    }
+    for table_name, keys in key_schemas.items():
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': name, 'KeyType': key_type} for name, key_type in keys],
+            AttributeDefinitions=[{'AttributeName': name, 'AttributeType': 'S'} for name, _ in keys],
+            BillingMode='PAY_PER_REQUEST'
+        )
+    dynamodb.Table('AppInfo').put_item(Item={'app_id': APP_ID, 'name': 'Snapshot check app'})
+
+
+def run_check():
+    import lambda_function as lf
+    from serializer import dumps
+    from llm import LLM
+
+    class StubLLM(LLM):
+        """샘플링은 그대로 두고 요약 생성만 고정 문자열로 대체"""
+
+        def __init__(self):
+            pass
+
+        def __call__(self, prompt, text):
+            return "stub summary"
+
+    create_tables()
+    rng = random.Random(0)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday = today - timedelta(days=1)
+    store = FakeStore()
+    store.add(generate_reviews(INITIAL_REVIEWS), today - timedelta(days=55), yesterday, rng)
+    lf.reviews = store
+    lf.LLM = StubLLM
+
+    query_pages = []
+    lf.app_review_table.meta.client.meta.events.register(
+        'provide-client-params.dynamodb.Query', lambda params, **kwargs: query_pages.append(params['TableName']))
+
+    def request(body):
+        query_pages.clear()
+        response = lf.lambda_handler({'body': body}, None)
+        assert response['statusCode'] == 200, response
+        return json.loads(response['body']), query_pages.count('AppReview')
+
+    def partition_pages():
+        pages = sum(1 for _ in lf.iter_app_review_pages(APP_ID))
+        query_pages.clear()
+        return pages
+
+    all_ok = True
+
+    def check(name, pages, expected_pages, ok):
+        nonlocal all_ok
+        all_ok = all_ok and ok and pages == expected_pages
+        print(f"{name:<38} AppReview query pages {pages:>3} (expected {expected_pages:>3})"
+              f"{'' if ok else '  RESPONSE MISMATCH'}")
+
+    def pages_of(function, *args):
+        query_pages.clear()
+        result = function(*args)
+        return result, query_pages.count('AppReview')
+
+    def watermark_matches_table():
+        watermark = lf.IngestWatermark.from_item(lf.ingest_state_table.get_item(Key={'app_id': APP_ID}).get('Item'))
+        newest = max(str(review['date']) for review in lf.iter_app_reviews(APP_ID))
+        return watermark is not None and watermark.latest_at == newest
+
+    # 새 리뷰는 항상 이전에 추가한 리뷰보다 최근 시각으로 추가 (실제 스토어와 같이)
+    # 1. 리뷰가 없는 앱의 app_review_read
+    body, pages = request({'request_type': 'app_review_read', 'app_id': APP_ID})
+    stored = list(lf.iter_app_reviews(APP_ID))
+    check("app_review_read (no stored reviews)", pages, 1,
+          body['new_reviews_added'] and body['count'] == len(stored) == INITIAL_REVIEWS and
+          watermark_matches_table())
+
+    # 2. 새 리뷰가 생긴 뒤의 app_review_read
+    store.add(generate_reviews(NEW_REVIEWS, seed=1), yesterday, yesterday + timedelta(hours=8), rng)
+    expected_pages = partition_pages()
+    body, pages = request({'request_type': 'app_review_read', 'app_id': APP_ID})
+    stored = list(lf.iter_app_reviews(APP_ID))
+    check("app_review_read (new reviews)", pages, expected_pages,
+          body['count'] == len(stored) == INITIAL_REVIEWS + NEW_REVIEWS and
+          body['reviews'] == json.loads(dumps(stored)) and
+          watermark_matches_table())
+
+    # 3. 새 리뷰가 생긴 뒤의 summary (워터마크 사용)
+    store.add(generate_reviews(NEW_REVIEWS, seed=2), yesterday + timedelta(hours=8), yesterday + timedelta(hours=16), rng)
+    _, near_duplicate_pages = pages_of(lf.ReviewSnapshot(APP_ID).recent_contents, lf.NEAR_DUPLICATE_WINDOW)
+    body, pages = request({'request_type': 'summary', 'app_id': APP_ID, 'google_id': 'check-user'})
+    review_window = lf.SamplingConfig().review_window
+    (window, read_stats), _ = pages_of(lf.get_recent_review_window, APP_ID, review_window)
+    window_dates = sorted((str(review['date']) for review in window), reverse=True)[:review_window]
+    check("summary (ingest watermark)", pages, 1 + near_duplicate_pages + read_stats['pages'],
+          body['summary'] == "stub summary" and
+          body['date_range'] == f"{window_dates[-1][:10]} ~ {window_dates[0][:10]}" and
+          len(list(lf.iter_app_reviews(APP_ID))) == INITIAL_REVIEWS + 2 * NEW_REVIEWS and
+          watermark_matches_table())
+
+    # 4. 워터마크가 손상된 뒤의 summary (저장된 리뷰로 중복 확인 상태를 다시 만듦)
+    lf.ingest_state_table.put_item(Item={'app_id': APP_ID, 'version': 1, 'latest_at': 'corrupt'})
+    store.add(generate_reviews(NEW_REVIEWS, seed=3), yesterday + timedelta(hours=16), today - timedelta(seconds=1), rng)
+    expected_pages = 1 + partition_pages()
+    body, pages = request({'request_type': 'summary', 'app_id': APP_ID, 'google_id': 'check-user'})
+    check("summary (corrupt ingest watermark)", pages, expected_pages,
+          body['summary'] == "stub summary" and
+          len(list(lf.iter_app_reviews(APP_ID))) == INITIAL_REVIEWS + 3 * NEW_REVIEWS and
+          watermark_matches_table())
+
+    # 5. 기존 리뷰를 조금 고친 스팸형 리뷰: 저장은 하되 near_duplicate 로 표시하고 요약 윈도우에서는 제외
+    newest = [review['content'] for review in lf.iter_app_reviews(APP_ID, ['content'], newest_first=True)]
+    spam = [content + "!!" for content in newest if 60 < len(content) < 390][:NEAR_DUPLICATE_REVIEWS]
+    store.add(spam, today - timedelta(seconds=1), today - timedelta(milliseconds=1), rng)
+    body, _ = request({'request_type': 'app_review_read', 'app_id': APP_ID})
+    stored = list(lf.iter_app_reviews(APP_ID))
+    flagged = {review['content'] for review in stored if review.get('near_duplicate')}
+    window, _ = lf.get_recent_review_window(APP_ID, lf.SamplingConfig().review_window)
+    ok = len(stored) == INITIAL_REVIEWS + 3 * NEW_REVIEWS + len(spam) and set(spam) <= flagged and \
+        not flagged & {review['content'] for review in window}
+    all_ok = all_ok and ok
+    print(f"{'near-duplicates stored, not summarized':<38} flagged {len(flagged & set(spam))} of {len(spam)}"
+          f"{'' if ok else '  MISMATCH'}")
+
+    # 6. 페이지별 merge 는 정렬하지 않고, 순서가 어긋난 키가 들어온 뒤 처음 읽을 때 한 번만 정렬
+    snapshot = lf.ReviewSnapshot(APP_ID).load()
+    newest_key = snapshot.reviews[-1]['date_user_id']
+    snapshot.merge([{'date_user_id': newest_key + '~1'}, {'date_user_id': newest_key + '~2'}])
+    in_order = not snapshot._unsorted
+    snapshot.merge([{'date_user_id': '0000-00-00#oldest'}])
+    keys = [review['date_user_id'] for review in snapshot.reviews]
+    ok = in_order and keys == sorted(keys) and keys[0] == '0000-00-00#oldest' and \
+        keys[-1] == newest_key + '~2' and not snapshot._unsorted
+    all_ok = all_ok and ok
+    print(f"{'merge sorts only on out-of-order keys':<38} appended in order {in_order}, "
+          f"sorted after read {keys == sorted(keys)}{'' if ok else '  MISMATCH'}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
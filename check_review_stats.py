@@ -0,0 +1,171 @@
+"""
+일별 리뷰 집계(review_stats) / app_stats 요청 확인 스크립트
+
+moto 로 만든 DynamoDB 에서 스토어 스텁의 리뷰를 두 번에 나누어 수집한 뒤(초기 수집 + 증분 수집),
+app_stats 응답이 app_review_read 로 받은 원본 리뷰에서 직접 계산한 집계와 같은지 확인합니다.
+증분 수집은 저장 도중 실패시킨 뒤 수집 워터마크를 지우고 다시 수집합니다 (실패 전에 저장된 리뷰는 중복 확인에서 건너뜀).
+rebuild_daily_stats 로 다시 계산한 집계, 이미 저장한 리뷰를 다시 저장한 뒤(수집 재시도, 백필 이어하기)의 집계,
+같은 키의 리뷰를 평점과 내용을 바꿔 다시 저장한 뒤의 집계도 저장된 리뷰와 맞아야 하며,
+app_stats 는 AppReview 를 읽지 않아야 합니다. 하나라도 다르면 종료 코드 1 로 종료합니다.
+두 요청의 DynamoDB 조회 페이지 수와 응답 크기도 출력합니다.
+"""
+
+import os
+import sys
+import json
+import random
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import APP_ID, FakeStore, create_tables
+
+INITIAL_REVIEWS = 2000
+NEW_REVIEWS = 300
+HISTORY_DAYS = 55
+
+
+def expected_stats(reviews, start_date=None):
+    """원본 리뷰에서 직접 계산한 app_stats 합계"""
+    from review_stats import LENGTH_BUCKETS, length_bucket
+
+    reviews = [review for review in reviews if not start_date or review['date'][:10] >= start_date]
+    scores = {str(score): [review for review in reviews if int(review['score']) == score] for score in range(1, 6)}
+    return {
+        'count': len(reviews),
+        'average_score': round(sum(int(review['score']) for review in reviews) / len(reviews), 3),
+        'average_length': round(sum(len(review['content']) for review in reviews) / len(reviews), 1),
+        'score_histogram': {score: len(items) for score, items in scores.items()},
+        'average_length_by_score': {
+            score: round(sum(len(review['content']) for review in items) / len(items), 1) if items else None
+            for score, items in scores.items()
+        },
+        'length_buckets': {name: sum(1 for review in reviews if length_bucket(len(review['content'])) == name)
+                           for _, name in LENGTH_BUCKETS},
+    }
+
+
+class FailingTransactions:
+    """fail_after 번째 이후의 transact_write_items 를 실패시키는 클라이언트 래퍼"""
+
+    def __init__(self, client, fail_after):
+        self.client = client
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def transact_write_items(self, **kwargs):
+        self.calls += 1
+        if self.calls > self.fail_after:
+            raise ConnectionError("stub network error")
+        return self.client.transact_write_items(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def run_check():
+    import lambda_function as lf
+    import dynamodb_writer
+    import review_stats
+    from review_stats import get_app_stats, rebuild_daily_stats
+
+    create_tables()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = random.Random(5)
+    store = FakeStore()
+    store.add(generate_reviews(INITIAL_REVIEWS, seed=5), today - timedelta(days=HISTORY_DAYS),
+              today - timedelta(days=3), rng)
+    lf.reviews = store
+
+    # 초기 수집 후 증분 수집: 첫 트랜잭션만 성공하고 실패 -> 워터마크가 없는 상태로 다시 수집
+    lf.refresh_app_reviews(lf.ReviewSnapshot(APP_ID, lf.DEDUP_REVIEW_FIELDS))
+    store.add(generate_reviews(NEW_REVIEWS, seed=6), today - timedelta(days=2), today - timedelta(seconds=1), rng)
+    snapshot = lf.ReviewSnapshot(APP_ID, lf.DEDUP_REVIEW_FIELDS)
+    latest_review_date = snapshot.latest_review_date
+    failing = FailingTransactions(review_stats.dynamodb_client, fail_after=1)
+    review_stats.dynamodb_client = failing
+    try:
+        lf.refresh_app_reviews(snapshot)
+        interrupted = False
+    except ConnectionError:
+        interrupted = True
+    finally:
+        review_stats.dynamodb_client = failing.client
+    partially_saved = len(list(lf.iter_app_reviews(APP_ID, ['date_user_id']))) - INITIAL_REVIEWS
+    # 저장된 리뷰가 이미 오늘 날짜까지 있어 refresh 는 건너뛰므로, 재시도는 실패 전 기준 날짜로 직접 수집
+    lf.ingest_state_table.delete_item(Key={'app_id': APP_ID})
+    lf.fetch_and_save_new_reviews(APP_ID, latest_review_date, lf.ReviewSnapshot(APP_ID, lf.DEDUP_REVIEW_FIELDS))
+    print(f"interrupted incremental crawl: {interrupted}, {partially_saved} reviews saved before the failure")
+
+    queries = []
+    for client in (lf.app_review_table.meta.client, dynamodb_writer.dynamodb_client):
+        client.meta.events.register('provide-client-params.dynamodb.Query',
+                                    lambda params, **kwargs: queries.append(params['TableName']))
+
+    stats_response = lf.lambda_handler({'body': {'request_type': 'app_stats', 'app_id': APP_ID}}, None)
+    stats_queries = list(queries)
+    queries.clear()
+    read_response = lf.lambda_handler({'body': {'request_type': 'app_review_read', 'app_id': APP_ID}}, None)
+    read_queries = list(queries)
+
+    stats = json.loads(stats_response['body'])
+    raw_reviews = json.loads(read_response['body'])['reviews']
+    all_ok = True
+
+    ok = stats['totals'] == expected_stats(raw_reviews) and len(raw_reviews) == INITIAL_REVIEWS + NEW_REVIEWS and \
+        interrupted and 0 < partially_saved < NEW_REVIEWS
+    all_ok = all_ok and ok
+    print(f"app_stats totals match raw reviews: {ok} ({stats['totals']['count']} reviews, {len(stats['days'])} days)")
+
+    start_date = (today - timedelta(days=10)).strftime('%Y-%m-%d')
+    ranged = get_app_stats(APP_ID, start_date)
+    ok = ranged['totals'] == expected_stats(raw_reviews, start_date)
+    all_ok = all_ok and ok
+    print(f"app_stats since {start_date} match: {ok} ({ranged['totals']['count']} reviews)")
+
+    rebuild_daily_stats(APP_ID)
+    ok = get_app_stats(APP_ID) == {key: value for key, value in stats.items()}
+    all_ok = all_ok and ok
+    print(f"rebuilt stats identical: {ok}")
+
+    # 재시도: 이미 저장한 리뷰를 다시 저장해도 두 번 세지 않음
+    resaved = store.reviews[:200] + store.reviews[-100:]
+    lf.save_reviews_to_dynamodb(APP_ID, resaved)
+    lf.save_reviews_to_dynamodb(APP_ID, resaved[-20:])
+    ok = get_app_stats(APP_ID) == stats
+    all_ok = all_ok and ok
+    print(f"stats unchanged after re-saving {len(resaved)} stored reviews: {ok}")
+
+    # 같은 날 같은 사용자의 새 리뷰: 바뀐 평점과 길이만큼만 집계가 바뀜
+    changed = [{**review, 'score': review['score'] % 5 + 1, 'content': review['content'] + " 추가 내용"}
+               for review in store.reviews[300:310]]
+    lf.save_reviews_to_dynamodb(APP_ID, changed)
+    stored = [{'date': str(item['date']), 'score': item['score'], 'content': item['content']}
+              for item in lf.iter_app_reviews(APP_ID, ['date', 'score', 'content'])]
+    ok = get_app_stats(APP_ID)['totals'] == expected_stats(stored) and len(stored) == len(raw_reviews)
+    all_ok = all_ok and ok
+    print(f"stats follow {len(changed)} overwritten reviews with a new score and content: {ok}")
+
+    ok = stats_queries.count('AppReview') == 0
+    all_ok = all_ok and ok
+
+    print(f"{'request':<16} {'AppReview pages':>15} {'AppReviewDaily pages':>21} {'response bytes':>15}")
+    for name, response, table_queries in [('app_stats', stats_response, stats_queries),
+                                          ('app_review_read', read_response, read_queries)]:
+        print(f"{name:<16} {table_queries.count('AppReview'):>15} {table_queries.count('AppReviewDaily'):>21} "
+              f"{len(response['body']):>15}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
@@ -0,0 +1,190 @@
+"""
+요약 생성 단일 실행(summary_lock) 동시성 확인 스크립트
+
+moto 로 만든 DynamoDB 에 앱마다 리뷰를 저장한 뒤, 같은 앱의 요약을 스레드 CONCURRENT_REQUESTS 개가 동시에
+요청하고(generate_and_save_summary) 스텁 LLM 호출 횟수를 셉니다.
+- 잠금 없음(기준): 모든 요청이 캐시 확인을 통과해 요청 수만큼 LLM 호출
+- 잠금 사용: 앱(app_id, end_date)마다 LLM 호출 정확히 1번, 나머지 요청은 같은 요약을 cached 로 받음
+- 리더의 LLM 호출이 실패하면 기다리던 요청 하나가 잠금을 가져가 다시 생성 (LLM 호출 2번)
+- 만료된 잠금은 바로 가져가고, 다른 요청의 유효한 잠금을 기다리다 시간이 다 되면 summary 요청이 409
+- 동기 summary 요청은 Lambda 남은 실행 시간(context)과 크롤링에 쓴 시간을 빼고 기다려, API Gateway 제한 시간 전에 409
+하나라도 다르면 종료 코드 1 로 종료합니다.
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+# lambda_function 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from benchmark_diversity import generate_reviews
+from check_review_snapshot import FakeStore, create_tables
+
+CONCURRENT_REQUESTS = 8
+REVIEWS_PER_APP = 300
+LLM_SECONDS = 0.5
+
+
+def run_check():
+    import lambda_function as lf
+    import summary_lock
+    from llm import LLM
+
+    llm_calls = Counter()
+    failures = set()
+    calls_lock = threading.Lock()
+
+    class StubLLM(LLM):
+        """요약 생성만 LLM_SECONDS 기다린 뒤 앱별로 호출 횟수를 세는 스텁 (failures 의 앱은 첫 호출 실패)"""
+
+        def __init__(self):
+            pass
+
+        def __call__(self, prompt, text):
+            app_id = text.split(' ', 1)[0]
+            with calls_lock:
+                llm_calls[app_id] += 1
+                fail = app_id in failures and llm_calls[app_id] == 1
+            time.sleep(LLM_SECONDS)
+            if fail:
+                raise ValueError("Failed to call OpenAI API: stub error")
+            return f"stub summary {app_id}"
+
+    create_tables()
+    app_info_table = boto3.resource('dynamodb').Table('AppInfo')
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    apps = [f"check.flight.app{i}" for i in range(6)]
+    for i, app_id in enumerate(apps):
+        app_info_table.put_item(Item={'app_id': app_id, 'name': app_id})
+        store = FakeStore()
+        store.add(generate_reviews(REVIEWS_PER_APP, seed=20 + i), today - timedelta(days=20),
+                  today - timedelta(days=1), random.Random(i))
+        # 스텁 LLM 이 어느 앱의 요청인지 알 수 있도록 리뷰 앞에 앱 ID 를 붙임
+        for review in store.reviews:
+            review['content'] = f"{app_id} {review['content']}"
+        lf.save_reviews_to_dynamodb(app_id, store.reviews)
+    lf.LLM = StubLLM
+    lf.reviews = lambda *args, **kwargs: ([], None)
+
+    def concurrent_summaries(app_ids, **kwargs):
+        barrier = threading.Barrier(len(app_ids) * CONCURRENT_REQUESTS)
+        results = []
+
+        def request(app_id):
+            barrier.wait()
+            try:
+                results.append((app_id, lf.generate_and_save_summary(app_id, 'check-user', **kwargs)))
+            except Exception as e:
+                results.append((app_id, e))
+
+        threads = [threading.Thread(target=request, args=(app_id,))
+                   for app_id in app_ids for _ in range(CONCURRENT_REQUESTS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, time.perf_counter() - start
+
+    all_ok = True
+
+    def check(name, ok, detail):
+        nonlocal all_ok
+        all_ok = all_ok and ok
+        print(f"{name:<40} {detail}{'' if ok else '  FAILED'}")
+
+    # 1. 잠금 없음(기준): 항상 잠금을 가져가는 것처럼 동작
+    acquire = summary_lock.SummaryLock.acquire
+    summary_lock.SummaryLock.acquire = lambda self: True
+    results, seconds = concurrent_summaries(apps[:1])
+    summary_lock.SummaryLock.acquire = acquire
+    check("without lock (baseline)", llm_calls[apps[0]] == CONCURRENT_REQUESTS,
+          f"LLM calls {llm_calls[apps[0]]} for {CONCURRENT_REQUESTS} requests, {seconds:.2f}s")
+
+    # 2. 잠금 사용: 두 앱에 동시에 요청
+    results, seconds = concurrent_summaries(apps[1:3])
+    for app_id in apps[1:3]:
+        app_results = [result for app, result in results if app == app_id]
+        ok = llm_calls[app_id] == 1 and \
+            all(isinstance(result, dict) and result['summary'] == f"stub summary {app_id}" for result in app_results) and \
+            sum(not result['cached'] for result in app_results) == 1
+        check(f"single flight ({app_id})", ok,
+              f"LLM calls {llm_calls[app_id]} for {len(app_results)} requests, {seconds:.2f}s")
+
+    # 3. 리더 실패: 기다리던 요청 하나가 다시 생성
+    failures.add(apps[3])
+    results, seconds = concurrent_summaries(apps[3:4])
+    errors = [result for _, result in results if isinstance(result, Exception)]
+    summaries = [result for _, result in results if isinstance(result, dict)]
+    check("leader failure is retried once", llm_calls[apps[3]] == 2 and len(errors) == 1 and
+          len(summaries) == CONCURRENT_REQUESTS - 1,
+          f"LLM calls {llm_calls[apps[3]]}, failed requests {len(errors)}, {seconds:.2f}s")
+
+    # 4. 만료된 잠금은 바로 가져감
+    lock_table = summary_lock.summary_lock_table
+
+    def end_date(app_id):
+        return max(str(review['date'])[:10] for review in lf.iter_app_reviews(app_id, fields=['date']))
+
+    lock_table.put_item(Item={'lock_key': f"{apps[4]}#{end_date(apps[4])}", 'owner': 'crashed',
+                              'expires_at': int(time.time()) - 1})
+    start = time.perf_counter()
+    result = lf.generate_and_save_summary(apps[4], 'check-user', lock_wait_seconds=5)
+    seconds = time.perf_counter() - start
+    check("expired lock is taken over", llm_calls[apps[4]] == 1 and not result['cached'] and seconds < 5,
+          f"LLM calls {llm_calls[apps[4]]}, {seconds:.2f}s")
+
+    # 5. 유효한 잠금을 기다리다 시간 초과 -> 409
+    lock_table.put_item(Item={'lock_key': f"{apps[5]}#{end_date(apps[5])}", 'owner': 'other',
+                              'expires_at': int(time.time()) + 60})
+    lf.SUMMARY_LOCK_WAIT_SECONDS = 1
+    response = lf.lambda_handler({'body': {'request_type': 'summary', 'app_id': apps[5],
+                                           'google_id': 'check-user'}}, None)
+    check("held lock times out with 409", response['statusCode'] == 409 and llm_calls[apps[5]] == 0,
+          f"status {response['statusCode']}, LLM calls {llm_calls[apps[5]]}")
+
+    # 6. Lambda 남은 실행 시간 안에 409: 크롤링에 쓴 시간도 기다림에서 뺌
+    class FakeContext:
+        def __init__(self, seconds):
+            self.deadline = time.monotonic() + seconds
+
+        def get_remaining_time_in_millis(self):
+            return int((self.deadline - time.monotonic()) * 1000)
+
+    lf.SUMMARY_LOCK_WAIT_SECONDS = summary_lock.SUMMARY_LOCK_WAIT_SECONDS
+    crawl_seconds = 1.0
+    lf.reviews = lambda *args, **kwargs: (time.sleep(crawl_seconds), ([], None))[1]
+    remaining_seconds = summary_lock.SUMMARY_LOCK_RESPONSE_MARGIN_SECONDS + 2.5
+    start = time.perf_counter()
+    response = lf.lambda_handler({'body': {'request_type': 'summary', 'app_id': apps[5], 'google_id': 'check-user'}},
+                                 FakeContext(remaining_seconds))
+    seconds = time.perf_counter() - start
+    lf.reviews = lambda *args, **kwargs: ([], None)
+    check("wait fits the remaining request time", response['statusCode'] == 409 and
+          seconds < remaining_seconds - summary_lock.SUMMARY_LOCK_RESPONSE_MARGIN_SECONDS / 2,
+          f"status {response['statusCode']} after {seconds:.2f}s of {remaining_seconds:.1f}s remaining")
+    budgets = [summary_lock.request_wait_seconds(None, time.monotonic()),
+               summary_lock.request_wait_seconds(None, time.monotonic() - 20),
+               summary_lock.request_wait_seconds(FakeContext(60), time.monotonic() - 28)]
+    check("API Gateway timeout bounds the wait", budgets[0] == summary_lock.SUMMARY_LOCK_WAIT_SECONDS and
+          6.5 < budgets[1] <= 7 and budgets[2] == 0,
+          f"wait after 0s / 20s / 28s of the request: {[round(budget, 1) for budget in budgets]}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    with mock_aws():
+        sys.exit(0 if run_check() else 1)
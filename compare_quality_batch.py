@@ -0,0 +1,95 @@
+"""
+배치 품질 평가(batch_evaluate_text_quality)와 기준 구현(evaluate_text_quality) 일치성 검증 스크립트
+
+test_reviews.json 의 리뷰와 무작위로 생성한 리뷰(반복 문자, 문장부호, 이모지, 공백 변형 포함)에 대해
+두 구현의 점수가 완전히 동일한지 확인하고, 500개 리뷰 기준 처리 시간을 비교합니다.
+점수가 하나라도 다르면 종료 코드 1 로 종료합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+
+# text_quality 모듈 임포트를 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), 'AmazonLambda_crawlF'))
+
+from text_quality import evaluate_text_quality, batch_evaluate_text_quality
+
+ALPHABET = (
+    list("가나다라마바사아자차카타파하앱리뷰좋아요별로에요업데이트오류")
+    + list("abcdefghijklmnopqrstuvwxyzABC")
+    + list(".,!?;:~ㅋㅎㅠ")
+    + ["😀", "👍", " ", "\t", "\n", "\ud800"]
+)
+
+
+def load_test_reviews():
+    """테스트 리뷰 데이터 로드"""
+    with open('test_reviews.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [review['content'] for review in data['reviews']]
+
+
+def generate_random_reviews(count, seed=0):
+    """다양한 형태의 무작위 리뷰 생성"""
+    rng = random.Random(seed)
+    texts = ["", "짧음", "a b", "ㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋ", "좋아요 좋아요 좋아요 좋아요 좋아요 좋아요",
+             "           ", "... ... ... ... ...", "!!!!!!!!!! ?????????? ..........", None]
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 80)):
+            if rng.random() < 0.1:
+                words.append(rng.choice(ALPHABET) * rng.randint(2, 8))
+            else:
+                words.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 7))))
+        if rng.random() < 0.2:
+            words = words[:3] * rng.randint(2, 6)
+        texts.append(rng.choice([" ", "  ", " \n"]).join(words))
+    return texts
+
+
+def check_parity(text_list):
+    """두 구현의 점수가 모두 같은지 확인하고 불일치 목록 반환"""
+    reference = [evaluate_text_quality(text) for text in text_list]
+    batch = batch_evaluate_text_quality(text_list)
+    return [(i, r, b) for i, (r, b) in enumerate(zip(reference, batch)) if r != b]
+
+
+def benchmark(text_list, repeat=5):
+    """두 구현의 처리 시간 측정 (최솟값, 초)"""
+    reference_times, batch_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in text_list:
+            evaluate_text_quality(text)
+        reference_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch_evaluate_text_quality(text_list)
+        batch_times.append(time.perf_counter() - start)
+    return min(reference_times), min(batch_times)
+
+
+def run_comparison():
+    test_reviews = load_test_reviews()
+    random_reviews = generate_random_reviews(5000)
+
+    mismatches = check_parity(test_reviews) + check_parity(random_reviews)
+    print(f"Checked {len(test_reviews) + len(random_reviews)} texts, mismatches: {len(mismatches)}")
+    for index, reference, batch in mismatches[:10]:
+        print(f"  [{index}] reference={reference!r} batch={batch!r}")
+
+    # 요약 시 사용하는 500개 리뷰 윈도우 기준 (50~400자)
+    window = [t for t in random_reviews if t and 50 < len(t) < 400][:500]
+    window += test_reviews * ((500 - len(window)) // max(1, len(test_reviews)))
+    reference_time, batch_time = benchmark(window)
+    print(f"{len(window)} reviews: reference {reference_time * 1000:.1f} ms, "
+          f"batch {batch_time * 1000:.1f} ms, speedup x{reference_time / batch_time:.1f}")
+
+    return not mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_comparison() else 1)